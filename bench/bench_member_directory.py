@@ -0,0 +1,101 @@
+"""
+멤버 디렉터리 벤치마크 — SELECT * FROM open_chat_member 전체 읽기 vs MemberDirectory
+
+대역 DB(bench/stub_server.py)에 멤버를 채운 뒤 두 방식을 비교합니다.
+
+    legacy     !공지 한 번마다 open_chat_member 전체를 SELECT * 로 읽어 닉네임 맵 생성
+    directory  필요한 컬럼만 한 번 색인해 두고, 작성자 id 묶음을 한 번에 조회
+
+메모리는 tracemalloc으로 잰 최대 할당량(peak)과 작업이 끝난 뒤에도 남아 있는 양(retained)입니다.
+directory는 _id 기준 페이지(QueryBatch.iter_rows)로 적재하므로 peak에는 한 페이지만큼의 쿼리 결과가 더해집니다.
+
+실행: python -m bench.bench_member_directory [방 수] [방당 멤버 수]
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from bench import stub_server
+from helper.MemberDirectory import MemberDirectory
+
+LOOKUPS = 200       # 반복 조회 횟수
+AUTHORS = 20        # 공지 목록 한 번에 나오는 작성자 수
+
+
+class _Api:
+    """irispy-client의 chat.api.query 대신 대역 DB를 바로 읽습니다."""
+
+    def __init__(self, state: stub_server.StubState):
+        self.state = state
+        self.queries = 0
+
+    def query(self, query: str, bind: list = None):
+        self.queries += 1
+        return self.state.query(query, bind)
+
+
+def measure(fn):
+    """(반환값, 최대 할당 MB, 남은 할당 MB, 초)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, peak / 1024 / 1024, current / 1024 / 1024, elapsed
+
+
+def legacy_names(api) -> dict:
+    member_names = {}
+    for row in api.query("SELECT * FROM open_chat_member"):
+        if row.get("user_id") and row.get("nickname"):
+            member_names[row["user_id"]] = row["nickname"]
+    return member_names
+
+
+def main():
+    rooms = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    members = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    state = stub_server.StubState(stub_server.seed_database(rooms=rooms, members=members))
+    api = _Api(state)
+    total = state.query("SELECT COUNT(*) AS n FROM open_chat_member", [])[0]["n"]
+    user_ids = [row["user_id"] for row in state.query("SELECT user_id FROM open_chat_member", [])]
+    room_id = state.query("SELECT id FROM chat_rooms LIMIT 1", [])[0]["id"]
+    rng = random.Random(1)
+    print(f"open_chat_member rows: {int(total):,}")
+
+    rows, rows_peak, rows_kept, rows_s = measure(lambda: api.query("SELECT * FROM open_chat_member"))
+    del rows
+    directory = MemberDirectory()
+    _, index_peak, index_kept, index_s = measure(lambda: directory.ensure_fresh(api))
+    print(f"SELECT * rows     : {rows_peak:6.1f} MB peak, {rows_kept:6.1f} MB retained, {rows_s * 1000:6.0f} ms per call")
+    print(f"directory index   : {index_peak:6.1f} MB peak, {index_kept:6.1f} MB retained, {index_s * 1000:6.0f} ms once, then incremental")
+
+    samples = [rng.sample(user_ids, AUTHORS) for _ in range(LOOKUPS)]
+
+    api.queries = 0
+    start = time.perf_counter()
+    for authors in samples[:20]:
+        names = legacy_names(api)
+        _ = [names.get(a) for a in authors]
+    legacy_ms = (time.perf_counter() - start) / 20 * 1000
+    legacy_queries = api.queries / 20
+
+    api.queries = 0
+    start = time.perf_counter()
+    for authors in samples:
+        directory.nicknames(api, authors, room_id)
+    directory_ms = (time.perf_counter() - start) / LOOKUPS * 1000
+    directory_queries = api.queries / LOOKUPS
+
+    print(f"legacy    lookup of {AUTHORS} authors: {legacy_ms:8.2f} ms, {legacy_queries:.2f} queries")
+    print(f"directory lookup of {AUTHORS} authors: {directory_ms:8.3f} ms, {directory_queries:.2f} queries")
+    print(f"directory stats: {directory.stats()}")
+
+
+if __name__ == "__main__":
+    main()
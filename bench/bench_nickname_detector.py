@@ -0,0 +1,120 @@
+"""
+닉네임 감지 벤치마크 — 이전 전체 테이블 비교 vs NicknameScanner (해시 스냅샷)
+
+대역 DB(bench/stub_server.py)에 멤버를 채운 뒤 폴링 한 주기를 여러 번 돌리며
+주기당 봇 쪽 CPU 시간(대역 DB 조회와 응답 크기 계산은 뺌)과
+Iris가 보내는 응답 크기(JSON 바이트)를 잽니다.
+주기마다 --changes명의 닉네임을 바꿉니다.
+
+    legacy   SELECT enc,nickname,user_id,involved_chat_id 전체 → dict 재구성 → history와 비교
+    scanner  SELECT _id,enc,nickname 전체 → crc32 배열과 비교 → 바뀐 행만 상세 조회
+
+변경이 없을 때의 간격 증가(AdaptiveInterval)로 줄어드는 폴링 횟수도 함께 출력합니다.
+
+실행: python -m bench.bench_nickname_detector [--rooms 50] [--members 1000] [--cycles 10] [--changes 5]
+"""
+import argparse
+import json
+import random
+import time
+
+from bench import stub_server
+from helper.NicknameTracker import AdaptiveInterval, NicknameScanner
+
+LEGACY_QUERY = "select enc,nickname,user_id,involved_chat_id from db2.open_chat_member"
+
+
+class _Api:
+    """대역 DB를 바로 읽고 Iris 응답 크기를 셉니다."""
+
+    def __init__(self, state: stub_server.StubState):
+        self.state = state
+        self.bytes = 0
+        self.queries = 0
+        self.cpu = 0.0   # 대역 쪽에서 쓴 CPU 시간 (봇 CPU에서 뺌)
+
+    def query(self, query: str, bind: list = None):
+        start = time.process_time()
+        rows = self.state.query(query, bind)
+        self.queries += 1
+        self.bytes += len(json.dumps({"data": rows}, ensure_ascii=False).encode("utf-8"))
+        self.cpu += time.process_time() - start
+        return rows
+
+
+def legacy_cycle(api, history: dict) -> int:
+    """이전 detect_nickname_change 루프 한 번 (알림/저장 제외). 바뀐 수를 반환합니다."""
+    changed = 0
+    members = {}
+    for member in api.query(LEGACY_QUERY, []):
+        members[member['user_id']] = {"nickname": member["nickname"], "involved_chat_id": member["involved_chat_id"]}
+    for user_id in members.keys():
+        if user_id not in history.keys():
+            history[user_id] = {"history": [{"nickname": members[user_id]["nickname"], "date": ""}]}
+        elif members[user_id]["nickname"] != history[user_id]["history"][-1]["nickname"]:
+            history[user_id]["history"].append({"nickname": members[user_id]["nickname"], "date": ""})
+            changed += 1
+    return changed
+
+
+def scanner_cycle(scanner: NicknameScanner, history: dict) -> int:
+    changed = 0
+    for member in scanner.scan():
+        user_id = member["user_id"]
+        if user_id not in history:
+            history[user_id] = {"history": [{"nickname": member["nickname"], "date": ""}]}
+        elif member["nickname"] != history[user_id]["history"][-1]["nickname"]:
+            history[user_id]["history"].append({"nickname": member["nickname"], "date": ""})
+            changed += 1
+    return changed
+
+
+def run(label: str, state, cycle, cycles: int, changes: int, rng) -> None:
+    api = _Api(state)
+    row_ids = [int(r["_id"]) for r in state.query("SELECT _id FROM db2.open_chat_member", [])]
+    history = {}
+    step = cycle(api)
+    step(history)   # 기준점 (첫 적재)
+    api.bytes = api.queries = 0
+    api.cpu = 0.0
+
+    cpu = detected = 0
+    for n in range(cycles):
+        for row_id in rng.sample(row_ids, changes):
+            state.execute("UPDATE db2.open_chat_member SET nickname = ? WHERE _id = ?", (f"새닉{n}_{row_id}", row_id))
+        start = time.process_time()
+        detected += step(history)
+        cpu += time.process_time() - start
+    cpu -= api.cpu
+    print(
+        f"{label:7}: {cpu / cycles * 1000:7.1f} ms bot CPU/cycle, {api.bytes / cycles / 1024:8.1f} KiB/cycle, "
+        f"{api.queries / cycles:.1f} queries/cycle, detected {detected}/{cycles * changes}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--changes", type=int, default=5)
+    args = parser.parse_args()
+
+    state = stub_server.StubState(stub_server.seed_database(rooms=args.rooms, members=args.members))
+    print(f"open_chat_member rows: {args.rooms * args.members:,}")
+    run("legacy", state, lambda api: (lambda history: legacy_cycle(api, history)),
+        args.cycles, args.changes, random.Random(1))
+    run("scanner", state, lambda api: (lambda history, s=NicknameScanner(api): scanner_cycle(s, history)),
+        args.cycles, args.changes, random.Random(2))
+
+    # 한 시간 동안 변경이 10분에 한 번씩 있을 때의 폴링 횟수
+    interval, elapsed, polls = AdaptiveInterval(), 0.0, 0
+    while elapsed < 3600:
+        changed = elapsed % 600 < interval.current
+        elapsed += interval.next(changed)
+        polls += 1
+    print(f"polls/hour with a change every 10 min: fixed 3 s = 1200, adaptive = {polls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+닉네임 기록 저장 벤치마크 — PyKV 'user_history' 값 전체 재기록 vs nickname_history 테이블
+
+--users명의 기록(유저당 1~3개)을 만들어 두고 닉네임 변경 하나를 저장하는 비용을 잽니다.
+
+    legacy  dict 수정 → json.dumps 전체 → kv_pairs에 INSERT OR REPLACE (PyKV.put과 같은 방식)
+    table   NicknameHistory.observe() — 마지막 닉네임 인덱스 조회 + INSERT 한 줄
+
+임시 디렉터리에 DB 파일을 만들며 저장소의 iris.db는 건드리지 않습니다.
+
+실행: python -m bench.bench_nickname_history [--users 100000] [--changes 50]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from helper.NicknameHistory import NicknameHistory
+
+ROOM_ID = "18398338829933617"
+
+
+def make_blob(users: int, rng) -> dict:
+    blob = {}
+    for n in range(users):
+        user_id = str(7000000001 + n)
+        entries = [{"nickname": f"유저{n}", "involved_chat_id": ROOM_ID, "date": ""}]
+        for k in range(rng.randint(0, 2)):
+            entries.append({"nickname": f"유저{n}_{k}", "involved_chat_id": ROOM_ID, "date": "250101 12:00"})
+        blob[user_id] = {"history": entries}
+    return blob
+
+
+def legacy_put(db: sqlite3.Connection, blob: dict) -> int:
+    value = json.dumps(blob)
+    db.execute("INSERT OR REPLACE INTO kv_pairs (key, value) VALUES (?, ?)", ("user_history", value))
+    db.commit()
+    return len(value)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=50)
+    args = parser.parse_args()
+    rng = random.Random(1)
+    blob = make_blob(args.users, rng)
+    targets = [str(7000000001 + rng.randrange(args.users)) for _ in range(args.changes)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # legacy
+        db = sqlite3.connect(os.path.join(tmp, "legacy.db"))
+        db.execute("CREATE TABLE kv_pairs (key TEXT PRIMARY KEY, value TEXT)")
+        legacy_put(db, blob)
+        written = 0
+        start = time.perf_counter()
+        for n, user_id in enumerate(targets):
+            blob[user_id]["history"].append({"nickname": f"새닉{n}", "involved_chat_id": ROOM_ID, "date": "260101 12:00"})
+            written += legacy_put(db, blob)
+        legacy_ms = (time.perf_counter() - start) / args.changes * 1000
+        print(f"legacy : {legacy_ms:8.2f} ms/change, {written / args.changes / 1024 / 1024:6.2f} MiB written/change")
+
+        # table
+        history = NicknameHistory(os.path.join(tmp, "table.db"))
+        for user_id in targets:   # 변경 전 상태로 되돌려서 옮김
+            blob[user_id]["history"] = [e for e in blob[user_id]["history"] if not e["nickname"].startswith("새닉")]
+        start = time.perf_counter()
+        moved = history.migrate(blob)
+        print(f"migrate: {moved:,} rows in {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        detected = 0
+        for n, user_id in enumerate(targets):
+            detected += len(history.observe([(user_id, f"새닉{n}", ROOM_ID)], "260101 12:00"))
+        table_ms = (time.perf_counter() - start) / args.changes * 1000
+        print(f"table  : {table_ms:8.2f} ms/change, 1 row written/change, detected {detected}/{args.changes}")
+
+        start = time.perf_counter()
+        for user_id in targets:
+            history.recent(user_id, 5)
+        print(f"recent(user, 5): {(time.perf_counter() - start) / args.changes * 1000:.3f} ms")
+        print(f"speedup: {legacy_ms / table_ms:,.0f}x, table stats: {history.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Iris /query 왕복 벤치마크 — 명령어 하나가 쿼리 여러 개를 보낼 때의 지연시간
+
+bench/stub_server.py가 /query마다 --latency 초 늦게 응답합니다.
+명령어 하나 = 쿼리 --statements개 (방 정보, 멤버 IN 조회, 방장 조회를 돌아가며 사용)
+
+    legacy     irispy-client api.query()처럼 requests.post로 매번 새 연결, 순서대로
+    pooled     QueryBatch.query() — http_client keep-alive 연결, 순서대로
+    query_many QueryBatch.query_many() — keep-alive 연결 여러 개에 동시에
+
+실행: python -m bench.bench_query_batch [--commands 100] [--statements 3] [--latency 0.01]
+"""
+import argparse
+import time
+
+import requests
+
+from bench import stub_server
+from helper.QueryBatch import query, query_many
+
+
+class _Api:
+    def __init__(self, iris_endpoint: str):
+        self.iris_endpoint = iris_endpoint
+
+    def query(self, query: str, bind: list = None):
+        """irispy-client IrisAPI.query와 같은 방식"""
+        response = requests.post(f"{self.iris_endpoint}/query", json={"query": query, "bind": bind or []})
+        return response.json().get("data", [])
+
+
+def statements(state, count: int) -> list:
+    room_id = state.query("SELECT id FROM chat_rooms LIMIT 1", [])[0]["id"]
+    user_ids = [r["user_id"] for r in state.query("SELECT user_id FROM db2.open_chat_member LIMIT 20", [])]
+    pool = [
+        ("SELECT id, link_id, type, moim_meta, active_member_ids FROM chat_rooms WHERE id = ?", [room_id]),
+        (f"SELECT user_id, nickname FROM db2.open_chat_member WHERE user_id IN ({','.join('?' * len(user_ids))})",
+         user_ids),
+        ("SELECT user_id, nickname FROM db2.open_chat_member WHERE involved_chat_id = ? AND link_member_type = 1",
+         [room_id]),
+    ]
+    return [pool[i % len(pool)] for i in range(count)]
+
+
+def run(label: str, command, commands: int) -> None:
+    timings = []
+    for _ in range(commands):
+        start = time.perf_counter()
+        command()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    mean = sum(timings) / len(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:10}: mean {mean * 1000:7.2f} ms, p95 {p95 * 1000:7.2f} ms per command")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commands", type=int, default=100)
+    parser.add_argument("--statements", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.01, help="스텁 /query 응답 지연(초)")
+    args = parser.parse_args()
+
+    server, state = stub_server.start(latency=args.latency, rooms=5, members=100)
+    api = _Api(f"http://127.0.0.1:{server.server_port}")
+    batch = statements(state, args.statements)
+
+    run("legacy", lambda: [api.query(sql, bind) for sql, bind in batch], args.commands)
+    run("pooled", lambda: [query(api, sql, bind) for sql, bind in batch], args.commands)
+    run("query_many", lambda: query_many(api, batch), args.commands)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+라우터 처리량 벤치마크 — 기존 3중 on_message 핸들러 vs CommandRouter
+
+실행: python -m bench.bench_router [messages.jsonl] [반복횟수]
+"""
+import functools
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from helper.CommandRouter import CommandRouter
+
+TRACE_PATH = os.path.join(os.path.dirname(__file__), "messages.jsonl")
+
+
+class _Message:
+    def __init__(self, msg: str):
+        self.msg = msg
+        split = msg.split(" ", 1)
+        self.command = split[0]
+        self.param = split[1] if len(split) == 2 else None
+        self.has_param = self.param is not None
+
+
+class _Sender:
+    def __init__(self, user_id: str, name: str):
+        self.id = int(user_id)
+        self.name = name
+
+
+class _Chat:
+    def __init__(self, row: dict):
+        self.message = _Message(row["msg"])
+        self.sender = _Sender(row["sender"], row.get("sender_name", ""))
+
+
+def load_trace(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [_Chat(json.loads(line)) for line in f if line.strip()]
+
+
+def make_kv_ban_check(db_path: str):
+    """PyKV와 같은 방식(SQLite + JSON 리스트)으로 밴 목록을 읽는 is_not_banned"""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT OR REPLACE INTO kv VALUES ('ban', ?)", (json.dumps(list(range(1000, 1100))),))
+    conn.commit()
+
+    def is_not_banned(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            row = conn.execute("SELECT value FROM kv WHERE key = 'ban'").fetchone()
+            ban_list = json.loads(row[0]) if row else []
+            if args[0].sender.id in ban_list:
+                return
+            return func(*args, **kwargs)
+        return wrapper
+
+    return is_not_banned
+
+
+def _noop(chat):
+    pass
+
+
+def build_legacy(guard):
+    """기존 irispy.py 구조: 데코레이터 + match 문을 가진 핸들러 3개"""
+
+    @guard
+    def on_message(chat):
+        match chat.message.command:
+            case "!tt" | "!ttt" | "!프사" | "!프사링":
+                _noop(chat)
+            case "!멘션" | "!멘션1" | "!방장":
+                _noop(chat)
+            case "!공지" | "!현재공지" | "!공지등록" | "!공지삭제" | "!공지수정" | "!공지목록" | "!공지확인":
+                _noop(chat)
+            case "!임티" | "!react" | "!유저포스트" | "!포스트" | "!강퇴목록" | "!투표" | "!방검색":
+                _noop(chat)
+
+    @guard
+    def on_audio_test(chat):
+        if chat.message.command != "!mp3test":
+            return
+        _noop(chat)
+
+    @guard
+    def on_message_eval(chat):
+        match chat.message.command:
+            case "!py":
+                _noop(chat)
+            case "!ev":
+                _noop(chat)
+
+    handlers = [on_message, on_audio_test, on_message_eval]
+
+    def dispatch(chat):
+        for handler in handlers:
+            handler(chat)
+
+    return dispatch
+
+
+def build_router(guard):
+    router = CommandRouter(prefix="!", guard=guard)
+    router.add(("!tt", "!ttt", "!프사", "!프사링"), _noop)
+    for name in ("!멘션", "!멘션1", "!방장", "!공지", "!현재공지", "!공지등록", "!공지삭제", "!공지수정",
+                 "!공지목록", "!공지확인", "!임티", "!react", "!유저포스트", "!포스트", "!강퇴목록",
+                 "!투표", "!방검색", "!mp3test", "!py", "!ev"):
+        router.add(name, _noop)
+    return router.dispatch
+
+
+def measure(dispatch, chats: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for chat in chats:
+            dispatch(chat)
+    elapsed = time.perf_counter() - start
+    return len(chats) * repeat / elapsed
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else TRACE_PATH
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    chats = load_trace(path)
+    commands = sum(1 for c in chats if c.message.msg.startswith("!"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        guard = make_kv_ban_check(os.path.join(tmp, "iris.db"))
+        legacy = measure(build_legacy(guard), chats, repeat)
+        routed = measure(build_router(guard), chats, repeat)
+
+    print(f"trace: {path} ({len(chats)} messages, {commands} commands)")
+    print(f"legacy (3 handlers): {legacy:,.0f} msg/s")
+    print(f"router:              {routed:,.0f} msg/s ({routed / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
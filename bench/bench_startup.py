@@ -0,0 +1,104 @@
+"""
+시작 시간 / 메모리 벤치마크 — 봇 모듈 전체 import vs 지연 로딩
+
+irispy.py를 새 프로세스에서 import 한 뒤 등록된 명령어(!코인)를 처리해 답장하기까지 걸린 시간(cold)과,
+같은 프로세스에서 두 번째 !코인을 처리하는 시간(warm), 최대 RSS를 측정합니다.
+eager 모드는 router.preload()로 모든 봇 모듈을 먼저 import 합니다. lazy 모드는 cold에 bots.coin
+import가 포함됩니다.
+
+시세 API는 IRIS_HTTP_OVERRIDE로 bench/stub_server.py에 보내므로 외부 네트워크를 쓰지 않습니다.
+자식 프로세스는 임시 디렉터리에서 실행하므로 iris.db가 저장소에 생기지 않습니다.
+
+실행: python -m bench.bench_startup [반복횟수]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench import stub_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = r"""
+import json, resource, sys, threading, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+sys.argv = ["irispy.py", {iris!r}]
+import irispy
+if {eager}:
+    irispy.router.preload(background=False)
+
+class _Id:
+    id = 1
+
+class _Message:
+    def __init__(self, msg):
+        self.msg = msg
+        self.command, _, self.param = msg.partition(" ")
+        self.has_param = bool(self.param)
+
+class _Chat:
+    sender = room = _Id
+
+    def __init__(self, msg):
+        self.message = _Message(msg)
+        self.text = None
+        self.replied = threading.Event()
+
+    def reply(self, text, *args, **kwargs):
+        self.text = text
+        self.replied.set()
+
+def run(msg):
+    chat = _Chat(msg)
+    irispy.router.dispatch(chat)
+    if not chat.replied.wait(30):
+        raise SystemExit(f"no reply to {{msg}}")
+    return chat
+
+first = run("!코인 BTC")
+cold = time.perf_counter() - start
+start = time.perf_counter()
+run("!코인 ETH")
+warm = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+loaded = sum(1 for c in irispy.router.commands if c.loaded)
+print(json.dumps({{"cold": cold, "warm": warm, "rss_kb": rss_kb, "loaded": loaded,
+                  "commands": len(irispy.router.commands), "reply": first.text.splitlines()[0]}}, ensure_ascii=False))
+"""
+
+
+def run_once(eager: bool, endpoint: str, workdir: str) -> dict:
+    env = dict(os.environ, IRIS_HTTP_OVERRIDE=f"http://{endpoint}")
+    out = subprocess.check_output(
+        [sys.executable, "-c", _CHILD.format(root=ROOT, iris=endpoint, eager=eager)],
+        cwd=workdir,
+        env=env,
+        text=True,
+    )
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    server, state = stub_server.start()
+    endpoint = f"127.0.0.1:{server.server_port}"
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, eager in (("eager", True), ("lazy", False)):
+            runs = [run_once(eager, endpoint, workdir) for _ in range(repeat)]
+            cold = sorted(r["cold"] for r in runs)[len(runs) // 2]
+            warm = sorted(r["warm"] for r in runs)[len(runs) // 2]
+            rss_mb = max(r["rss_kb"] for r in runs) / 1024
+            print(
+                f"{label:5}: cold (start → first !코인 reply) {cold * 1000:,.0f} ms, "
+                f"warm !코인 {warm * 1000:,.1f} ms (median of {repeat}), max RSS {rss_mb:,.1f} MB, "
+                f"modules loaded for {runs[0]['loaded']}/{runs[0]['commands']} commands"
+            )
+    print(f"first reply: {runs[0]['reply']!r}, stub calls: {dict(state.calls)}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+talk/write 전송 벤치마크 — 5-스레드 ThreadPoolExecutor vs 이벤트 루프 전송기
+
+bench/stub_server.py가 Iris /aot 와 talk-external.kakao.com /talk/write 를 흉내 내며
+요청마다 --latency 초만큼 늦게 응답합니다. 같은 개수의 메시지를 --rooms개 방에 나눠
+두 방식으로 보내고 초당 전송 수를 비교합니다. 전송 속도 제한은 끄고 측정합니다.
+(방별 큐는 순서를 지키므로 한 방 안에서는 한 번에 하나씩 전송됩니다)
+
+실행: python -m bench.bench_talk_write [--count 2000] [--rooms 100] [--latency 0.05]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from bench import stub_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def bench_thread_pool(talk_api, endpoint: str, count: int, rooms: int, workers: int = 5) -> float:
+    """이전 방식: ThreadPoolExecutor(5)에서 동기 POST"""
+    def send(i):
+        auth_token, headers, body = talk_api._build_request(endpoint, i % rooms + 1, f"msg {i}", {}, 1, None)
+        response = talk_api.http_client.post(talk_api.TALK_WRITE_URL, data=body, headers=headers, timeout=5)
+        return talk_api._parse_response(response, auth_token)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(send, i) for i in range(count)]
+    failed = sum(1 for f in futures if f.result().get("result") is False)
+    elapsed = time.perf_counter() - start
+    if failed:
+        print(f"  (failed: {failed})")
+    return count / elapsed
+
+
+def bench_event_loop(talk_api, endpoint: str, count: int, rooms: int) -> float:
+    """새 방식: talk_send()가 돌려준 Future를 모아서 기다림"""
+    start = time.perf_counter()
+    futures = [talk_api.talk_send(endpoint, i % rooms + 1, f"msg {i}") for i in range(count)]
+    wait(futures)
+    failed = sum(1 for f in futures if f.result().get("result") is False)
+    elapsed = time.perf_counter() - start
+    if failed:
+        print(f"  (failed: {failed})")
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="talk/write sends/sec benchmark")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 응답 지연(초)")
+    args = parser.parse_args()
+
+    server, _ = stub_server.start(latency=args.latency, rooms=0)
+    endpoint = f"http://127.0.0.1:{server.server_port}"
+    os.environ["IRIS_HTTP_OVERRIDE"] = endpoint
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from bots import talk_api
+
+    unlimited = (1e9, 1e9)
+    talk_api._transport = talk_api.TalkTransport(global_rate=unlimited, room_rate=unlimited)
+    talk_api.talk_send(endpoint, 1, "warmup").result()
+    httpx_state = "httpx.AsyncClient" if talk_api.httpx is not None else "run_in_executor fallback"
+    print(f"stub latency {args.latency * 1000:.0f} ms, {args.count:,} messages, event loop uses {httpx_state}")
+    print(f"thread pool (5):  {bench_thread_pool(talk_api, endpoint, args.count, args.rooms):>10,.0f} sends/s")
+    print(f"event loop:       {bench_event_loop(talk_api, endpoint, args.count, args.rooms):>10,.0f} sends/s")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+오프라인 부하 테스트 — JSONL 트레이스의 메시지를 실제 irispy.py 라우터로 재생합니다.
+
+- 가짜 ChatContext(sender, room, message, attachment, raw)를 만들어 router.dispatch()로 넘깁니다.
+- Iris /reply, /query 는 FakeIrisAPI가, /aot 와 Kakao(talk-external, talk-pilsner, open.kakao.com 등)
+  HTTP 호출은 requests / httpx 스텁이 받아 기록만 하고 준비된 응답을 돌려줍니다.
+- --stub 을 주면 대신 bench/stub_server.py를 띄우고 실제 HTTP로 보냅니다.
+  (/query는 시드된 SQLite, Kakao 호출은 IRIS_HTTP_OVERRIDE로 스텁 서버에 전달)
+- 처리량(msg/s), 명령어별 지연시간, 스레드 수, 메모리 사용량을 출력합니다.
+
+트레이스 형식 (한 줄에 하나):
+    {"room": "183...", "sender": "700...", "sender_name": "유저1", "msg": "!김프",
+     "attachment": {...}, "raw": {...}}
+
+실행: python -m bench.loadtest [--trace bench/messages.jsonl] [--rate 200] [--repeat 5] [--stub]
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from urllib.parse import urlsplit
+
+TRACE_PATH = os.path.join(os.path.dirname(__file__), "messages.jsonl")
+IRIS_ENDPOINT = "http://127.0.0.1:3000"
+
+
+# ---------------------------------------------------------------------------
+# 가짜 ChatContext
+# ---------------------------------------------------------------------------
+
+class FakeMessage:
+    def __init__(self, msg: str, message_id: int, attachment=None):
+        self.id = message_id
+        self.msg = msg
+        split = msg.split(" ", 1)
+        self.command = split[0]
+        self.param = split[1] if len(split) == 2 else None
+        self.has_param = self.param is not None
+        self.attachment = attachment or {}
+        self.image = None
+
+
+class FakeUser:
+    def __init__(self, user_id, name: str):
+        self.id = int(user_id)
+        self.name = name
+        self.avatar = None
+
+
+class FakeRoom:
+    def __init__(self, room_id, name: str = ""):
+        self.id = int(room_id)
+        self.name = name
+        self.members = []
+
+
+class FakeIrisAPI:
+    """Iris /query, /reply 를 대신하며 호출을 기록합니다."""
+
+    def __init__(self, recorder: "Recorder", iris_endpoint: str = IRIS_ENDPOINT, tables: dict = None):
+        self.iris_endpoint = iris_endpoint
+        self._recorder = recorder
+        self._tables = tables or {}
+
+    def query(self, query: str, bind: list = None):
+        self._recorder.record("iris", "/query")
+        lowered = query.lower()
+        for table, rows in self._tables.items():
+            if f"from {table}" in lowered:
+                return rows
+        return []
+
+    def reply(self, room_id, msg, thread_id=None):
+        self._recorder.record("iris", "/reply")
+        return {"success": True}
+
+
+class StubIrisAPI(FakeIrisAPI):
+    """/query, /reply 를 스텁 서버로 실제 HTTP 요청합니다."""
+
+    def query(self, query: str, bind: list = None):
+        from helper.HttpClient import http_client
+        response = http_client.post(f"{self.iris_endpoint}/query", json={"query": query, "bind": bind or []})
+        return response.json().get("data", [])
+
+    def reply(self, room_id, msg, thread_id=None):
+        from helper.HttpClient import http_client
+        return http_client.post(f"{self.iris_endpoint}/reply", json={"type": "text", "room": str(room_id), "data": msg}).json()
+
+
+class FakeChat:
+    def __init__(self, row: dict, api: FakeIrisAPI, message_id: int):
+        self.room = FakeRoom(row["room"], row.get("room_name", ""))
+        self.sender = FakeUser(row["sender"], row.get("sender_name", ""))
+        self.message = FakeMessage(row["msg"], message_id, row.get("attachment"))
+        self.raw = row.get("raw", {})
+        self.api = api
+
+    def reply(self, msg, room_id=None):
+        self.api.reply(room_id or self.room.id, msg)
+
+    def reply_media(self, files, room_id=None):
+        self.api._recorder.record("iris", "/reply")
+
+    def reply_audio(self, files, room_id=None):
+        self.api._recorder.record("iris", "/reply")
+
+    def get_source(self):
+        return None
+
+
+class FakeKakaoLink:
+    def __init__(self, recorder: "Recorder"):
+        self._recorder = recorder
+
+    def send(self, *args, **kwargs):
+        self._recorder.record("kakaolink", "/send")
+
+
+# ---------------------------------------------------------------------------
+# 외부 HTTP 스텁
+# ---------------------------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = Counter()
+
+    def record(self, host: str, path: str):
+        with self._lock:
+            self.calls[f"{host}{path}"] += 1
+
+
+def _canned_json(host: str, path: str) -> object:
+    if path.endswith("/aot"):
+        return {"success": True, "aot": {"access_token": "loadtest-token", "d_id": "loadtest-device"}}
+    if host == "talk-external.kakao.com":
+        return {"status": 0, "chatLog": {"logId": 1}}
+    if host == "api.upbit.com":
+        if path.endswith("/market/all"):
+            return [{"market": "KRW-BTC", "korean_name": "비트코인", "english_name": "Bitcoin"}]
+        return [{"market": "KRW-BTC", "trade_price": 100000000.0, "signed_change_rate": 0.01}]
+    if host == "api.binance.com":
+        if "price" in path:
+            return {"symbol": "BTCUSDT", "price": "70000.0"}
+        return [{"symbol": "BTCUSDT", "lastPrice": "70000.0", "priceChangePercent": "1.0"}]
+    if host == "m.search.naver.com":
+        return {"country": [{"value": "1"}, {"value": "1,380.00"}]}
+    return {"status": 0, "posts": [], "kickedMembers": [], "result": {}}
+
+
+def _canned_body(recorder: Recorder, url: str) -> bytes:
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    recorder.record("iris" if host in ("127.0.0.1", "localhost") else host, parts.path)
+    return json.dumps(_canned_json(host, parts.path), ensure_ascii=False).encode("utf-8")
+
+
+def install_http_stub(recorder: Recorder, latency: float = 0.0):
+    """
+    requests.Session.request와 httpx Client / AsyncClient의 send를 로컬 스텁으로 교체합니다.
+    talk/write(TalkTransport)나 HTTP/2 호스트처럼 httpx로 나가는 요청도 외부로 나가지 않습니다.
+    """
+    import requests
+
+    def fake_request(session, method, url, *args, **kwargs):
+        if latency:
+            time.sleep(latency)
+        body = _canned_body(recorder, url)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers["Content-Type"] = "application/json"
+        response.url = url
+        response.encoding = "utf-8"
+        return response
+
+    requests.Session.request = fake_request
+
+    try:
+        import httpx
+    except ImportError:
+        return
+
+    def fake_response(request):
+        return httpx.Response(200, content=_canned_body(recorder, str(request.url)),
+                              headers={"Content-Type": "application/json"}, request=request)
+
+    def fake_send(client, request, **kwargs):
+        if latency:
+            time.sleep(latency)
+        return fake_response(request)
+
+    async def fake_async_send(client, request, **kwargs):
+        if latency:
+            await asyncio.sleep(latency)
+        return fake_response(request)
+
+    httpx.Client.send = fake_send
+    httpx.AsyncClient.send = fake_async_send
+
+
+# ---------------------------------------------------------------------------
+# 실행
+# ---------------------------------------------------------------------------
+
+def load_trace(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_router(iris_endpoint: str = IRIS_ENDPOINT):
+    """irispy.py를 import 하고 라우터와 스케줄러를 반환합니다."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    argv = sys.argv
+    sys.argv = ["irispy.py", iris_endpoint]
+    try:
+        import irispy
+    finally:
+        sys.argv = argv
+    return irispy
+
+
+def wait_idle(scheduler, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = scheduler.stats()
+        if all(s["depth"] == 0 and s["running"] == 0 for s in stats.values()):
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def run(trace: list, rate: float, repeat: int, http_latency: float, stub: bool = False) -> dict:
+    recorder = Recorder()
+    if stub:
+        from bench import stub_server
+        server, state = stub_server.start(
+            latency=http_latency, room_ids=sorted({row["room"] for row in trace}), seed=1,
+        )
+        endpoint = f"http://127.0.0.1:{server.server_port}"
+        os.environ["IRIS_HTTP_OVERRIDE"] = endpoint
+        irispy = load_router(endpoint)
+        api = StubIrisAPI(recorder, endpoint)
+    else:
+        install_http_stub(recorder, http_latency)
+        irispy = load_router()
+        api = FakeIrisAPI(recorder)
+    irispy.router.provide("kl", FakeKakaoLink(recorder))
+
+    tracemalloc.start()
+    peak_threads = threading.active_count()
+    interval = 1.0 / rate if rate > 0 else 0.0
+    sent = 0
+
+    start = time.perf_counter()
+    next_at = start
+    for _ in range(repeat):
+        for row in trace:
+            if interval:
+                now = time.perf_counter()
+                if now < next_at:
+                    time.sleep(next_at - now)
+                next_at += interval
+            sent += 1
+            irispy.router.dispatch(FakeChat(row, api, sent))
+            if sent % 100 == 0:
+                peak_threads = max(peak_threads, threading.active_count())
+    dispatched = time.perf_counter() - start
+    drained = wait_idle(irispy.scheduler)
+    elapsed = time.perf_counter() - start
+    peak_threads = max(peak_threads, threading.active_count())
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "messages": sent,
+        "dispatch_seconds": dispatched,
+        "total_seconds": elapsed,
+        "drained": drained,
+        "peak_threads": peak_threads,
+        "peak_alloc_mb": peak_alloc / 1024 / 1024,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "commands": irispy.command_latency.summary(),
+        "outbound": dict((recorder.calls + (state.calls if stub else Counter())).most_common()),
+    }
+
+
+def print_report(result: dict):
+    print(f"messages:      {result['messages']:,}")
+    print(f"throughput:    {result['messages'] / result['total_seconds']:,.0f} msg/s "
+          f"(dispatch only {result['messages'] / result['dispatch_seconds']:,.0f} msg/s)")
+    print(f"drained:       {result['drained']}")
+    print(f"peak threads:  {result['peak_threads']}")
+    print(f"peak alloc:    {result['peak_alloc_mb']:,.1f} MB (tracemalloc), max RSS {result['max_rss_mb']:,.1f} MB")
+    print("\ncommand               count  errors     p50     p95     p99 (ms)")
+    for row in result["commands"]:
+        print(f"{row['name']:<20}{row['count']:>7}{row['errors']:>8}"
+              f"{row['p50'] * 1000:>8.1f}{row['p95'] * 1000:>8.1f}{row['p99'] * 1000:>8.1f}")
+    print("\noutbound calls")
+    for endpoint, count in result["outbound"].items():
+        print(f"  {endpoint:<60}{count:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="irispy.py offline load test")
+    parser.add_argument("--trace", default=TRACE_PATH)
+    parser.add_argument("--rate", type=float, default=0, help="초당 메시지 수 (0이면 최대 속도)")
+    parser.add_argument("--repeat", type=int, default=5, help="트레이스 반복 횟수")
+    parser.add_argument("--http-latency", type=float, default=0.02, help="스텁 HTTP 응답 지연(초)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--stub", action="store_true", help="bench/stub_server.py로 실제 HTTP 요청")
+    args = parser.parse_args()
+
+    result = run(load_trace(args.trace), args.rate, args.repeat, args.http_latency, args.stub)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+msgId 생성기 스트레스 테스트 — 여러 스레드에서 초당 --rate개씩 --seconds초 동안 생성
+
+확인 항목:
+    - 생성된 ID 전체에 중복이 없음
+    - 스레드마다 받은 ID가 단조 증가
+    - MSG_ID_MOD 경계를 넘는 타임스탬프에서도 중복이 없음
+    - 이전 방식(_generate_message_id 원본)이 같은 조건에서 만든 중복 수 (비교용)
+
+실행: python -m bench.stress_message_id [--rate 10000] [--seconds 3] [--threads 8]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from helper.MessageId import MSG_ID_MOD, MessageIdGenerator, java_string_hashcode
+
+DEVICE_UUID = "0b4f6c1e-6f7d-4c1a-9a53-2d6e0f1b7a11"
+
+
+def legacy_message_id(device_uuid: str, timestamp: int = None) -> int:
+    """이전 구현 (100ms 버킷 + hashCode)"""
+    if timestamp is None:
+        timestamp = int(time.time() * 1000)
+    rounded_time = ((timestamp % MSG_ID_MOD) // 100) * 100
+    return rounded_time + java_string_hashcode(device_uuid)
+
+
+def run_threads(generate, rate: int, seconds: float, threads: int) -> list:
+    """threads개 스레드가 합쳐서 초당 rate개씩 생성합니다. 스레드별 ID 목록을 반환합니다."""
+    per_thread = rate / threads
+    results = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads)
+
+    def worker(out):
+        barrier.wait()
+        start = time.perf_counter()
+        total = int(per_thread * seconds)
+        for i in range(total):
+            target = start + i / per_thread
+            delay = target - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            out.append(generate(DEVICE_UUID))
+
+    pool = [threading.Thread(target=worker, args=(results[i],)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return results
+
+
+def check(results: list) -> tuple:
+    all_ids = [i for ids in results for i in ids]
+    duplicates = len(all_ids) - len(set(all_ids))
+    non_monotonic = sum(1 for ids in results for a, b in zip(ids, ids[1:]) if b <= a)
+    return len(all_ids), duplicates, non_monotonic
+
+
+def check_wraparound() -> int:
+    """MSG_ID_MOD 경계 전후 1초 동안 1ms마다 10개씩 생성해 중복 수를 셉니다."""
+    generator = MessageIdGenerator()
+    base = MSG_ID_MOD * 700  # 경계 직전 타임스탬프
+    ids = []
+    for ms in range(base - 1000, base + 1000):
+        for _ in range(10):
+            ids.append(generator.next(DEVICE_UUID, ms))
+    return len(ids) - len(set(ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="msgId generator stress test")
+    parser.add_argument("--rate", type=int, default=10000, help="초당 생성 수 (전체)")
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    generator = MessageIdGenerator()
+    start = time.perf_counter()
+    total, duplicates, non_monotonic = check(run_threads(generator.next, args.rate, args.seconds, args.threads))
+    elapsed = time.perf_counter() - start
+    print(f"generator: {total:,} ids in {elapsed:.2f}s ({total / elapsed:,.0f}/s), "
+          f"duplicates {duplicates}, non-monotonic {non_monotonic}")
+
+    legacy_total, legacy_duplicates, _ = check(run_threads(legacy_message_id, args.rate, args.seconds, args.threads))
+    print(f"legacy:    {legacy_total:,} ids, duplicates {legacy_duplicates:,}")
+
+    wrap_duplicates = check_wraparound()
+    print(f"wraparound: duplicates {wrap_duplicates}")
+
+    ok = duplicates == 0 and non_monotonic == 0 and wrap_duplicates == 0
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
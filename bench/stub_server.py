@@ -0,0 +1,354 @@
+"""
+로컬 대역 서버 — Iris / Kakao 엔드포인트를 흉내 내서 오프라인으로 테스트 / 벤치마크
+
+Iris 경로 (루트):
+    GET  /aot                                     AOT 토큰
+    POST /query   {"query": ..., "bind": [...]}   시드된 SQLite 조회 → {"data": [...]}
+    POST /reply                                   전송 기록만 남김
+
+Kakao 경로 (/<원래 호스트>/<원래 경로>, HttpClient의 IRIS_HTTP_OVERRIDE가 이렇게 바꿔 보냄):
+    talk-external.kakao.com  POST /talk/write
+    talk-pilsner.kakao.com   POST /messaging/chats/<id>/bubble/reactions
+    open.kakao.com           /moim/chats/<id>/posts, /moim/posts/<id>[/share],
+                             /c/link/kickedMembers, /c/search/unified, /profile/<id>/posts/all
+    talkmoim-api.kakao.com   /chats/<id>/posts, /posts/<id>[/share]
+    그 밖의 호스트            {"status": 0}
+
+지연시간은 평균 --latency ms에 ±--jitter ms를 섞고, --error-rate 확률로
+--errors 중 하나(음수는 Kakao status, 500 이상은 HTTP 상태 코드)를 돌려줍니다.
+난수는 --seed로 고정되므로 같은 설정이면 같은 순서로 지연/오류가 나옵니다.
+
+DB는 메모리 SQLite로, main에 chat_rooms, 붙인 db2에 open_chat_member가 있습니다.
+
+실행:
+    python -m bench.stub_server --port 8600 --latency 30 --error-rate 0.02
+    IRIS_HTTP_OVERRIDE=http://127.0.0.1:8600 python irispy.py http://127.0.0.1:8600
+"""
+import argparse
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_ERRORS = (-401, -4001, -805, 503)
+
+
+# ---------------------------------------------------------------------------
+# 시드 DB
+# ---------------------------------------------------------------------------
+
+def seed_database(rooms: int = 20, members: int = 100, seed: int = 1, room_ids: list = None) -> sqlite3.Connection:
+    """
+    chat_rooms(main)와 open_chat_member(db2)를 만들고 채웁니다.
+
+    방마다 members명이 있으며 첫 번째 멤버가 방장(link_member_type=1),
+    두 번째/세 번째 멤버가 부방장(4)입니다. 방 ID는 room_ids를 주면 그 값을,
+    아니면 18000000000000001부터 차례로 씁니다. 유저 ID는 7000000001부터 시작합니다.
+    """
+    if room_ids is None:
+        room_ids = [18000000000000001 + r for r in range(rooms)]
+    rng = random.Random(seed)
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute("ATTACH DATABASE ':memory:' AS db2")
+    conn.executescript("""
+        CREATE TABLE chat_rooms (
+            _id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER UNIQUE,
+            type TEXT,
+            link_id INTEGER,
+            active_member_ids TEXT,
+            moim_meta TEXT,
+            last_log_id INTEGER
+        );
+        CREATE TABLE db2.open_chat_member (
+            _id INTEGER PRIMARY KEY AUTOINCREMENT,
+            link_id INTEGER,
+            user_id INTEGER,
+            type INTEGER,
+            profile_type INTEGER,
+            nickname TEXT,
+            profile_image_url TEXT,
+            link_member_type INTEGER,
+            profile_link_id INTEGER,
+            involved_chat_id INTEGER,
+            enc INTEGER
+        );
+    """)
+    user_id = 7000000000
+    for r, room_id in enumerate(room_ids):
+        room_id = int(room_id)
+        link_id = 400000000 + r
+        post_id = 9000000 + r
+        member_ids = []
+        for m in range(members):
+            user_id += 1
+            member_ids.append(user_id)
+            link_member_type = 1 if m == 0 else 4 if m in (1, 2) else 2
+            conn.execute(
+                "INSERT INTO db2.open_chat_member (link_id, user_id, type, profile_type, nickname, profile_image_url,"
+                " link_member_type, profile_link_id, involved_chat_id, enc) VALUES (?, ?, 1000, 1, ?, ?, ?, ?, ?, 0)",
+                (link_id, user_id, f"유저{user_id % 100000}_{rng.randint(0, 999)}",
+                 f"https://p.kakaocdn.net/th/talkp/{user_id}.jpg", link_member_type, 800000000 + user_id % 100000000,
+                 room_id),
+            )
+        moim_meta = json.dumps([{"type": 1, "ct": json.dumps({"id": post_id, "title": f"공지 {r}"})}])
+        conn.execute(
+            "INSERT INTO chat_rooms (id, type, link_id, active_member_ids, moim_meta, last_log_id)"
+            " VALUES (?, 'OM', ?, ?, ?, ?)",
+            (room_id, link_id, json.dumps(member_ids), moim_meta, rng.randint(1, 10 ** 15)),
+        )
+    conn.commit()
+    return conn
+
+
+# ---------------------------------------------------------------------------
+# 서버
+# ---------------------------------------------------------------------------
+
+class StubState:
+    """DB / 지연 / 오류 주입 설정과 호출 기록"""
+
+    def __init__(self, conn: sqlite3.Connection, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, errors=DEFAULT_ERRORS, seed: int = 1):
+        self.conn = conn
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.errors = tuple(errors)
+        self.calls = Counter()
+        self.replies = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._log_id = 1
+
+    def draw(self):
+        """(지연 초, 주입할 오류 또는 None)"""
+        with self._lock:
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            error = self._rng.choice(self.errors) if self.errors and self._rng.random() < self.error_rate else None
+        return delay, error
+
+    def next_log_id(self) -> int:
+        with self._lock:
+            self._log_id += 1
+            return self._log_id
+
+    def record(self, route: str):
+        with self._lock:
+            self.calls[route] += 1
+
+    def query(self, query: str, bind: list) -> list:
+        """Iris처럼 값을 모두 문자열로 바꿔서 돌려줍니다. (NULL은 None)"""
+        with self._db_lock:
+            cursor = self.conn.execute(query, bind or [])
+            if cursor.description is None:
+                self.conn.commit()
+                return []
+            columns = [c[0] for c in cursor.description]
+            rows = cursor.fetchall()
+        return [{c: (None if v is None else str(v)) for c, v in zip(columns, row)} for row in rows]
+
+    def execute(self, sql: str, params=()):
+        """벤치마크 스크립트가 DB를 바꿀 때 사용합니다. (닉네임 변경 등)"""
+        with self._db_lock:
+            self.conn.execute(sql, params)
+            self.conn.commit()
+
+
+def _ok(**fields) -> dict:
+    return {"status": 0, **fields}
+
+
+def _kakao_routes(state: StubState, method: str, host: str, path: str, query: dict, body: bytes):
+    """(route 이름, 응답 JSON)"""
+    if host == "talk-external.kakao.com" and path == "/talk/write":
+        data = json.loads(body or b"{}")
+        chat_log = {"logId": state.next_log_id(), "chatId": data.get("chatId"), "msgId": data.get("msgId")}
+        if "threadId" in data:
+            chat_log.update(threadId=data["threadId"], scope=data.get("scope"))
+        return "talk/write", _ok(chatLog=chat_log)
+
+    if host == "talk-pilsner.kakao.com" and path.endswith("/bubble/reactions"):
+        return "reactions", _ok()
+
+    if host in ("open.kakao.com", "talkmoim-api.kakao.com"):
+        if re.fullmatch(r"(/moim)?/chats/\d+/posts", path):
+            if method == "GET":
+                return "posts.list", _ok(posts=[{"id": 9000000, "object_type": "TEXT", "content": "공지",
+                                                 "notice": True, "created_at": int(time.time())}])
+            return "posts.create", _ok(id=state.next_log_id())
+        if re.fullmatch(r"(/moim)?/posts/\d+/share", path):
+            return "posts.share", _ok()
+        if re.fullmatch(r"(/moim)?/posts/\d+", path):
+            if method == "GET":
+                post_id = path.rsplit("/", 1)[1]
+                return "posts.get", _ok(post={"id": post_id, "object_type": "TEXT", "owner_id": 7000000001,
+                                              "content": json.dumps([{"text": f"공지 {post_id}"}], ensure_ascii=False),
+                                              "notice": True, "created_at": int(time.time())})
+            return f"posts.{method.lower()}", _ok()
+        if path == "/c/link/kickedMembers":
+            offset = int(query.get("offset", ["0"])[0])
+            members = [] if offset else [{"userId": 7000000001, "nickname": "강퇴된유저", "kickedAt": int(time.time())}]
+            return "kickedMembers", _ok(kickedMembers=members)
+        if path == "/c/search/unified":
+            return "search", _ok(items=[{"linkId": 400000000, "name": "스텁 오픈채팅", "memberCount": 100,
+                                         "linkURL": "https://open.kakao.com/o/stub"}])
+        if re.fullmatch(r"/profile/\d+/posts/all", path):
+            return "profile.posts", _ok(count=1, posts=[{"id": 1, "content": "스텁 포스트",
+                                                         "created_at": int(time.time())}])
+
+    # 시세 API (bench/loadtest.py의 _canned_json과 같은 값)
+    if host == "api.upbit.com":
+        if path == "/v1/market/all":
+            return "upbit.markets", [{"market": "KRW-BTC", "korean_name": "비트코인", "english_name": "Bitcoin"}]
+        if path == "/v1/ticker":
+            markets = query.get("markets", ["KRW-BTC"])[0].split(",")
+            return "upbit.ticker", [{"market": m, "trade_price": 100000000.0, "signed_change_rate": 0.01}
+                                    for m in markets]
+    if host == "api.binance.com":
+        if path == "/api/v3/ticker/price":
+            return "binance.price", {"symbol": "BTCUSDT", "price": "70000.0"}
+        if path == "/api/v3/ticker/24hr":
+            return "binance.24hr", [{"symbol": "BTCUSDT", "lastPrice": "70000.0", "priceChangePercent": "1.0"}]
+    if host == "m.search.naver.com" and path.endswith("/qapirender.nhn"):
+        return "naver.usdkrw", {"country": [{"value": "1"}, {"value": "1,380.00"}]}
+
+    return f"other:{host}", _ok()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+    # keep-alive 연결에서 헤더와 본문을 따로 쓰면 Nagle + delayed ACK로 요청마다 ~40ms가 더해집니다.
+    disable_nagle_algorithm = True
+    state: StubState = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code: int, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method: str):
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        body = self.rfile.read(length) if length else b""
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        segments = parts.path.split("/", 2)
+        state = self.state
+
+        if parts.path == "/_stub/stats":
+            self._send(200, {"calls": dict(state.calls), "replies": len(state.replies)})
+            return
+
+        delay, error = state.draw()
+        if delay:
+            time.sleep(delay)
+
+        # /<host>/<path> 형태면 Kakao, 아니면 Iris
+        if len(segments) > 1 and "." in segments[1]:
+            host = segments[1]
+            path = "/" + (segments[2] if len(segments) > 2 else "")
+            route, payload = _kakao_routes(state, method, host, path, query, body)
+            state.record(route)
+            if error is not None and error >= 500:
+                self._send(error, {"status": -500})
+            elif error is not None:
+                self._send(200, {"status": error})
+            else:
+                self._send(200, payload)
+            return
+
+        state.record(parts.path)
+        if error is not None and error >= 500:
+            self._send(error, {"success": False})
+            return
+        if parts.path == "/aot":
+            self._send(200, {"success": True, "aot": {"access_token": "stub-token", "d_id": "stub-device"}})
+        elif parts.path == "/query" and method == "POST":
+            data = json.loads(body or b"{}")
+            try:
+                self._send(200, {"data": state.query(data.get("query", ""), data.get("bind", []))})
+            except sqlite3.Error as e:
+                self._send(400, {"success": False, "message": str(e)})
+        elif parts.path == "/reply" and method == "POST":
+            state.replies.append(json.loads(body or b"{}"))
+            self._send(200, {"success": True})
+        else:
+            self._send(404, {"success": False})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def start(port: int = 0, state: StubState = None, **state_kwargs):
+    """
+    스텁 서버를 데몬 스레드로 시작합니다. (server, state)를 반환하며
+    주소는 f"http://127.0.0.1:{server.server_port}" 입니다.
+    """
+    if state is None:
+        rooms = state_kwargs.pop("rooms", 20)
+        members = state_kwargs.pop("members", 100)
+        room_ids = state_kwargs.pop("room_ids", None)
+        state = StubState(seed_database(rooms, members, state_kwargs.get("seed", 1), room_ids), **state_kwargs)
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="StubServer", daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Iris / Kakao stand-in server")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--latency", type=float, default=30, help="평균 응답 지연(ms)")
+    parser.add_argument("--jitter", type=float, default=10, help="지연 편차(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 주입 확률 (0~1)")
+    parser.add_argument("--errors", default=",".join(map(str, DEFAULT_ERRORS)),
+                        help="주입할 오류 (음수: Kakao status, 500 이상: HTTP 코드)")
+    parser.add_argument("--rooms", type=int, default=20)
+    parser.add_argument("--members", type=int, default=100, help="방마다 멤버 수")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    server, state = start(
+        args.port,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        errors=[int(e) for e in args.errors.split(",") if e.strip()],
+        rooms=args.rooms,
+        members=args.members,
+        seed=args.seed,
+    )
+    print(f"stub server on http://127.0.0.1:{server.server_port} "
+          f"({args.rooms} rooms x {args.members} members, seed {args.seed})")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"calls: {dict(state.calls.most_common(8))}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
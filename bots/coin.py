@@ -1,14 +1,65 @@
-import requests
+from helper.HttpClient import http_client
 import datetime
+import threading
 import pytz
 from iris import ChatContext, PyKV
+from helper.MarketCache import market_cache
+from helper.CircuitBreaker import CircuitOpenError
 
 all_url = "https://api.upbit.com/v1/market/all"
 base_url = "https://api.upbit.com/v1/ticker?markets="
 currency_url = "https://m.search.naver.com/p/csearch/content/qapirender.nhn?key=calculator&pkid=141&q=%ED%99%98%EC%9C%A8&where=m&u1=keb&u6=standardUnit&u7=0&u3=USD&u4=KRW&u8=down&u2=1"
 binance_url = "https://api.binance.com/api/v3/ticker/"
 
+# 현재 스레드에서 처리 중인 명령어가 장애 때문에 예전 시세를 받았으면 그 나이(초)
+_served = threading.local()
+
+def _endpoint(url: str):
+    """URL → (통계용 이름, TTL 초)"""
+    if url == all_url:
+        return "upbit_markets", 600
+    if url.startswith(base_url):
+        return "upbit_ticker", 3
+    if url.startswith(binance_url + "24hr"):
+        return "binance_24hr", 5
+    if url.startswith(binance_url):
+        return "binance_price", 2
+    if url == currency_url:
+        return "usdkrw", 60
+    return "other", 3
+
+def _fetch_json(url: str):
+    """시세 캐시를 거쳐 가져옵니다. 같은 URL의 동시 요청은 HTTP 호출 한 번으로 합칩니다."""
+    name, ttl = _endpoint(url)
+    result = market_cache.get(
+        url,
+        lambda: http_client.get(url, timeout=5).json(),
+        ttl,
+        name=name,
+        cacheable=lambda data: not _is_upbit_error(data),
+    )
+    if result.fallback:
+        _served.age = max(getattr(_served, "age", 0), result.age)
+    return result.value
+
+def _reply(chat: ChatContext, text: str):
+    """시세 응답. 예전 데이터로 답하는 경우 몇 초 전 데이터인지 덧붙입니다."""
+    age = getattr(_served, "age", 0)
+    if age:
+        text += f"\n⚠️ 시세 서버 응답이 없어 {age:,.0f}초 전 데이터입니다."
+    chat.reply(text)
+
+def _is_upbit_error(data) -> bool:
+    return isinstance(data, dict) and 'error' in data
+
 def get_coin_info(chat: ChatContext):
+    _served.age = 0
+    try:
+        _dispatch_coin_command(chat)
+    except CircuitOpenError as e:
+        chat.reply(e.friendly_message)
+
+def _dispatch_coin_command(chat: ChatContext):
     match chat.message.command:
         case "!코인":
             if chat.message.has_param:
@@ -31,16 +82,18 @@ def get_coin_info(chat: ChatContext):
 def get_upbit(chat: ChatContext):
     kv = PyKV()
     query = chat.message.param.upper()
-    res = requests.get(base_url + 'KRW-' + query)
-    if 'error' in res.text:
+    res = _fetch_json(base_url + 'KRW-' + query)
+    if _is_upbit_error(res):
         try:
             result_json, query = get_upbit_korean(query)
+        except CircuitOpenError:
+            raise
         except:
             chat.reply("검색된 코인이 없습니다.")
             return None
 
     else:
-        result_json = res.json()[0]
+        result_json = res[0]
     
     price = result_json['trade_price']
     change = result_json['signed_change_rate']*100
@@ -59,7 +112,7 @@ def get_upbit(chat: ChatContext):
         result += f'\n총평가금액 : {total:,.0f}원({plus_mark}{percent:,.1f}%)\n총매수금액 : {seed:,.0f}원\n보유수량 : {amount:,.0f}개\n평균단가 : {average:,}원'
     except:
         pass        
-    chat.reply(result)
+    _reply(chat, result)
 
 def get_my_coins(chat: ChatContext):
     kv = PyKV()
@@ -74,14 +127,14 @@ def get_my_coins(chat: ChatContext):
     
     coins_query = ",".join(my_coins_list)
     
-    res = requests.get(base_url + coins_query)
+    res = _fetch_json(base_url + coins_query)
     
     result_list = []
     coins = {}
     current_total = 0
     bought_total = 0
     
-    for coin in res.json():
+    for coin in res:
         coins[coin['market'][4:]] = {'price' : coin['trade_price'], 'change' : coin['signed_change_rate']*100}
     
     for key in coins.keys():
@@ -100,22 +153,22 @@ def get_my_coins(chat: ChatContext):
     total_change = round((current_total/bought_total-1)*100,1)
     result = '내 코인\n' + '\u200b'*500 + f'\n전체\n총평가 : {current_total:,.0f}원\n총매수 : {bought_total:,.0f}원\n평가손익 : {current_total-bought_total:+,.0f}원\n수익률 : {total_change:+,.1f}%\n\n' + result
     
-    chat.reply(result)
+    _reply(chat, result)
     
 def get_upbit_all(chat: ChatContext):
-    res = requests.get(all_url)
+    res = _fetch_json(all_url)
     krw_coins = []
-    for market in res.json():
+    for market in res:
         if 'KRW' in market['market']:
             krw_coins.append(market['market'])
 
-    res = requests.get(base_url + ','.join(krw_coins))
+    res = _fetch_json(base_url + ','.join(krw_coins))
     
     result_list = []
     coins = {}
     result_list.append('업비트 원화시세\n' + '\u200b'*500)
 
-    for coin in res.json():
+    for coin in res:
         coins[coin['market'][4:]] = {'price' : coin['trade_price'], 'change' : coin['signed_change_rate']*100}
     coin_list = sorted(coins.items(),key = lambda x: x[1]['change'],reverse=True)
     
@@ -124,18 +177,18 @@ def get_upbit_all(chat: ChatContext):
         result_list.append(to_append)
     result = '\n\n'.join(result_list)
     
-    chat.reply(result)
+    _reply(chat, result)
 
 def get_upbit_korean(query):
-    res_eng_query = requests.get(all_url)
-    for market in res_eng_query.json():
+    res_eng_query = _fetch_json(all_url)
+    for market in res_eng_query:
         if 'KRW' in market['market'] and query in market['korean_name']:
             eng_query = market['market']
             if query == market['korean_name']:
                 break
 
-    res = requests.get(base_url + eng_query)
-    return (res.json()[0],eng_query[4:])
+    res = _fetch_json(base_url + eng_query)
+    return (res[0],eng_query[4:])
 
 
 def get_binance(chat: ChatContext):
@@ -144,7 +197,7 @@ def get_binance(chat: ChatContext):
         query_split = query.split("/")
         query = "".join(query_split)
         currency = get_USDKRW()
-        r = requests.get(binance_url+'24hr').json()
+        r = _fetch_json(binance_url+'24hr')
         is_USDT = query_split[1] in ["USDT", "BUSD", "USDC"]
         for coin in r:
             if coin['symbol'] == 'BTCUSDT':
@@ -159,18 +212,20 @@ def get_binance(chat: ChatContext):
                 to_USDT = float(coin['lastPrice'])
         if not is_USDT:
             price = price*to_USDT
-        BTCKRW = requests.get(base_url + "KRW-BTC").json()[0]["trade_price"]
+        BTCKRW = _fetch_json(base_url + "KRW-BTC")[0]["trade_price"]
         query_KRW = price*currency
         query_KRW_kimp = (BTCKRW/(BTCUSDT*currency))*query_KRW
         res = f'{query}\nUSD : ${price:,f}\nKRW : ￦{query_KRW:,.2f}\nKRW(김프) : ￦{query_KRW_kimp:,.2f}\n등락률 : {change:+.2f}%\n환율 : ￦{currency:,.0f}'
-        chat.reply(res)
+        _reply(chat, res)
+    except CircuitOpenError:
+        raise
     except Exception as e:
         print(e)
         chat.reply('코인이 정확하지 않거나 오류가 발생하였습니다. 코인심볼과 화폐단위를 함께 적어주세요. 예시 : BTC/USDT, ETC/USDT, IQ/BNB')
 
 def get_kimchi_premium(chat: ChatContext):
-    BTCUSDT = float(requests.get(binance_url+"price?symbol=BTCUSDT").json()["price"])
-    BTCKRW = requests.get(base_url + "KRW-BTC").json()[0]["trade_price"]
+    BTCUSDT = float(_fetch_json(binance_url+"price?symbol=BTCUSDT")["price"])
+    BTCKRW = _fetch_json(base_url + "KRW-BTC")[0]["trade_price"]
     USDKRW = get_USDKRW()
     local_time = datetime.datetime.now()
     eastern = pytz.timezone('US/Eastern')
@@ -180,15 +235,15 @@ def get_kimchi_premium(chat: ChatContext):
     BTCKRW_to_USDT = BTCKRW/USDKRW
     kimchi_premium = (BTCKRW - BTCUSDT_to_KRW) / BTCUSDT_to_KRW * 100
 
-    chat.reply(f'김치 프리미엄\n업빗 : ￦{BTCKRW:,.0f}(${BTCKRW_to_USDT:,.0f})\n바낸 : ￦{BTCUSDT_to_KRW:,.0f}(${BTCUSDT:,.0f})\n김프 : {kimchi_premium:.2f}%\n환율 : ￦{USDKRW:,.0f}\n버거시간(동부) : {EST}')
+    _reply(chat, f'김치 프리미엄\n업빗 : ￦{BTCKRW:,.0f}(${BTCKRW_to_USDT:,.0f})\n바낸 : ￦{BTCUSDT_to_KRW:,.0f}(${BTCUSDT:,.0f})\n김프 : {kimchi_premium:.2f}%\n환율 : ￦{USDKRW:,.0f}\n버거시간(동부) : {EST}')
 
 def usd_to_krw(chat: ChatContext):
     usd = float(chat.message.param)
     USDKRW = get_USDKRW()
-    chat.reply(f'${usd:,.2f} = {USDKRW*float(chat.message.msg[4:]):,.2f}원\n환율 : {USDKRW:,.2f}원')
+    _reply(chat, f'${usd:,.2f} = {USDKRW*float(chat.message.msg[4:]):,.2f}원\n환율 : {USDKRW:,.2f}원')
 
 def get_USDKRW():
-    USDKRW = float(requests.get(currency_url).json()["country"][1]["value"].replace(",",""))
+    USDKRW = float(_fetch_json(currency_url)["country"][1]["value"].replace(",",""))
     return USDKRW
 
 def coin_add(chat: ChatContext):
@@ -199,8 +254,8 @@ def coin_add(chat: ChatContext):
     symbol = msg_split[1].upper()
     amount = float(msg_split[2].replace(',',''))
     average = float(msg_split[3].replace(',',''))
-    r = requests.get(base_url + 'KRW-' + symbol)
-    if 'error' in r.text:
+    r = _fetch_json(base_url + 'KRW-' + symbol)
+    if _is_upbit_error(r):
         chat.reply('업비트 원화마켓만 지원합니다.\n"!코인등록 코인명(영문심볼) 보유수량 평균단가"로 입력하세요.')
         return None
 
@@ -1,75 +1,114 @@
-import time, datetime
-from iris import PyKV, Bot
+import time, datetime, threading, itertools
+from iris import PyKV
 import pytz
 
+from helper.Logger import get_logger
+from helper.MemberDirectory import member_directory
+from helper.NicknameHistory import LEGACY_KEY, nickname_history
+from helper.NicknameTracker import AdaptiveInterval, NicknameScanner, NicknameWatch
+from helper.RoomCache import room_cache
+
+log = get_logger(__name__)
+
 detect_rooms = ["18398338829933617"]
-refresh_second = 3
+sweep_batch = 500           # 점검 결과를 기록에 반영하는 단위
+sweep_second = 300          # 조용한 멤버 점검 최소 간격 (말한 사람은 메시지 이벤트로 바로 감지)
+max_sweep_second = 1800     # 변경이 없을 때 늘어나는 최대 간격
+
+nickname_watch = None       # start_nickname_detection()에서 만듭니다.
 
-def detect_nickname_change(base_url):
-    bot = Bot(base_url)
+
+def migrate_legacy_history():
+    """
+    PyKV 'user_history' 값이 남아 있으면 nickname_history 테이블로 옮기고 지웁니다.
+    테이블에 이미 기록이 있어 옮기지 못했으면 값을 지우지 않고 남겨 둡니다.
+    """
     kv = PyKV()
-    query = "select enc,nickname,user_id,involved_chat_id from db2.open_chat_member"
-    history = kv.get('user_history')
-    members = {}
-    
-    if not history:
-        query_result = bot.api.query(query=query, bind=[])
-        history = {}
-        for member in query_result:
-            history[member['user_id']] = {"history": [{
-                "nickname":member["nickname"],
-                "involved_chat_id":member["involved_chat_id"],
-                "date":""
-            }]
-            }
-        kv.put('user_history',history)
-    
+    blob = kv.get(LEGACY_KEY)
+    if not blob:
+        return
+    moved = nickname_history.migrate(blob)
+    if moved is None:
+        log.warning("'%s' not migrated: nickname_history already has rows, keeping the legacy value", LEGACY_KEY)
+        return
+    kv.delete(LEGACY_KEY)
+    log.info("migrated %d rows from '%s'", moved, LEGACY_KEY)
+
+
+def announce_change(bot, change):
+    """감지 방이면 변경 내역과 전체 기록을 보냅니다."""
+    if str(change.room_id) not in detect_rooms:
+        return
+
+    user_history = []
+    for nickname, date in nickname_history.recent(change.user_id):
+        user_history.append(f"ㄴ{'[' + date + ']' if not date == '' else ''} {nickname}")
+    history_string = "\n".join(user_history)
+
+    message = f"닉네임이 변경되었어요!\n{change.before} -> {change.after}\n" + "\u200b"*600 + "\n" + history_string
+
+    bot.api.reply(int(change.room_id), message.strip())
+
+
+def record_nicknames(bot, members):
+    """[{"user_id", "nickname", "involved_chat_id"}, ...]를 기록에 반영하고 알립니다. 변경 수를 반환합니다."""
+    korean = pytz.timezone('Asia/Seoul')
+    time_string = datetime.datetime.now(korean).strftime("%y%m%d %H:%M")
+    observed = [(m["user_id"], m["nickname"], m["involved_chat_id"]) for m in members]
+    changes = nickname_history.observe(observed, time_string)
+    member_directory.update_nicknames(observed)
+    for change in changes:
+        announce_change(bot, change)
+    return len(changes)
+
+
+def _is_open_chat(api, room_id) -> bool:
+    room = room_cache.get(api, room_id)
+    return bool(room and room.type and str(room.type).startswith("O"))
+
+
+def watch_message(chat):
+    """message 이벤트마다 보낸 사람의 닉네임을 확인합니다. (조회 없이 dict 비교만)"""
+    # name 프로퍼티는 값이 비어 있으면 DB를 조회하므로 이벤트에 실려 온 이름만 씁니다.
+    nickname = getattr(chat.sender, "_name", None)
+    if nickname:
+        nickname_watch.observe(chat.sender.id, nickname, chat.room.id)
+
+
+def detect_nickname_change(bot):
+    """
+    조용한 멤버를 위한 느린 점검(reconciliation sweep).
+    해시 스냅샷으로 바뀐 행만 찾아 반영하며, 변경이 없으면 간격을
+    sweep_second에서 max_sweep_second까지 늘립니다.
+    """
+    scanner = NicknameScanner(bot.api)
+    interval = AdaptiveInterval(sweep_second, max_sweep_second)
+
     while True:
+        changed = False
         try:
-            changed = False
-            query_result = bot.api.query(query=query, bind=[])
-            members = {}
-            for member in query_result:
-                members[member['user_id']] = {"nickname":member["nickname"],"involved_chat_id":member["involved_chat_id"]}
-            
-            for user_id in members.keys():
-                if user_id not in history.keys():
-                    history[user_id] = {"history" : [{
-                        "nickname":members[user_id]["nickname"],
-                        "involved_chat_id":members[user_id]["involved_chat_id"],
-                        "date": ""
-                    }]
-                    }
-                else:
-                    if members[user_id]["nickname"] != history[user_id]["history"][-1]["nickname"]:
-                        korean = pytz.timezone('Asia/Seoul')
-                        time_string = datetime.datetime.now(korean).strftime("%y%m%d %H:%M")
-                        history[user_id]["history"].append(
-                            {
-                                "nickname":members[user_id]["nickname"],
-                                "involved_chat_id":members[user_id]["involved_chat_id"],
-                                "date":time_string
-                            }
-                        )
-                        
-                        if members[user_id]["involved_chat_id"] in detect_rooms:
-                            user_history = []
-                            for change in history[user_id]["history"]:
-                                user_history.append(f"ㄴ{'[' + change['date'] + ']' if not change['date'] == '' else ''} {change['nickname']}")
-                            
-                            user_history.reverse()
-                            history_string = "\n".join(user_history)
-                            
-                            message = f"닉네임이 변경되었어요!\n{history[user_id]['history'][-2]['nickname']} -> {members[user_id]['nickname']}\n" + "\u200b"*600 + "\n" + history_string
-                            
-                            bot.api.reply(int(members[user_id]["involved_chat_id"]),message.strip())
-                            changed = True
-                
-            if changed:
-                kv.put('user_history',history)
-
+            # 스캔 결과를 sweep_batch개씩 반영하므로 첫 스캔(전체)도 메모리가 일정합니다.
+            members = scanner.scan()
+            while batch := list(itertools.islice(members, sweep_batch)):
+                if record_nicknames(bot, batch) > 0:
+                    changed = True
+                for member in batch:
+                    nickname_watch.remember(member["user_id"], member["nickname"], member["involved_chat_id"])
         except Exception as e:
-            print("something went wrong")
-            print(e)
-        
-        time.sleep(refresh_second)
\ No newline at end of file
+            log.exception("nickname sweep failed: %s", e)
+
+        time.sleep(interval.next(changed))
+
+
+def start_nickname_detection(bot):
+    """메시지 이벤트 감지를 등록하고 점검 스레드를 시작합니다."""
+    global nickname_watch
+    migrate_legacy_history()
+    nickname_watch = NicknameWatch(
+        lambda members: record_nicknames(
+            bot, [m for m in members if _is_open_chat(bot.api, m["involved_chat_id"])]
+        )
+    )
+    bot.on_event("message")(watch_message)
+    threading.Thread(target=detect_nickname_change, args=(bot,), name="NicknameSweep", daemon=True).start()
+    return nickname_watch
@@ -2,7 +2,6 @@ from google import genai
 from google.genai import types
 from PIL import Image
 from io import BytesIO
-import requests
 from iris.decorators import *
 from iris import ChatContext
 import os, io
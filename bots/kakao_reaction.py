@@ -1,13 +1,14 @@
 """
 카카오톡 리액션(공감) 기능 모듈 (최적화 + 답장 지원)
 """
-import requests
 import time
 import json
 from iris import ChatContext
 from concurrent.futures import ThreadPoolExecutor
-from threading import Lock
 from bots.talk_api import get_auth
+from helper.AuthProvider import aot_tokens
+from helper.HttpClient import http_client
+from helper.RoomCache import room_cache
 
 # 리액션 타입 상수
 CANCEL = 0
@@ -23,62 +24,11 @@ BASE_URL = "https://talk-pilsner.kakao.com"
 # 백그라운드 작업용 ThreadPool
 _reaction_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="Reaction")
 
-# HTTP 세션 풀링 (연결 재사용)
-_reaction_session = None
-_reaction_session_lock = Lock()
-
-# link_id 캐싱
-_link_id_cache = {}
-_link_id_cache_lock = Lock()
-_LINK_ID_CACHE_TTL = 600  # 10분
-
-
-def _get_reaction_session():
-    """HTTP 세션을 싱글톤으로 관리"""
-    global _reaction_session
-    with _reaction_session_lock:
-        if _reaction_session is None:
-            _reaction_session = requests.Session()
-            adapter = requests.adapters.HTTPAdapter(
-                pool_connections=5,
-                pool_maxsize=10,
-                max_retries=1
-            )
-            _reaction_session.mount('http://', adapter)
-            _reaction_session.mount('https://', adapter)
-        return _reaction_session
-
-
 def _get_link_id(chat: ChatContext):
-    """오픈채팅 링크 ID 가져오기 (캐싱)"""
-    room_id = str(chat.room.id)
-    current_time = time.time()
-    
-    # 캐시 확인
-    with _link_id_cache_lock:
-        if room_id in _link_id_cache:
-            cached_data = _link_id_cache[room_id]
-            if current_time - cached_data["timestamp"] < _LINK_ID_CACHE_TTL:
-                return cached_data["link_id"]
-    
-    # 캐시 미스 - DB 조회
+    """오픈채팅 링크 ID 가져오기 (방 정보 캐시)"""
     try:
-        query = "SELECT id, link_id, type FROM chat_rooms WHERE id = ?"
-        result = chat.api.query(query=query, bind=[room_id])
-
-        if result and len(result) > 0:
-            link_id = result[0].get("link_id")
-            
-            # 캐싱
-            with _link_id_cache_lock:
-                _link_id_cache[room_id] = {
-                    "link_id": link_id,
-                    "timestamp": current_time
-                }
-            
-            return link_id
-
-        return None
+        room = room_cache.for_chat(chat)
+        return room.link_id if room else None
     except Exception as e:
         print(f"[Reaction] Could not get link_id: {e}")
         return None
@@ -150,10 +100,16 @@ def _add_reaction_worker(chat: ChatContext, reaction_type: int, target_message_i
         url = f"{BASE_URL}/messaging/chats/{chat.room.id}/bubble/reactions"
 
         # 4. POST 요청 (세션 재사용)
-        session = _get_reaction_session()
-        response = session.post(url, json=payload, headers=headers, timeout=5)
+        response = http_client.post(url, json=payload, headers=headers, timeout=5)
 
         if response.status_code == 200:
+            try:
+                status = response.json().get("status")
+            except ValueError:
+                status = None
+            if aot_tokens.report_status(status, auth):
+                print(f"[Reaction] Failed - auth status: {status}")
+                return False
             return True
         else:
             print(f"[Reaction] Failed - Status: {response.status_code}")
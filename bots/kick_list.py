@@ -1,18 +1,15 @@
-import requests
+from helper.HttpClient import http_client
 from iris import ChatContext
 from bots.talk_api import get_auth
+from helper.AuthProvider import aot_tokens
+from helper.RoomCache import room_cache
 
 
 def get_link_id(chat: ChatContext):
-    """DB에서 현재 채팅방의 link_id를 가져옵니다."""
+    """현재 채팅방의 link_id를 가져옵니다. (방 정보 캐시)"""
     try:
-        result = chat.api.query(
-            query="SELECT id, link_id, type FROM chat_rooms WHERE id = ?",
-            bind=[str(chat.room.id)]
-        )
-        if result and len(result) > 0:
-            return result[0].get("link_id")
-        return None
+        room = room_cache.for_chat(chat)
+        return room.link_id if room else None
     except Exception as e:
         print(f"[KickList] Failed to get link_id: {e}")
         return None
@@ -29,9 +26,10 @@ def get_kicked_members(link_id: str, auth: str, offset: int = 0):
         "Accept-Encoding": "gzip, deflate, br",
     }
     try:
-        response = requests.get(url, headers=headers, timeout=5)
+        response = http_client.get(url, headers=headers, timeout=5)
         if response.status_code == 200:
             data = response.json()
+            aot_tokens.report_status(data.get("status"), auth)
             if data.get("status", 0) < 0:
                 return None, f"API 오류 (status: {data.get('status')})"
             return data.get("kickedMembers", []), "성공"
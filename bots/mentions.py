@@ -1,40 +1,34 @@
-import json
 from iris import ChatContext
 from bots.talk_api import talk_write, talk_write_async
+from helper.MemberDirectory import member_directory
+from helper.QueryBatch import query_many
+from helper.RoomCache import room_cache
 
 
 def get_room_master_from_db(chat: ChatContext):
-    """DB에서 방장 정보를 가져옵니다."""
+    """
+    DB에서 방장 정보를 가져옵니다. (멤버 디렉터리의 방별 역할 색인)
+    방 정보와 방장 / 부방장 행을 둘 다 읽어야 하면 query_many로 한 번에 보냅니다.
+    """
     try:
-        rows = chat.api.query(
-            "SELECT active_member_ids FROM chat_rooms WHERE id = ?",
-            [chat.room.id],
-        )
-        if not rows:
-            return None
-
-        members_data = rows[0].get("active_member_ids")
-        if not members_data:
-            return None
-
-        try:
-            member_ids = json.loads(members_data)
-            if not isinstance(member_ids, list):
-                member_ids = [member_ids]
-        except Exception:
-            member_ids = [m.strip() for m in str(members_data).split(",") if m.strip()]
-
-        for member_id in member_ids:
-            result = chat.api.query(
-                "SELECT user_id, nickname, link_member_type FROM open_chat_member WHERE user_id = ?",
-                [member_id],
-            )
-            if not result:
-                continue
-
-            row = result[0]
-            if str(row.get("link_member_type")) == "1":
-                return {"id": int(row.get("user_id")), "name": row.get("nickname")}
+        room_id = chat.room.id
+        room = room_cache.peek(room_id)
+        roles_due = member_directory.roles_due(room_id)
+        statements = []
+        if room is None:
+            statements.append(room_cache.statement(room_id))
+        if roles_due:
+            statements.append(member_directory.roles_statement(room_id))
+        results = query_many(chat.api, statements)
+        if room is None:
+            room = room_cache.prime(room_id, results.pop(0))
+        if roles_due:
+            member_directory.prime_roles(room_id, results.pop(0))
+
+        member_ids = room.active_member_ids if room else ()
+        host = member_directory.room_host(chat.api, room_id, member_ids)
+        if host is not None:
+            return {"id": host.user_id, "name": host.nickname}
     except Exception as e:
         print(f"[mentions] get_room_master_from_db error: {e}")
 
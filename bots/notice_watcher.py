@@ -0,0 +1,142 @@
+"""
+공지 감시 — chat_rooms.moim_meta가 바뀐 방만 찾아 새 공지 / 수정된 공지를 알립니다.
+
+주기마다 감시 방 전체의 moim_meta를 쿼리 한 번으로 읽어 방별로 맨 앞 공지(ct)의 crc32와
+비교합니다. 바뀐 방만 그 방의 현재 공지 하나를 Kakao API로 가져오므로, 방마다 공지 목록 API를
+주기적으로 부르지 않습니다. 첫 주기는 기준점이라 알리지 않고, 그 뒤에 처음 보이는 방
+(시작한 뒤 첫 공지를 올린 방)은 새 공지로 알립니다.
+"""
+import json
+import threading
+import time
+import zlib
+
+from bots.notification import format_notice_content, format_time_kst, get_notice
+from helper.Logger import get_logger
+from helper.MemberDirectory import member_directory
+from helper.QueryBatch import query
+from helper.RoomCache import parse_moim_meta, room_cache
+
+log = get_logger(__name__)
+
+watch_rooms = []                      # 감시할 방 (비우면 moim_meta가 있는 모든 방)
+announce_rooms = []                   # 요약을 보낼 방 (비우면 공지가 바뀐 그 방)
+check_second = 10
+
+ROOMS_QUERY = "SELECT id, link_id, moim_meta FROM chat_rooms WHERE moim_meta IS NOT NULL AND moim_meta != ''"
+
+
+def _current_post(raw) -> tuple:
+    """moim_meta → (post_id, ct). 공지가 없으면 (None, {})"""
+    meta = parse_moim_meta(raw)
+    if meta and isinstance(meta[0], dict) and isinstance(meta[0].get("ct"), dict):
+        ct = meta[0]["ct"]
+        return ct.get("id"), ct
+    return None, {}
+
+
+def _post_hash(post_id, ct: dict) -> int:
+    """맨 앞 공지의 (post_id, ct) 해시. moim_meta의 다른 항목이 바뀌어도 달라지지 않습니다."""
+    if post_id is None:
+        return 0
+    return zlib.crc32(json.dumps([post_id, ct], sort_keys=True, ensure_ascii=False).encode("utf-8"))
+
+
+class NoticeWatcher:
+    def __init__(self, bot, rooms=None, targets=None):
+        self.bot = bot
+        self.rooms = [str(r) for r in (watch_rooms if rooms is None else rooms)]
+        self.targets = [str(r) for r in (announce_rooms if targets is None else targets)]
+        self._hashes: dict[str, int] = {}
+        self._posts: dict[str, str] = {}
+        self.cycles = 0
+        self.announced = 0
+
+    def _fetch_rooms(self) -> list:
+        """감시 방의 (id, link_id, moim_meta)를 쿼리 한 번으로 읽습니다."""
+        if not self.rooms:
+            return query(self.bot.api, ROOMS_QUERY) or []
+        placeholders = ",".join("?" * len(self.rooms))
+        return query(
+            self.bot.api,
+            f"SELECT id, link_id, moim_meta FROM chat_rooms WHERE id IN ({placeholders})",
+            self.rooms,
+        ) or []
+
+    def check(self) -> list:
+        """한 주기. [(room_id, post_id, 새 공지인지), ...] 알린 목록을 반환합니다."""
+        rows = self._fetch_rooms()
+        baseline = self.cycles == 0
+        self.cycles += 1
+        announced = []
+        for row in rows:
+            room_id = str(row.get("id"))
+            post_id, ct = _current_post(row.get("moim_meta") or "")
+            value = _post_hash(post_id, ct)
+            if self._hashes.get(room_id) == value:
+                continue
+            self._hashes[room_id] = value
+            previous = self._posts.get(room_id)
+            self._posts[room_id] = post_id
+            if baseline:
+                continue
+
+            room_cache.invalidate(room_id)
+            if post_id is None:
+                continue
+            is_new = str(post_id) != str(previous)
+            self._announce(room_id, row.get("link_id") or None, post_id, ct, is_new)
+            announced.append((room_id, post_id, is_new))
+        return announced
+
+    def _announce(self, room_id: str, link_id, post_id, ct: dict, is_new: bool):
+        post, message = get_notice(self.bot.api.iris_endpoint, room_id, post_id, link_id)
+        if post is None:
+            log.warning("room %s post %s: %s — moim_meta 내용으로 알립니다.", room_id, post_id, message)
+            post = ct
+
+        type_label, content = format_notice_content(post) if post.get("object_type") else ("📝 공지", "")
+        if not content:
+            content = post.get("title") or ""
+
+        author = ""
+        owner_id = post.get("owner_id")
+        if owner_id:
+            member = member_directory.get(self.bot.api, owner_id, room_id)
+            author = member.nickname if member and member.nickname else str(owner_id)
+
+        header = "📢 새 공지가 등록되었어요!" if is_new else "✏️ 공지가 수정되었어요!"
+        lines = [header, f"🏷️ {type_label}"]
+        if author:
+            lines.append(f"✍️ {author}")
+        if post.get("created_at"):
+            lines.append(f"🕐 {format_time_kst(post.get('created_at'))}")
+        summary = "\n".join(lines) + "\n" + "\u200b" * 500 + "\n\n" + content
+
+        for target in self.targets or [room_id]:
+            try:
+                self.bot.api.reply(int(target), summary.strip())
+            except Exception as e:
+                log.exception("reply to %s failed: %s", target, e)
+        self.announced += 1
+
+    def run(self):
+        while True:
+            try:
+                self.check()
+            except Exception as e:
+                log.exception("notice watcher error: %s", e)
+            time.sleep(check_second)
+
+    def stats(self) -> dict:
+        return {"rooms": len(self._hashes), "cycles": self.cycles, "announced": self.announced}
+
+
+notice_watcher = None   # start_notice_watcher()에서 만듭니다.
+
+
+def start_notice_watcher(bot) -> NoticeWatcher:
+    global notice_watcher
+    notice_watcher = NoticeWatcher(bot)
+    threading.Thread(target=notice_watcher.run, name="NoticeWatcher", daemon=True).start()
+    return notice_watcher
@@ -1,9 +1,15 @@
-import requests
+from helper.HttpClient import http_client
 import json
 import uuid
 from datetime import datetime, timedelta
 from iris import ChatContext
 from iris.decorators import *
+from helper.Logger import get_logger, log_payload
+from helper.AuthProvider import aot_tokens
+from helper.RoomCache import room_cache
+from helper.MemberDirectory import member_directory
+
+log = get_logger(__name__)
 
 def format_time_kst(utc_time_str: str) -> str:
     """UTC 시간을 KST로 변환하고 간단한 형식으로 반환합니다."""
@@ -15,7 +21,7 @@ def format_time_kst(utc_time_str: str) -> str:
         # YYYY-MM-DD HH:MM 형식으로 반환
         return kst_time.strftime('%Y-%m-%d %H:%M')
     except Exception as e:
-        print(f"[DEBUG] Error formatting time: {e}")
+        log.debug("Error formatting time: %s", e)
         return utc_time_str
 
 def get_notice_type_label(object_type: str) -> str:
@@ -29,93 +35,38 @@ def get_notice_type_label(object_type: str) -> str:
     return type_map.get(object_type, f"❔ {object_type}")
 
 def get_auth_from_iris(iris_endpoint: str):
-    """Iris에서 AOT 토큰 정보를 가져옵니다."""
-    try:
-        print(f"[DEBUG] Iris endpoint: {iris_endpoint}")
-        aot_url = f"{iris_endpoint}/aot"
-        print(f"[DEBUG] Requesting AOT from: {aot_url}")
-        
-        response = requests.get(aot_url)
-        print(f"[DEBUG] AOT response status: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"[DEBUG] AOT data received: {data}")
-            
-            if data.get("success"):
-                aot_data = data.get("aot", {})
-                access_token = aot_data.get("access_token")
-                device_uuid = aot_data.get("d_id")
-                
-                if not access_token or not device_uuid:
-                    print(f"[ERROR] Missing access_token or d_id")
-                    return None
-                
-                session_info = f"{access_token}-{device_uuid}"
-                print(f"[DEBUG] Session info created: {session_info[:30]}...{session_info[-20:]}")
-                return session_info
-        return None
-    except Exception as e:
-        print(f"[ERROR] Error getting auth from Iris: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+    """Iris AOT 토큰으로 만든 세션 정보("access_token-device_uuid")를 가져옵니다. (공유 캐시)"""
+    session_info = aot_tokens.session_info(iris_endpoint)
+    if not session_info:
+        log.error("Missing access_token or d_id")
+    return session_info
 
 def get_link_id_from_room(chat: ChatContext):
     """채팅방의 link_id를 가져옵니다 (오픈채팅방용)."""
     try:
-        chat_id = str(chat.room.id)
-        
-        print(f"[DEBUG] Getting link_id for chat_id: {chat_id}")
-        
-        # chat_rooms 테이블에서 직접 link_id 조회
-        query = "SELECT id, link_id, type FROM chat_rooms WHERE id = ?"
-        result = chat.api.query(
-            query=query,
-            bind=[chat_id]
-        )
-        
-        print(f"[DEBUG] chat_rooms query result: {result}")
-        
-        if result and len(result) > 0 and result[0].get("link_id"):
-            link_id = result[0].get("link_id")
-            print(f"[DEBUG] Found link_id: {link_id}")
-            return link_id
-        
-        print(f"[DEBUG] No link_id found - this might not be an open chat")
+        room = room_cache.for_chat(chat)
+        if room and room.link_id:
+            log.debug("Found link_id: %s", room.link_id)
+            return room.link_id
+
+        log.debug("No link_id found - this might not be an open chat")
         return None
     except Exception as e:
-        print(f"[ERROR] Error getting link_id: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error getting link_id: %s", e)
         return None
 
 def get_post_id_from_room(chat: ChatContext):
     """채팅방의 moim_meta에서 post_id를 가져옵니다."""
     try:
-        result = chat.api.query(
-            query="SELECT moim_meta FROM chat_rooms WHERE id = ?",
-            bind=[str(chat.room.id)]
-        )
-
-        if result and result[0].get("moim_meta"):
-            raw_meta = result[0].get("moim_meta")
-            moim_meta = json.loads(raw_meta)
-
-            if isinstance(moim_meta, list) and moim_meta:
-                ct_raw = moim_meta[0].get("ct")
-                if ct_raw:
-                    ct_data = json.loads(ct_raw)
-                    post_id = ct_data.get("id")
-                    print(f"[DEBUG] Found post_id: {post_id}")
-                    return post_id
-        
-        print(f"[DEBUG] No post_id found in moim_meta")
+        room = room_cache.for_chat(chat)
+        if room and room.post_id:
+            log.debug("Found post_id: %s", room.post_id)
+            return room.post_id
+
+        log.debug("No post_id found in moim_meta")
         return None
     except Exception as e:
-        print(f"[ERROR] Error getting post_id from room: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error getting post_id from room: %s", e)
         return None
 
 def get_notices(chat: ChatContext):
@@ -139,28 +90,67 @@ def get_notices(chat: ChatContext):
             "A": "android/25.8.2/ko"
         }
 
-        print(f"[DEBUG] get_notices URL: {url}")
+        log.debug("get_notices URL: %s", url)
+
+        response = http_client.get(url, headers=headers)
+
+        log.debug("get_notices status: %s", response.status_code)
+        log_payload(log, "get_notices body", response.text)
+
+        if response.status_code == 200:
+            data = response.json()
+            aot_tokens.report_status(data.get("status"), session_info)
+            return data, "성공"
+        else:
+            return None, f"HTTP 오류: {response.status_code}"
+
+    except Exception as e:
+        log.exception("Error in get_notices: %s", e)
+        return None, str(e)
+
+def get_notice(iris_endpoint: str, room_id, post_id, link_id=None):
+    """공지 하나만 가져옵니다. (공지 감시용 — ChatContext 없이 호출)"""
+    try:
+        session_info = get_auth_from_iris(iris_endpoint)
+        if not session_info:
+            return None, "인증 정보를 가져올 수 없습니다."
+
+        if link_id:
+            url = f"https://open.kakao.com/moim/posts/{post_id}?link_id={link_id}"
+        else:
+            url = f"https://talkmoim-api.kakao.com/posts/{post_id}"
+
+        headers = {
+            "Authorization": session_info,
+            "accept-language": "ko",
+            "content-type": "application/x-www-form-urlencoded",
+            "A": "android/25.8.2/ko"
+        }
+
+        log.debug("get_notice URL: %s (room %s)", url, room_id)
 
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
 
-        print(f"[DEBUG] get_notices status: {response.status_code}")
-        print(f"[DEBUG] get_notices body: {response.text}")
+        log.debug("get_notice status: %s", response.status_code)
+        log_payload(log, "get_notice body", response.text)
 
         if response.status_code == 200:
-            return response.json(), "성공"
+            data = response.json()
+            aot_tokens.report_status(data.get("status"), session_info)
+            if data.get("status", 0) < 0:
+                return None, f"API 오류: {data.get('status')}"
+            return data.get("post") or data, "성공"
         else:
             return None, f"HTTP 오류: {response.status_code}"
 
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Error in get_notices: {e}")
-        traceback.print_exc()
+        log.exception("Error in get_notice: %s", e)
         return None, str(e)
 
 def get_notices_command(chat: ChatContext):
     """!공지목록 명령어 - 현재 방의 공지 목록을 요약 출력합니다."""
     try:
-        print(f"[DEBUG] get_notices_command called")
+        log.debug("get_notices_command called")
 
         notices, message = get_notices(chat)
         if notices is None:
@@ -174,28 +164,22 @@ def get_notices_command(chat: ChatContext):
             chat.reply("현재 방에 공지가 없습니다.")
             return
 
-        # open_chat_member 테이블에서 닉네임 맵 생성
+        # 작성자 닉네임을 멤버 디렉터리에서 한 번에 조회
         member_names = {}
         try:
-            query = "SELECT * FROM open_chat_member"
-            result = chat.api.query(query=query)
-            print(f"[DEBUG] open_chat_member query result count: {len(result) if result else 0}")
-            for row in result:
-                user_id = row.get("user_id")
-                nickname = row.get("nickname")
-                if user_id and nickname:
-                    member_names[user_id] = nickname
-            print(f"[DEBUG] member_names map size: {len(member_names)}")
+            owner_ids = {str(notice.get("owner_id")) for notice in notices}
+            member_names = member_directory.nicknames(chat.api, owner_ids, chat.room.id)
+            log.debug("member_names map size: %s", len(member_names))
         except Exception as e:
-            print(f"[DEBUG] Error getting nicknames from open_chat_member: {e}")
+            log.debug("Error getting nicknames from member directory: %s", e)
 
         result_lines = ["📌 공지 목록"]
         for i, notice in enumerate(notices):
             post_id = notice.get("id", "unknown")
             owner_id = str(notice.get("owner_id"))
-            print(f"[DEBUG] Notice {i+1} - owner_id from API: {owner_id} (type: {type(notice.get('owner_id'))})")
+            log.debug("Notice %s - owner_id from API: %s (type: %s)", i+1, owner_id, type(notice.get('owner_id')))
             author = member_names.get(owner_id, owner_id)
-            print(f"[DEBUG] Notice {i+1} - author found: {author}")
+            log.debug("Notice %s - author found: %s", i+1, author)
             created_at = format_time_kst(notice.get("created_at", ""))
             
             # 타입과 고정 여부
@@ -209,16 +193,86 @@ def get_notices_command(chat: ChatContext):
         chat.reply("\n".join(result_lines))
 
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Exception in get_notices_command: {e}")
-        traceback.print_exc()
+        log.exception("Exception in get_notices_command: %s", e)
         chat.reply("공지 목록 조회 중 오류가 발생했습니다.")
 
+def format_notice_content(target: dict):
+    """공지 하나를 (타입 라벨, 본문)으로 변환합니다."""
+    object_type = target.get("object_type", "TEXT")
+    type_label = get_notice_type_label(object_type)
+    content = ""
+    
+    try:
+        if object_type == "TEXT":
+            # 텍스트 공지
+            content_list = json.loads(target.get("content", "[]"))
+            content = content_list[0].get("text", "")
+            
+        elif object_type == "SCHEDULE":
+            # 일정
+            schedule = target.get("schedule", {})
+            subject = schedule.get("subject", "")
+            start_at = format_time_kst(schedule.get("start_at", ""))
+            end_at = format_time_kst(schedule.get("end_at", ""))
+            all_day = schedule.get("all_day", False)
+            
+            content = f"📅 일정: {subject}\n"
+            if all_day:
+                content += f"⏰ 종일"
+            else:
+                content += f"⏰ {start_at} ~ {end_at}"
+                
+        elif object_type == "POLL":
+            # 투표
+            poll = target.get("poll", {})
+            poll_details = poll.get("poll_details", [])
+            if poll_details:
+                detail = poll_details[0]
+                subject = detail.get("subject", "")
+                items = detail.get("items", [])
+                closed = poll.get("closed", False)
+                closed_at = format_time_kst(poll.get("closed_at", ""))
+                
+                content = f"📊 투표: {subject}\n"
+                content += f"상태: {'종료' if closed else '진행중'}\n"
+                if not closed:
+                    content += f"마감: {closed_at}\n"
+                content += "\n선택지:\n"
+                for idx, item in enumerate(items, 1):
+                    title = item.get("title", "")
+                    user_count = item.get("user_count", 0)
+                    content += f"{idx}. {title} ({user_count}표)\n"
+                    
+        elif object_type == "QUIZ":
+            # 퀴즈
+            quiz = target.get("quiz", {})
+            quiz_details = quiz.get("quiz_details", [])
+            if quiz_details:
+                detail = quiz_details[0]
+                subject = detail.get("subject", "")
+                items = detail.get("items", [])
+                closed = quiz.get("closed", False)
+                time_limit = quiz.get("time_limit", 0)
+                
+                content = f"❓ 퀴즈: {subject}\n"
+                content += f"상태: {'종료' if closed else '진행중'}\n"
+                content += f"제한시간: {time_limit}초\n"
+                content += "\n선택지:\n"
+                for idx, item in enumerate(items, 1):
+                    title = item.get("title", "")
+                    user_count = item.get("user_count", 0)
+                    content += f"{idx}. {title} ({user_count}명)\n"
+    except Exception as e:
+        log.exception("Error parsing content: %s", e)
+        content = "(내용을 불러올 수 없습니다)"
+
+    return type_label, content
+
 @has_param
 def get_notice_detail_command(chat: ChatContext):
     """!공지확인 명령어 - 특정 공지의 내용을 확인합니다."""
     try:
-        print(f"[DEBUG] get_notice_detail_command called")
+        log.debug("get_notice_detail_command called")
 
         post_id = chat.message.param.strip()
 
@@ -243,104 +297,29 @@ def get_notice_detail_command(chat: ChatContext):
 
         # open_chat_member 테이블에서 닉네임 가져오기
         owner_id = str(target.get("owner_id"))
-        print(f"[DEBUG] owner_id from API: {owner_id}")
+        log.debug("owner_id from API: %s", owner_id)
         author = owner_id
         
         try:
-            query = "SELECT * FROM open_chat_member WHERE user_id = ?"
-            result = chat.api.query(query=query, bind=[owner_id])
-            print(f"[DEBUG] open_chat_member query result: {result}")
+            member = member_directory.get(chat.api, owner_id, chat.room.id)
             
-            if result and len(result) > 0 and result[0].get("nickname"):
-                author = result[0].get("nickname")
-                print(f"[DEBUG] Found nickname: {author}")
+            if member and member.nickname:
+                author = member.nickname
+                log.debug("Found nickname: %s", author)
             else:
-                print(f"[DEBUG] No nickname found for user_id={owner_id}")
+                log.debug("No nickname found for user_id=%s", owner_id)
         except Exception as e:
-            print(f"[DEBUG] Error getting nickname from open_chat_member: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error getting nickname from member directory: %s", e)
         
         created_at = format_time_kst(target.get("created_at", ""))
 
-        # 타입별 content 파싱
-        object_type = target.get("object_type", "TEXT")
-        type_label = get_notice_type_label(object_type)
-        content = ""
-        
-        try:
-            if object_type == "TEXT":
-                # 텍스트 공지
-                content_list = json.loads(target.get("content", "[]"))
-                content = content_list[0].get("text", "")
-                
-            elif object_type == "SCHEDULE":
-                # 일정
-                schedule = target.get("schedule", {})
-                subject = schedule.get("subject", "")
-                start_at = format_time_kst(schedule.get("start_at", ""))
-                end_at = format_time_kst(schedule.get("end_at", ""))
-                all_day = schedule.get("all_day", False)
-                
-                content = f"📅 일정: {subject}\n"
-                if all_day:
-                    content += f"⏰ 종일"
-                else:
-                    content += f"⏰ {start_at} ~ {end_at}"
-                    
-            elif object_type == "POLL":
-                # 투표
-                poll = target.get("poll", {})
-                poll_details = poll.get("poll_details", [])
-                if poll_details:
-                    detail = poll_details[0]
-                    subject = detail.get("subject", "")
-                    items = detail.get("items", [])
-                    closed = poll.get("closed", False)
-                    closed_at = format_time_kst(poll.get("closed_at", ""))
-                    
-                    content = f"📊 투표: {subject}\n"
-                    content += f"상태: {'종료' if closed else '진행중'}\n"
-                    if not closed:
-                        content += f"마감: {closed_at}\n"
-                    content += "\n선택지:\n"
-                    for idx, item in enumerate(items, 1):
-                        title = item.get("title", "")
-                        user_count = item.get("user_count", 0)
-                        content += f"{idx}. {title} ({user_count}표)\n"
-                        
-            elif object_type == "QUIZ":
-                # 퀴즈
-                quiz = target.get("quiz", {})
-                quiz_details = quiz.get("quiz_details", [])
-                if quiz_details:
-                    detail = quiz_details[0]
-                    subject = detail.get("subject", "")
-                    items = detail.get("items", [])
-                    closed = quiz.get("closed", False)
-                    time_limit = quiz.get("time_limit", 0)
-                    
-                    content = f"❓ 퀴즈: {subject}\n"
-                    content += f"상태: {'종료' if closed else '진행중'}\n"
-                    content += f"제한시간: {time_limit}초\n"
-                    content += "\n선택지:\n"
-                    for idx, item in enumerate(items, 1):
-                        title = item.get("title", "")
-                        user_count = item.get("user_count", 0)
-                        content += f"{idx}. {title} ({user_count}명)\n"
-        except Exception as e:
-            print(f"[DEBUG] Error parsing content: {e}")
-            import traceback
-            traceback.print_exc()
-            content = "(내용을 불러올 수 없습니다)"
+        type_label, content = format_notice_content(target)
 
         ALLSEE = '\u200b' * 500
         chat.reply(f"{ALLSEE}📌 공지\n🏷️ {type_label}\n✍️ {author}\n🕐 {created_at}\n\n{content}")
 
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Exception in get_notice_detail_command: {e}")
-        traceback.print_exc()
+        log.exception("Exception in get_notice_detail_command: %s", e)
         chat.reply("공지 확인 중 오류가 발생했습니다.")
 
 def share_notice(chat: ChatContext, post_id: str, session_info: str, link_id: str = None):
@@ -349,10 +328,10 @@ def share_notice(chat: ChatContext, post_id: str, session_info: str, link_id: st
         # 오픈채팅 여부에 따라 URL 변경
         if link_id:
             url = f"https://open.kakao.com/moim/posts/{post_id}/share?link_id={link_id}"
-            print(f"[DEBUG] Using open chat URL with link_id: {link_id}")
+            log.debug("Using open chat URL with link_id: %s", link_id)
         else:
             url = f"https://talkmoim-api.kakao.com/posts/{post_id}/share"
-            print(f"[DEBUG] Using regular chat URL")
+            log.debug("Using regular chat URL")
         
         headers = {
             "content-length": "0",
@@ -364,20 +343,21 @@ def share_notice(chat: ChatContext, post_id: str, session_info: str, link_id: st
             "authorization": session_info
         }
         
-        print(f"[DEBUG] Sharing notice - URL: {url}")
+        log.debug("Sharing notice - URL: %s", url)
         
-        response = requests.post(url, headers=headers)
+        response = http_client.post(url, headers=headers)
         
-        print(f"[DEBUG] Share response status: {response.status_code}")
-        print(f"[DEBUG] Share response body: {response.text}")
+        log.debug("Share response status: %s", response.status_code)
+        log_payload(log, "Share response body", response.text)
         
         if response.status_code != 200:
-            print(f"[ERROR] HTTP error: {response.status_code}")
+            log.error("HTTP error: %s", response.status_code)
             return False, f"HTTP 오류: {response.status_code}"
         
         try:
             result = response.json()
             status = result.get("status")
+            aot_tokens.report_status(status, session_info)
             
             if status is not None and status < 0:
                 error_messages = {
@@ -387,27 +367,25 @@ def share_notice(chat: ChatContext, post_id: str, session_info: str, link_id: st
                     -404: "공지를 찾을 수 없음"
                 }
                 error_msg = error_messages.get(status, f"알 수 없는 오류 (status: {status})")
-                print(f"[ERROR] API error: {error_msg}")
+                log.error("API error: %s", error_msg)
                 return False, error_msg
             
-            print("[SUCCESS] Notice shared successfully")
+            log.info("Notice shared successfully")
             return True, "성공"
             
         except json.JSONDecodeError:
-            print("[SUCCESS] Notice shared (non-JSON response)")
+            log.info("Notice shared (non-JSON response)")
             return True, "성공"
             
     except Exception as e:
-        print(f"[ERROR] Exception in share_notice: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception in share_notice: %s", e)
         return False, f"예외 발생: {str(e)}"
 
 @has_param
 def share_notice_command(chat: ChatContext):
     """!공지 명령어 - post_id를 받아 공지를 공유합니다."""
     try:
-        print(f"[DEBUG] share_notice_command called")
+        log.debug("share_notice_command called")
         
         post_id = chat.message.param.strip()
         
@@ -415,7 +393,7 @@ def share_notice_command(chat: ChatContext):
             chat.reply("사용법: !공지 <post_id>")
             return
         
-        print(f"[DEBUG] Post ID from param: {post_id}")
+        log.debug("Post ID from param: %s", post_id)
         
         session_info = get_auth_from_iris(chat.api.iris_endpoint)
         
@@ -433,15 +411,13 @@ def share_notice_command(chat: ChatContext):
             chat.reply(f"❌ 공지 공유 실패\n사유: {message}")
             
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Exception in share_notice_command: {e}")
-        traceback.print_exc()
+        log.exception("Exception in share_notice_command: %s", e)
         chat.reply("공지 공유 중 오류가 발생했습니다.")
 
 def share_current_notice(chat: ChatContext):
     """!현재공지 명령어 - 현재 방의 공지를 공유합니다."""
     try:
-        print(f"[DEBUG] share_current_notice called")
+        log.debug("share_current_notice called")
         
         post_id = get_post_id_from_room(chat)
         
@@ -449,7 +425,7 @@ def share_current_notice(chat: ChatContext):
             chat.reply("현재 방에 공지가 없거나 post_id를 찾을 수 없습니다.")
             return
         
-        print(f"[DEBUG] Current room post_id: {post_id}")
+        log.debug("Current room post_id: %s", post_id)
         
         session_info = get_auth_from_iris(chat.api.iris_endpoint)
         
@@ -467,9 +443,7 @@ def share_current_notice(chat: ChatContext):
             chat.reply(f"❌ 공지 공유 실패\n사유: {message}\npost_id: {post_id}")
             
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Exception in share_current_notice: {e}")
-        traceback.print_exc()
+        log.exception("Exception in share_current_notice: %s", e)
         chat.reply("공지 공유 중 오류가 발생했습니다.")
 
 def set_notice(chat: ChatContext, text: str, session_info: str, link_id: str = None):
@@ -482,11 +456,11 @@ def set_notice(chat: ChatContext, text: str, session_info: str, link_id: str = N
         if link_id:
             url = f"https://open.kakao.com/moim/chats/{chat.room.id}/posts?link_id={link_id}"
             body = f"content={urllib.parse.quote(content)}&object_type=TEXT&notice=true&link_id={link_id}"
-            print(f"[DEBUG] Using open chat URL with link_id: {link_id}")
+            log.debug("Using open chat URL with link_id: %s", link_id)
         else:
             url = f"https://talkmoim-api.kakao.com/chats/{chat.room.id}/posts"
             body = f"content={urllib.parse.quote(content)}&object_type=TEXT&notice=true"
-            print(f"[DEBUG] Using regular chat URL")
+            log.debug("Using regular chat URL")
         
         headers = {
             "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
@@ -494,18 +468,19 @@ def set_notice(chat: ChatContext, text: str, session_info: str, link_id: str = N
             "Authorization": session_info
         }
         
-        print(f"[DEBUG] Setting notice - URL: {url}")
-        print(f"[DEBUG] Body: {body}")
+        log.debug("Setting notice - URL: %s", url)
+        log.debug("Body: %s", body)
         
-        response = requests.post(url, data=body, headers=headers)
+        response = http_client.post(url, data=body, headers=headers)
         
-        print(f"[DEBUG] Set notice response status: {response.status_code}")
-        print(f"[DEBUG] Set notice response body: {response.text}")
+        log.debug("Set notice response status: %s", response.status_code)
+        log_payload(log, "Set notice response body", response.text)
         
         if response.status_code == 200:
             try:
                 result = response.json()
                 status = result.get("status")
+                aot_tokens.report_status(status, session_info)
                 
                 if status is not None and status < 0:
                     error_messages = {
@@ -515,11 +490,11 @@ def set_notice(chat: ChatContext, text: str, session_info: str, link_id: str = N
                         -805: "방장이나 관리자만 공지를 등록할 수 있습니다"
                     }
                     error_msg = error_messages.get(status, result.get("error_message", f"알 수 없는 오류 (status: {status})"))
-                    print(f"[ERROR] API error: {error_msg}")
+                    log.error("API error: %s", error_msg)
                     return False, error_msg
                 
                 post_id = result.get("id")
-                print(f"[SUCCESS] Notice created with post_id: {post_id}")
+                log.info("Notice created with post_id: %s", post_id)
                 return True, post_id
             except json.JSONDecodeError:
                 return True, None
@@ -527,16 +502,14 @@ def set_notice(chat: ChatContext, text: str, session_info: str, link_id: str = N
             return False, f"HTTP 오류: {response.status_code}"
             
     except Exception as e:
-        print(f"[ERROR] Exception in set_notice: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception in set_notice: %s", e)
         return False, str(e)
 
 @has_param
 def set_notice_command(chat: ChatContext):
     """!공지등록 명령어 - 새로운 공지를 등록합니다."""
     try:
-        print(f"[DEBUG] set_notice_command called")
+        log.debug("set_notice_command called")
         
         text = chat.message.param.strip()
         
@@ -555,6 +528,7 @@ def set_notice_command(chat: ChatContext):
         success, result = set_notice(chat, text, session_info, link_id)
         
         if success:
+            room_cache.invalidate(chat.room.id)
             if result:
                 chat.reply(f"✅ 공지 등록 완료\npost_id: {result}")
             else:
@@ -563,9 +537,7 @@ def set_notice_command(chat: ChatContext):
             chat.reply(f"❌ 공지 등록 실패\n사유: {result}")
             
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Exception in set_notice_command: {e}")
-        traceback.print_exc()
+        log.exception("Exception in set_notice_command: %s", e)
         chat.reply("공지 등록 중 오류가 발생했습니다.")
 
 def delete_notice(post_id: str, session_info: str, link_id: str = None):
@@ -573,27 +545,28 @@ def delete_notice(post_id: str, session_info: str, link_id: str = None):
     try:
         if link_id:
             url = f"https://open.kakao.com/moim/posts/{post_id}?link_id={link_id}"
-            print(f"[DEBUG] Using open chat URL with link_id: {link_id}")
+            log.debug("Using open chat URL with link_id: %s", link_id)
         else:
             url = f"https://talkmoim-api.kakao.com/posts/{post_id}"
-            print(f"[DEBUG] Using regular chat URL")
+            log.debug("Using regular chat URL")
         
         headers = {
             "A": "android/11.0.0/ko",
             "Authorization": session_info
         }
         
-        print(f"[DEBUG] Deleting notice - URL: {url}")
+        log.debug("Deleting notice - URL: %s", url)
         
-        response = requests.delete(url, headers=headers)
+        response = http_client.delete(url, headers=headers)
         
-        print(f"[DEBUG] Delete notice response status: {response.status_code}")
-        print(f"[DEBUG] Delete notice response body: {response.text}")
+        log.debug("Delete notice response status: %s", response.status_code)
+        log_payload(log, "Delete notice response body", response.text)
         
         if response.status_code == 200:
             try:
                 result = response.json()
                 status = result.get("status")
+                aot_tokens.report_status(status, session_info)
                 
                 if status is not None and status < 0:
                     error_messages = {
@@ -604,10 +577,10 @@ def delete_notice(post_id: str, session_info: str, link_id: str = None):
                         -805: "방장이나 관리자만 삭제할 수 있습니다"
                     }
                     error_msg = error_messages.get(status, result.get("error_message", f"알 수 없는 오류 (status: {status})"))
-                    print(f"[ERROR] API error: {error_msg}")
+                    log.error("API error: %s", error_msg)
                     return False, error_msg
                 
-                print(f"[SUCCESS] Notice deleted")
+                log.info("Notice deleted")
                 return True, "성공"
             except json.JSONDecodeError:
                 return True, "성공"
@@ -615,16 +588,14 @@ def delete_notice(post_id: str, session_info: str, link_id: str = None):
             return False, f"HTTP 오류: {response.status_code}"
             
     except Exception as e:
-        print(f"[ERROR] Exception in delete_notice: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception in delete_notice: %s", e)
         return False, str(e)
 
 @has_param
 def delete_notice_command(chat: ChatContext):
     """!공지삭제 명령어 - 공지를 삭제합니다."""
     try:
-        print(f"[DEBUG] delete_notice_command called")
+        log.debug("delete_notice_command called")
         
         post_id = chat.message.param.strip()
         
@@ -643,14 +614,13 @@ def delete_notice_command(chat: ChatContext):
         success, message = delete_notice(post_id, session_info, link_id)
         
         if success:
+            room_cache.invalidate(chat.room.id)
             chat.reply(f"✅ 공지 삭제 완료\npost_id: {post_id}")
         else:
             chat.reply(f"❌ 공지 삭제 실패\n사유: {message}")
             
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Exception in delete_notice_command: {e}")
-        traceback.print_exc()
+        log.exception("Exception in delete_notice_command: %s", e)
         chat.reply("공지 삭제 중 오류가 발생했습니다.")
 
 def change_notice(post_id: str, text: str, session_info: str, link_id: str = None):
@@ -663,11 +633,11 @@ def change_notice(post_id: str, text: str, session_info: str, link_id: str = Non
         if link_id:
             url = f"https://open.kakao.com/moim/posts/{post_id}?link_id={link_id}"
             body = f"content={urllib.parse.quote(content)}&object_type=TEXT&notice=true&link_id={link_id}"
-            print(f"[DEBUG] Using open chat URL with link_id: {link_id}")
+            log.debug("Using open chat URL with link_id: %s", link_id)
         else:
             url = f"https://talkmoim-api.kakao.com/posts/{post_id}"
             body = f"content={urllib.parse.quote(content)}&object_type=TEXT&notice=true"
-            print(f"[DEBUG] Using regular chat URL")
+            log.debug("Using regular chat URL")
         
         headers = {
             "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
@@ -675,18 +645,19 @@ def change_notice(post_id: str, text: str, session_info: str, link_id: str = Non
             "Authorization": session_info
         }
         
-        print(f"[DEBUG] Changing notice - URL: {url}")
-        print(f"[DEBUG] Body: {body}")
+        log.debug("Changing notice - URL: %s", url)
+        log.debug("Body: %s", body)
         
-        response = requests.put(url, data=body, headers=headers)
+        response = http_client.put(url, data=body, headers=headers)
         
-        print(f"[DEBUG] Change notice response status: {response.status_code}")
-        print(f"[DEBUG] Change notice response body: {response.text}")
+        log.debug("Change notice response status: %s", response.status_code)
+        log_payload(log, "Change notice response body", response.text)
         
         if response.status_code == 200:
             try:
                 result = response.json()
                 status = result.get("status")
+                aot_tokens.report_status(status, session_info)
                 
                 if status is not None and status < 0:
                     error_messages = {
@@ -697,10 +668,10 @@ def change_notice(post_id: str, text: str, session_info: str, link_id: str = Non
                         -805: "방장이나 관리자만 공지를 수정할 수 있습니다"
                     }
                     error_msg = error_messages.get(status, result.get("error_message", f"알 수 없는 오류 (status: {status})"))
-                    print(f"[ERROR] API error: {error_msg}")
+                    log.error("API error: %s", error_msg)
                     return False, error_msg
                 
-                print(f"[SUCCESS] Notice changed")
+                log.info("Notice changed")
                 return True, "성공"
             except json.JSONDecodeError:
                 return True, "성공"
@@ -708,16 +679,14 @@ def change_notice(post_id: str, text: str, session_info: str, link_id: str = Non
             return False, f"HTTP 오류: {response.status_code}"
             
     except Exception as e:
-        print(f"[ERROR] Exception in change_notice: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception in change_notice: %s", e)
         return False, str(e)
 
 @has_param
 def change_notice_command(chat: ChatContext):
     """!공지수정 명령어 - 공지를 수정합니다."""
     try:
-        print(f"[DEBUG] change_notice_command called")
+        log.debug("change_notice_command called")
         
         params = chat.message.param.split(" ", 1)
         
@@ -739,12 +708,11 @@ def change_notice_command(chat: ChatContext):
         success, message = change_notice(post_id, text, session_info, link_id)
         
         if success:
+            room_cache.invalidate(chat.room.id)
             chat.reply(f"✅ 공지 수정 완료\npost_id: {post_id}")
         else:
             chat.reply(f"❌ 공지 수정 실패\n사유: {message}")
             
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Exception in change_notice_command: {e}")
-        traceback.print_exc()
+        log.exception("Exception in change_notice_command: %s", e)
         chat.reply("공지 수정 중 오류가 발생했습니다.")
\ No newline at end of file
@@ -1,13 +1,18 @@
-import requests
+import urllib.parse
+from helper.HttpClient import http_client
 from iris import ChatContext
 from iris.decorators import *
 from bots.talk_api import get_auth
+from helper.AuthProvider import aot_tokens
+from helper.Logger import get_logger, log_payload
+
+log = get_logger(__name__)
 
 
 def search_open_chat(keyword: str, count: int, access_token: str, device_uuid: str, os_str: str = "android", version: str = "9.8.0", language: str = "ko"):
     """오픈채팅방을 검색합니다."""
     try:
-        url = f"https://open.kakao.com/c/search/unified?q={requests.utils.quote(keyword)}&c={count}&page=1"
+        url = f"https://open.kakao.com/c/search/unified?q={urllib.parse.quote(keyword)}&c={count}&page=1"
 
         headers = {
             "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
@@ -15,28 +20,21 @@ def search_open_chat(keyword: str, count: int, access_token: str, device_uuid: s
             "Authorization": f"{access_token}-{device_uuid}",
         }
 
-        response = requests.post(url, headers=headers, timeout=10)
+        response = http_client.post(url, headers=headers, timeout=10)
 
         if response.status_code == 200:
             result = response.json()
-            import json
-            print(f"[RoomInfo] ===== SEARCH RESPONSE =====")
-            print(f"[RoomInfo] keyword: {keyword}, count: {count}")
-            print(f"[RoomInfo] status_code: {response.status_code}")
-            print(f"[RoomInfo] full response:")
-            print(json.dumps(result, ensure_ascii=False, indent=2))
-            print(f"[RoomInfo] ============================")
+            aot_tokens.report_status(result.get("status"), f"{access_token}-{device_uuid}")
+            log.debug("search keyword: %s, count: %s, status_code: %s", keyword, count, response.status_code)
+            log_payload(log, "search response", result, indent=2)
             return result, "성공"
         else:
-            print(f"[RoomInfo] ===== SEARCH ERROR =====")
-            print(f"[RoomInfo] keyword: {keyword}, count: {count}")
-            print(f"[RoomInfo] status_code: {response.status_code}")
-            print(f"[RoomInfo] response body: {response.text}")
-            print(f"[RoomInfo] ==========================")
+            log.warning("search failed - keyword: %s, count: %s, status_code: %s", keyword, count, response.status_code)
+            log_payload(log, "search error body", response.text)
             return None, f"HTTP 오류: {response.status_code}"
 
     except Exception as e:
-        print(f"[RoomInfo] Exception in search_open_chat: {e}")
+        log.warning("Exception in search_open_chat: %s", e)
         return None, str(e)
 
 
@@ -107,6 +105,5 @@ def room_search_command(chat: ChatContext):
         chat.reply("\n".join(lines))
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception in room_search_command")
         chat.reply("방 검색 중 오류가 발생했습니다.")
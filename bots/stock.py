@@ -1,4 +1,6 @@
 import requests
+from helper.HttpClient import http_client
+from helper.CircuitBreaker import CircuitOpenError
 from PIL import Image, ImageDraw, ImageFont
 import io
 import json
@@ -14,7 +16,7 @@ def create_stock_image(chat: ChatContext):
         # 1. Fetch stock code
         query = chat.message.msg[4:]
         autocomplete_url = f"https://ac.stock.naver.com/ac?q={query}&target=stock%2Cipo%2Cindex%2Cmarketindicator"
-        autocomplete_response = requests.get(autocomplete_url)
+        autocomplete_response = http_client.get(autocomplete_url)
         autocomplete_response.raise_for_status()
         autocomplete_json = autocomplete_response.json()
 
@@ -32,7 +34,7 @@ def create_stock_image(chat: ChatContext):
 
         # 2. Fetch stock chart image
         chart_url = f"https://ssl.pstatic.net/imgfinance/chart/item/area/day/{stock_code}.png"
-        chart_response = requests.get(chart_url, stream=True)
+        chart_response = http_client.get(chart_url, stream=True)
         chart_response.raise_for_status()
 
         chart_image = Image.open(io.BytesIO(chart_response.content)).convert("RGBA")
@@ -41,7 +43,7 @@ def create_stock_image(chat: ChatContext):
 
         # 3. Fetch real-time stock data
         realtime_url = f"https://polling.finance.naver.com/api/realtime?query=SERVICE_RECENT_ITEM:{stock_code}"
-        realtime_response = requests.get(realtime_url)
+        realtime_response = http_client.get(realtime_url)
         realtime_response.raise_for_status()
         realtime_json = realtime_response.json()
 
@@ -165,6 +167,9 @@ def create_stock_image(chat: ChatContext):
 
         return chat.reply_media([img_byte_arr])
 
+    except CircuitOpenError as e:
+        chat.reply(e.friendly_message)
+        return None
     except requests.exceptions.RequestException as e:
         print(f"Request error: {e}")
         return None
@@ -1,119 +1,63 @@
+import asyncio
 import json
+import os
+import random
+import threading
 import time
-import requests
-from threading import Lock
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Callable, Optional
+import requests
+from helper.AuthProvider import aot_tokens
+from helper.HttpClient import http_client
+from helper.Logger import get_logger
+from helper.MessageId import message_ids
+from helper.RateLimit import TokenBucket
 
-TALK_WRITE_URL = "https://talk-external.kakao.com/talk/write"
-
-# 인증 정보 캐싱
-_auth_cache = {}
-_auth_cache_lock = Lock()
-_AUTH_CACHE_TTL = 300  # 5분
-
-# HTTP 세션 풀링 (연결 재사용)
-_http_session = None
-_session_lock = Lock()
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
-# 백그라운드 작업용 ThreadPool
-_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix="TalkAPI")
+log = get_logger(__name__)
 
+# 재시도할 예외 (타임아웃 / 연결 오류)
+_RETRYABLE_ERRORS = (TimeoutError, ConnectionError, requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+if httpx is not None:
+    _RETRYABLE_ERRORS += (httpx.TransportError,)
 
-def _get_session():
-    """HTTP 세션을 싱글톤으로 관리"""
-    global _http_session
-    with _session_lock:
-        if _http_session is None:
-            _http_session = requests.Session()
-            adapter = requests.adapters.HTTPAdapter(
-                pool_connections=10,
-                pool_maxsize=20,
-                max_retries=1
-            )
-            _http_session.mount('http://', adapter)
-            _http_session.mount('https://', adapter)
-        return _http_session
+TALK_WRITE_URL = os.getenv("IRIS_TALK_WRITE_URL", "https://talk-external.kakao.com/talk/write")
+TALK_WRITE_TIMEOUT = 5
+MAX_IN_FLIGHT = 256      # 이벤트 루프에서 동시에 진행할 최대 전송 수
+FALLBACK_WORKERS = 32    # httpx가 없을 때 run_in_executor에 쓰는 스레드 수
 
+GLOBAL_RATE, GLOBAL_BURST = 20, 40   # 계정 전체 초당 전송 수 / 순간 허용량
+ROOM_RATE, ROOM_BURST = 2, 5         # 방 하나의 초당 전송 수 / 순간 허용량
+MAX_RETRIES = 3                      # 5xx / 타임아웃 재시도 횟수
+RETRY_BASE_DELAY = 0.5               # 첫 재시도 대기(초), 이후 2배씩
+MAX_QUEUED = 2000                    # 전체 대기 메시지 상한
+MAX_ROOM_QUEUED = 200                # 방 하나의 대기 메시지 상한
+DEAD_LETTER_SIZE = 200               # 최종 실패 기록 보관 개수
 
-def _java_string_hashcode(s: str) -> int:
-    h = 0
-    for c in s:
-        h = (31 * h + ord(c)) & 0xFFFFFFFF
-    if h >= 0x80000000:
-        h -= 0x100000000
-    return h
+# 콜백은 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+_callback_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="TalkCallback")
 
 
 def _generate_message_id(device_uuid: str, timestamp: int = None) -> int:
-    if timestamp is None:
-        timestamp = int(time.time() * 1000)
-    counter = _java_string_hashcode(device_uuid)
-    mod_value = 2147483547
-    rounded_time = ((timestamp % mod_value) // 100) * 100
-    return rounded_time + counter
+    return message_ids.next(device_uuid, timestamp)
 
 
 def get_auth(iris_endpoint: str, force_refresh: bool = False):
-    """인증 정보를 캐싱하여 반환합니다."""
-    current_time = time.time()
-    
-    with _auth_cache_lock:
-        # 캐시 확인
-        if not force_refresh and iris_endpoint in _auth_cache:
-            cached_data = _auth_cache[iris_endpoint]
-            if current_time - cached_data["timestamp"] < _AUTH_CACHE_TTL:
-                return cached_data["access_token"], cached_data["device_uuid"]
-    
-    # 캐시 미스 또는 만료 - API 호출
-    try:
-        session = _get_session()
-        response = session.get(f"{iris_endpoint}/aot", timeout=3)
-        
-        if response.status_code != 200:
-            return None, None
-
-        data = response.json()
-        if not data.get("success"):
-            return None, None
-
-        aot = data.get("aot", {})
-        access_token = aot.get("access_token")
-        device_uuid = aot.get("d_id")
-        
-        if access_token and device_uuid:
-            # 캐싱
-            with _auth_cache_lock:
-                _auth_cache[iris_endpoint] = {
-                    "access_token": access_token,
-                    "device_uuid": device_uuid,
-                    "timestamp": current_time
-                }
-            return access_token, device_uuid
-    except Exception as e:
-        print(f"[TalkApi] Failed to get auth: {e}")
-    
-    return None, None
+    """인증 정보(access_token, device_uuid)를 공유 토큰 캐시에서 반환합니다."""
+    return aot_tokens.get(iris_endpoint, force_refresh)
 
 
-def talk_write(
-    iris_endpoint: str,
-    chat_id,
-    msg: str,
-    attach: dict = None,
-    msg_type: int = 1,
-    thread_id: int | str = None,
-) -> dict:
-    """동기 방식으로 메시지를 전송합니다."""
-    if attach is None:
-        attach = {}
-    if msg is None or not chat_id:
-        return {"result": False}
-
+def _build_request(iris_endpoint: str, chat_id, msg: str, attach: dict, msg_type: int, thread_id):
+    """talk/write 요청 (auth_token, headers, body)를 만듭니다. 인증 실패 시 None"""
     auth_token, device_uuid = get_auth(iris_endpoint)
-    
+
     if not auth_token or not device_uuid:
-        return {"result": False}
+        return None
 
     msg_id = _generate_message_id(device_uuid)
 
@@ -146,46 +90,247 @@ def talk_write(
                 separators=(",", ":"),
             )
 
-    try:
-        session = _get_session()
-        response = session.post(
-            TALK_WRITE_URL,
-            data=json.dumps(data, ensure_ascii=False).encode("utf-8"),
-            headers=headers,
-            timeout=5
-        )
-        
-        if response.status_code == 200:
-            return response.json()
-        return {"result": False, "status": response.status_code}
-    except Exception as e:
-        print(f"[TalkApi] Exception: {e}")
-        return {"result": False}
+    return auth_token, headers, json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _parse_response(response, auth_token: str) -> dict:
+    if response.status_code == 200:
+        result = response.json()
+        aot_tokens.report_status(result.get("status"), auth_token)
+        return result
+    return {"result": False, "status": response.status_code}
+
+
+class TalkTransport:
+    """
+    talk/write 전송 전용 이벤트 루프 스레드.
+
+    - 방마다 FIFO 큐를 두고 방별 전송 태스크 하나가 순서대로 보냅니다.
+      (같은 방의 메시지는 보낸 순서대로 도착, 다른 방끼리는 동시에 전송)
+    - 전체 / 방별 토큰 버킷으로 전송 속도를 제한합니다.
+    - 5xx와 타임아웃/연결 오류는 지터를 섞은 지수 백오프로 재시도하고,
+      끝내 실패한 전송은 dead_letters에 남깁니다.
+    - 대기 중인 메시지가 MAX_QUEUED(방마다 MAX_ROOM_QUEUED)를 넘으면 바로 실패를 돌려줍니다.
+    - httpx가 설치되어 있으면 httpx.AsyncClient 하나로 연결을 재사용하고,
+      없으면 run_in_executor로 공유 http_client를 호출합니다.
+    - 호출한 스레드에는 concurrent.futures.Future를 돌려줍니다.
+    """
+
+    def __init__(self, url: str = TALK_WRITE_URL, max_in_flight: int = MAX_IN_FLIGHT,
+                 global_rate: tuple = (GLOBAL_RATE, GLOBAL_BURST), room_rate: tuple = (ROOM_RATE, ROOM_BURST)):
+        self.url = url
+        self.max_in_flight = max_in_flight
+        self.room_rate = room_rate
+        self._loop = None
+        self._thread = None
+        self._client = None
+        self._executor = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+        self._global_bucket = TokenBucket(*global_rate)
+        self._room_buckets: dict = {}
+        self._rooms: dict = {}      # chat_id -> deque[(auth_token, headers, body, future)] (루프 스레드 전용)
+        self._queued = 0            # 전체 대기 수 (self._lock)
+        self._room_queued: dict = {}
+        self.dead_letters = deque(maxlen=DEAD_LETTER_SIZE)
+        self._counters = {"sent": 0, "failed": 0, "retried": 0, "dropped": 0}
+
+    def _start(self):
+        with self._lock:
+            if self._loop is not None:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                self._semaphore = asyncio.Semaphore(self.max_in_flight)
+                if httpx is not None:
+                    self._client = httpx.AsyncClient(
+                        timeout=TALK_WRITE_TIMEOUT,
+                        limits=httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=64),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=FALLBACK_WORKERS, thread_name_prefix="TalkAPI")
+                    loop.set_default_executor(self._executor)
+                ready.set()
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name="TalkLoop", daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+            return loop
 
+    async def _post_once(self, auth_token: str, headers: dict, body: bytes):
+        """한 번 전송합니다. (결과 dict, 재시도 가능 여부)"""
+        async with self._semaphore:
+            try:
+                if self._client is not None:
+                    # httpx는 http_client를 거치지 않으므로 보낼 때마다 IRIS_HTTP_OVERRIDE 등을 반영해 변환
+                    response = await self._client.post(http_client.resolve_url(self.url), content=body, headers=headers)
+                else:
+                    response = await asyncio.get_running_loop().run_in_executor(
+                        None,
+                        lambda: http_client.post(self.url, data=body, headers=headers, timeout=TALK_WRITE_TIMEOUT),
+                    )
+            except _RETRYABLE_ERRORS as e:
+                return {"result": False, "error": str(e)}, True
+            except Exception as e:
+                log.exception("post failed: %s", e)
+                return {"result": False, "error": str(e)}, False
+            try:
+                return _parse_response(response, auth_token), response.status_code >= 500
+            except Exception as e:
+                log.warning("bad response: %s", e)
+                return {"result": False, "status": response.status_code}, False
 
-def _talk_write_worker(
+    async def _acquire(self, bucket: TokenBucket):
+        while (delay := bucket.take()) > 0:
+            await asyncio.sleep(delay)
+
+    async def _send(self, chat_id, auth_token: str, headers: dict, body: bytes) -> dict:
+        room_bucket = self._room_buckets.get(chat_id)
+        if room_bucket is None:
+            room_bucket = self._room_buckets[chat_id] = TokenBucket(*self.room_rate)
+
+        for attempt in range(MAX_RETRIES + 1):
+            await self._acquire(room_bucket)
+            await self._acquire(self._global_bucket)
+            result, retryable = await self._post_once(auth_token, headers, body)
+            if not retryable or attempt == MAX_RETRIES:
+                break
+            self._counters["retried"] += 1
+            # 지수 백오프 + 지터 (0.5s, 1s, 2s ... 의 50~150%)
+            await asyncio.sleep(RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+        if result.get("result") is False or result.get("status", 0) < 0:
+            self._counters["failed"] += 1
+            self.dead_letters.append({
+                "chat_id": chat_id,
+                "status": result.get("status"),
+                "error": result.get("error"),
+                "attempts": attempt + 1,
+                "at": time.time(),
+            })
+        else:
+            self._counters["sent"] += 1
+        return result
+
+    async def _drain(self, chat_id):
+        """방 하나의 큐를 순서대로 비웁니다."""
+        queue = self._rooms[chat_id]
+        while queue:
+            auth_token, headers, body, future = queue.popleft()
+            try:
+                result = await self._send(chat_id, auth_token, headers, body)
+            except Exception as e:
+                result = {"result": False, "error": str(e)}
+            finally:
+                with self._lock:
+                    self._queued -= 1
+                    left = self._room_queued[chat_id] = self._room_queued[chat_id] - 1
+                    if not left:
+                        del self._room_queued[chat_id]
+            future.set_result(result)
+        del self._rooms[chat_id]
+        bucket = self._room_buckets.get(chat_id)
+        if bucket is not None and bucket.idle():
+            del self._room_buckets[chat_id]
+
+    def _enqueue(self, chat_id, job: tuple):
+        queue = self._rooms.get(chat_id)
+        if queue is None:
+            queue = self._rooms[chat_id] = deque()
+            queue.append(job)
+            self._loop.create_task(self._drain(chat_id))
+        else:
+            queue.append(job)
+
+    def submit(self, chat_id, auth_token: str, headers: dict, body: bytes) -> Future:
+        loop = self._loop or self._start()
+        future = Future()
+        with self._lock:
+            room_queued = self._room_queued.get(chat_id, 0)
+            if self._queued >= MAX_QUEUED or room_queued >= MAX_ROOM_QUEUED:
+                self._counters["dropped"] += 1
+                future.set_result({"result": False, "error": "queue_full"})
+                return future
+            self._queued += 1
+            self._room_queued[chat_id] = room_queued + 1
+        loop.call_soon_threadsafe(self._enqueue, chat_id, (auth_token, headers, body, future))
+        return future
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queued,
+                "rooms": len(self._room_queued),
+                "dead_letters": len(self.dead_letters),
+                **self._counters,
+            }
+
+
+_transport = TalkTransport()
+
+
+def outbound_stats() -> dict:
+    """전송 큐 / 재시도 / 실패 통계를 반환합니다."""
+    return _transport.stats()
+
+
+def _done_future(result: dict) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def talk_send(
     iris_endpoint: str,
     chat_id,
     msg: str,
-    attach: dict,
-    msg_type: int,
-    thread_id,
-    callback: Optional[Callable] = None
-):
-    """백그라운드에서 실행될 실제 전송 함수"""
+    attach: dict = None,
+    msg_type: int = 1,
+    thread_id: int | str = None,
+) -> Future:
+    """메시지를 이벤트 루프로 보내고 결과(dict)를 담을 Future를 반환합니다."""
+    if attach is None:
+        attach = {}
+    if msg is None or not chat_id:
+        return _done_future({"result": False})
+
+    request = _build_request(iris_endpoint, chat_id, msg, attach, msg_type, thread_id)
+    if request is None:
+        return _done_future({"result": False})
+    return _transport.submit(chat_id, *request)
+
+
+def talk_write(
+    iris_endpoint: str,
+    chat_id,
+    msg: str,
+    attach: dict = None,
+    msg_type: int = 1,
+    thread_id: int | str = None,
+) -> dict:
+    """동기 방식으로 메시지를 전송합니다."""
+    return talk_send(iris_endpoint, chat_id, msg, attach, msg_type, thread_id).result()
+
+
+def _on_sent(future: Future, callback: Optional[Callable]):
+    """전송 완료 시 (루프 스레드에서) 호출됩니다."""
     try:
-        result = talk_write(iris_endpoint, chat_id, msg, attach, msg_type, thread_id)
-        
-        if result.get("result") is False:
-            print(f"[TalkApi] Send failed: {result}")
-        
-        if callback:
-            callback(result)
-            
+        result = future.result()
     except Exception as e:
-        print(f"[TalkApi] Exception in worker: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("exception in sender: %s", e)
+        return
+
+    if result.get("result") is False:
+        log.warning("send failed: %s", result)
+
+    if callback:
+        _callback_executor.submit(callback, result)
 
 
 def talk_write_async(
@@ -210,7 +355,7 @@ def talk_write_async(
         callback: 전송 완료 후 호출할 콜백 함수 (선택)
     
     Returns:
-        bool: 백그라운드 작업 제출 성공 여부
+        bool: 전송 작업 제출 성공 여부
     """
     if attach is None:
         attach = {}
@@ -218,17 +363,9 @@ def talk_write_async(
         return False
     
     try:
-        _executor.submit(
-            _talk_write_worker,
-            iris_endpoint,
-            chat_id,
-            msg,
-            attach,
-            msg_type,
-            thread_id,
-            callback
-        )
+        future = talk_send(iris_endpoint, chat_id, msg, attach, msg_type, thread_id)
+        future.add_done_callback(lambda f: _on_sent(f, callback))
         return True
     except Exception as e:
-        print(f"[TalkApi] Failed to submit: {e}")
-        return False
\ No newline at end of file
+        log.exception("failed to submit: %s", e)
+        return False
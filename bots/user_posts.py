@@ -1,52 +1,30 @@
-import requests
+from helper.HttpClient import http_client
 import json
 from datetime import datetime
 from iris import ChatContext
 from iris.decorators import *
+from helper.Logger import get_logger, log_payload
+from helper.AuthProvider import aot_tokens
+from helper.MemberDirectory import member_directory
+
+log = get_logger(__name__)
 
 def get_auth_from_iris(iris_endpoint: str):
-    """Iris에서 AOT 토큰 정보를 가져옵니다."""
-    try:
-        aot_url = f"{iris_endpoint}/aot"
-        response = requests.get(aot_url)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success"):
-                aot_data = data.get("aot", {})
-                access_token = aot_data.get("access_token")
-                device_uuid = aot_data.get("d_id")
-                
-                if access_token and device_uuid:
-                    return f"{access_token}-{device_uuid}"
-        return None
-    except Exception as e:
-        print(f"[ERROR] Error getting auth: {e}")
-        return None
+    """Iris에서 AOT 토큰 정보를 가져옵니다. (공유 캐시)"""
+    return aot_tokens.session_info(iris_endpoint)
 
 def get_user_profile_link_id_from_db(chat: ChatContext, user_id: str):
-    """데이터베이스에서 유저의 모든 정보를 가져와 profile_link_id와 nickname을 반환합니다."""
+    """멤버 디렉터리에서 유저의 profile_link_id와 nickname을 반환합니다."""
     try:
-        # 모든 컬럼을 조회하도록 쿼리 수정
-        query = "SELECT * FROM open_chat_member WHERE user_id = ?"
-        result = chat.api.query(query=query, bind=[user_id])
+        member = member_directory.get(chat.api, user_id, chat.room.id)
         
-        print(f"[DEBUG] Full query result: {result}")
-        
-        if result and len(result) > 0:
-            # 전체 결과(dict 형태)에서 필요한 필드 추출
-            user_data = result[0]
-            profile_link_id = user_data.get("profile_link_id")
-            nickname = user_data.get("nickname")
-            
-            print(f"[DEBUG] Found profile_link_id: {profile_link_id}, nickname: {nickname}")
-            return profile_link_id, nickname
+        if member:
+            log.debug("Found profile_link_id: %s, nickname: %s", member.profile_link_id, member.nickname)
+            return member.profile_link_id, member.nickname
         
         return None, None
     except Exception as e:
-        print(f"[ERROR] Error getting user info: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error getting user info: %s", e)
         return None, None
 
 def format_timestamp(timestamp: int) -> str:
@@ -70,15 +48,16 @@ def get_user_posts_by_profile_link_id(profile_link_id: str, last_post_id: int =
             "User-Agent": "KT/11.0.0 An/9 ko"
         }
         
-        print(f"[DEBUG] Getting user posts - URL: {url}")
+        log.debug("Getting user posts - URL: %s", url)
         
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         
-        print(f"[DEBUG] Response status: {response.status_code}")
-        print(f"[DEBUG] Response body: {response.text}")
+        log.debug("Response status: %s", response.status_code)
+        log_payload(log, "Response body", response.text)
         
         if response.status_code == 200:
             data = response.json()
+            aot_tokens.report_status(data.get("status"), session_info)
             # status가 음수면 에러
             if data.get("status", 0) < 0:
                 return None, f"API 오류 (status: {data.get('status')})"
@@ -90,15 +69,13 @@ def get_user_posts_by_profile_link_id(profile_link_id: str, last_post_id: int =
             return None, f"HTTP 오류: {response.status_code}"
             
     except Exception as e:
-        print(f"[ERROR] Exception in get_user_posts_by_profile_link_id: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception in get_user_posts_by_profile_link_id: %s", e)
         return None, str(e)
 
 def get_user_posts_command(chat: ChatContext):
     """!유저포스트 명령어 - 특정 유저의 포스트 목록을 가져옵니다."""
     try:
-        print(f"[DEBUG] get_user_posts_command called")
+        log.debug("get_user_posts_command called")
         
         # 멘션이 있는지 확인
         user_id = None
@@ -115,9 +92,9 @@ def get_user_posts_command(chat: ChatContext):
                 mentions = attachment_data.get("mentions", [])
                 if mentions and len(mentions) > 0:
                     user_id = str(mentions[0].get("user_id"))
-                    print(f"[DEBUG] Found mention user_id: {user_id}")
+                    log.debug("Found mention user_id: %s", user_id)
             except Exception as e:
-                print(f"[DEBUG] Error parsing mention: {e}")
+                log.debug("Error parsing mention: %s", e)
         
         # 멘션이 없으면 파라미터에서 추출
         if not user_id:
@@ -150,7 +127,7 @@ def get_user_posts_command(chat: ChatContext):
                 chat.reply(f"해당 유저는 포스트가 없습니다.")
                 return
         
-        print(f"[DEBUG] Using profile_link_id: {profile_link_id}")
+        log.debug("Using profile_link_id: %s", profile_link_id)
         
         # 포스트 가져오기
         posts, message = get_user_posts_by_profile_link_id(profile_link_id, session_info=session_info)
@@ -224,16 +201,14 @@ def get_user_posts_command(chat: ChatContext):
         chat.reply("\n".join(result_lines))
         
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Exception in get_user_posts_command: {e}")
-        traceback.print_exc()
+        log.exception("Exception in get_user_posts_command: %s", e)
         chat.reply("유저 포스트 조회 중 오류가 발생했습니다.")
 
 @has_param
 def get_posts_by_link_id_command(chat: ChatContext):
     """!포스트 명령어 - profile_link_id로 유저의 포스트 목록을 가져옵니다."""
     try:
-        print(f"[DEBUG] get_posts_by_link_id_command called")
+        log.debug("get_posts_by_link_id_command called")
         
         # 파라미터에서 profile_link_id 추출
         profile_link_id = chat.message.param.strip()
@@ -242,7 +217,7 @@ def get_posts_by_link_id_command(chat: ChatContext):
             chat.reply("사용법: !포스트 <profile_link_id>")
             return
         
-        print(f"[DEBUG] Using profile_link_id: {profile_link_id}")
+        log.debug("Using profile_link_id: %s", profile_link_id)
         
         # Iris에서 인증 정보 가져오기
         session_info = get_auth_from_iris(chat.api.iris_endpoint)
@@ -320,9 +295,7 @@ def get_posts_by_link_id_command(chat: ChatContext):
         chat.reply("\n".join(result_lines))
         
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Exception in get_posts_by_link_id_command: {e}")
-        traceback.print_exc()
+        log.exception("Exception in get_posts_by_link_id_command: %s", e)
         chat.reply("포스트 조회 중 오류가 발생했습니다.")
 
 @is_reply
@@ -347,6 +320,5 @@ def debug_user_info(chat: ChatContext):
             chat.reply("유저 정보를 찾을 수 없습니다.")
             
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception in debug_user_info")
         chat.reply(f"오류: {e}")
\ No newline at end of file
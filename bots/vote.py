@@ -1,24 +1,24 @@
-import requests
 import json
 import uuid
 import urllib.parse
 from datetime import datetime, timedelta, timezone
 from iris import ChatContext
 from iris.decorators import *
+from helper.HttpClient import http_client
+from helper.Logger import get_logger, log_payload
+from helper.AuthProvider import aot_tokens
+from helper.RoomCache import room_cache
+
+log = get_logger(__name__)
 
 
 def get_link_id(chat: ChatContext):
-    """DB에서 현재 채팅방의 link_id를 가져옵니다."""
+    """현재 채팅방의 link_id를 가져옵니다. (방 정보 캐시)"""
     try:
-        result = chat.api.query(
-            query="SELECT id, link_id, type FROM chat_rooms WHERE id = ?",
-            bind=[str(chat.room.id)]
-        )
-        if result and len(result) > 0:
-            return result[0].get("link_id")
-        return None
+        room = room_cache.for_chat(chat)
+        return room.link_id if room else None
     except Exception as e:
-        print(f"[Vote] Failed to get link_id: {e}")
+        log.warning("Failed to get link_id: %s", e)
         return None
 
 
@@ -26,34 +26,21 @@ def create_poll(chat: ChatContext, subject: str, items: list, multi_select: bool
     """투표를 생성합니다."""
     try:
         link_id = get_link_id(chat)
-        print(f"[Vote] link_id: {link_id}")
-        print(f"[Vote] room.id: {chat.room.id}")
+        log.debug("link_id: %s", link_id)
+        log.debug("room.id: %s", chat.room.id)
         if not link_id:
             chat.reply("오픈채팅방의 link_id를 찾을 수 없습니다.\n오픈채팅방에서만 사용 가능합니다.")
             return
 
-        # notification.py와 동일하게 매번 새로 fetch
-        try:
-            aot_resp = requests.get(f"{chat.api.iris_endpoint}/aot", timeout=3)
-            aot_data = aot_resp.json()
-            if not aot_data.get("success"):
-                chat.reply("인증 정보를 가져올 수 없습니다.")
-                return
-            aot = aot_data.get("aot", {})
-            access_token = aot.get("access_token")
-            device_uuid = aot.get("d_id")
-            if not access_token or not device_uuid:
-                chat.reply("인증 정보를 가져올 수 없습니다.")
-                return
-        except Exception as e:
-            print(f"[Vote] AOT fetch error: {e}")
+        access_token, device_uuid = aot_tokens.get(chat.api.iris_endpoint)
+        if not access_token or not device_uuid:
             chat.reply("인증 정보를 가져올 수 없습니다.")
             return
 
         auth = f"{access_token}-{device_uuid}"
-        print(f"[Vote] access_token: {access_token[:20]}...")
-        print(f"[Vote] device_uuid: {device_uuid}")
-        print(f"[Vote] auth: {auth[:30]}...{auth[-15:]}")
+        log.debug("access_token: %s...", access_token[:20])
+        log.debug("device_uuid: %s", device_uuid)
+        log.debug("auth: %s...%s", auth[:30], auth[-15:])
 
         closed_at = (datetime.now(timezone.utc) + timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:00.000Z")
 
@@ -89,37 +76,26 @@ def create_poll(chat: ChatContext, subject: str, items: list, multi_select: bool
             "Authorization": auth,
         }
 
-        print(f"[Vote] ===== REQUEST =====")
-        print(f"[Vote] URL: {url}")
-        print(f"[Vote] Headers: A={headers['A']} | C={headers['C']}")
-        print(f"[Vote] poll_content (decoded): {poll_content}")
-        print(f"[Vote] Body (encoded): {body}")
+        log.debug("URL: %s", url)
+        log.debug("Headers: A=%s | C=%s", headers['A'], headers['C'])
+        log.debug("poll_content (decoded): %s", poll_content)
+        log.debug("Body (encoded): %s", body)
 
-        response = requests.post(url, data=body, headers=headers, timeout=5)
+        response = http_client.post(url, data=body, headers=headers, timeout=5)
 
-        print(f"[Vote] ===== RESPONSE =====")
-        print(f"[Vote] Status: {response.status_code}")
-        print(f"[Vote] Body: {response.text}")
-        print(f"[Vote] ===================")
+        log.debug("Status: %s", response.status_code)
+        log_payload(log, "Body", response.text)
 
         # -4001 권한 오류 시 토큰 갱신 후 1회 재시도
-        if response.status_code == 200 and response.json().get("status") == -4001:
-            import time
-            print(f"[Vote] -4001 발생, 토큰 갱신 후 재시도...")
-            time.sleep(1)
-            try:
-                aot_resp2 = requests.get(f"{chat.api.iris_endpoint}/aot", timeout=3)
-                aot2 = aot_resp2.json().get("aot", {})
-                at2 = aot2.get("access_token")
-                du2 = aot2.get("d_id")
-                if at2 and du2:
-                    headers["Authorization"] = f"{at2}-{du2}"
-                    print(f"[Vote] 재시도 auth: {at2[:20]}...")
-            except Exception as re:
-                print(f"[Vote] 재시도 AOT fetch error: {re}")
-            response = requests.post(url, data=body, headers=headers, timeout=5)
-            print(f"[Vote] 재시도 Status: {response.status_code}")
-            print(f"[Vote] 재시도 Body: {response.text}")
+        if response.status_code == 200 and aot_tokens.report_status(response.json().get("status"), auth):
+            log.info("인증 오류 발생, 토큰 갱신 후 재시도...")
+            at2, du2 = aot_tokens.get(chat.api.iris_endpoint, force_refresh=True)
+            if at2 and du2:
+                headers["Authorization"] = f"{at2}-{du2}"
+                log.debug("재시도 auth: %s...", at2[:20])
+            response = http_client.post(url, data=body, headers=headers, timeout=5)
+            log.debug("재시도 Status: %s", response.status_code)
+            log_payload(log, "재시도 Body", response.text)
             
 
         if response.status_code == 200:
@@ -154,8 +130,7 @@ def create_poll(chat: ChatContext, subject: str, items: list, multi_select: bool
             chat.reply(f"❌ 투표 생성 실패\nHTTP 오류: {response.status_code}\n{response.text}")
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception in create_poll")
         chat.reply("투표 생성 중 오류가 발생했습니다.")
 
 
@@ -227,6 +202,5 @@ def vote_command(chat: ChatContext):
         create_poll(chat, subject, items, multi_select=multi_select, secret=secret, hours=hours)
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception in vote_command")
         chat.reply("투표 명령어 처리 중 오류가 발생했습니다.")
\ No newline at end of file
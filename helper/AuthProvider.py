@@ -0,0 +1,123 @@
+"""
+Iris AOT 토큰 공급자 — 모든 봇 모듈이 공유하는 access_token / device_uuid 캐시
+"""
+import threading
+import time
+
+from helper.HttpClient import http_client
+from helper.Logger import get_logger
+from helper.SingleFlight import SingleFlight, flight as default_flight
+
+log = get_logger(__name__)
+
+AOT_TTL = 300            # 토큰 캐시 유지 시간(초)
+AOT_REFRESH_AHEAD = 60   # 만료 이 시간 전부터는 캐시를 돌려주면서 백그라운드로 갱신
+AUTH_ERROR_STATUSES = (-401, -4001)
+
+
+class AotTokenProvider:
+    """
+    Iris /aot 토큰을 엔드포인트별로 캐싱합니다.
+
+    - 동시에 갱신이 필요해지면 /aot 호출은 한 번만 합니다. (single-flight)
+    - 만료가 가까워지면 기존 토큰을 돌려주면서 백그라운드로 미리 갱신합니다.
+    - Kakao API가 -401/-4001을 돌려주면 report_status()로 캐시를 버립니다.
+    """
+
+    def __init__(self, ttl: float = AOT_TTL, refresh_ahead: float = AOT_REFRESH_AHEAD, flight: SingleFlight = None):
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self._cache = {}   # endpoint -> (access_token, device_uuid, fetched_at)
+        self._lock = threading.Lock()
+        self._flight = flight if flight is not None else default_flight
+        self._refreshing = set()
+
+    def _fetch(self, iris_endpoint: str):
+        try:
+            response = http_client.get(f"{iris_endpoint}/aot", timeout=3)
+            if response.status_code != 200:
+                return None, None
+
+            data = response.json()
+            if not data.get("success"):
+                return None, None
+
+            aot = data.get("aot", {})
+            access_token = aot.get("access_token")
+            device_uuid = aot.get("d_id")
+            if access_token and device_uuid:
+                with self._lock:
+                    self._cache[iris_endpoint] = (access_token, device_uuid, time.monotonic())
+                return access_token, device_uuid
+        except Exception as e:
+            log.warning("failed to get aot: %s", e)
+        return None, None
+
+    def _refresh_in_background(self, iris_endpoint: str):
+        with self._lock:
+            if iris_endpoint in self._refreshing:
+                return
+            self._refreshing.add(iris_endpoint)
+
+        def refresh():
+            try:
+                self._flight.do(("aot", iris_endpoint), self._fetch, iris_endpoint)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(iris_endpoint)
+
+        threading.Thread(target=refresh, name="AotRefresh", daemon=True).start()
+
+    def get(self, iris_endpoint: str, force_refresh: bool = False):
+        """(access_token, device_uuid)를 반환합니다. 실패하면 (None, None)"""
+        if not force_refresh:
+            entry = self._cache.get(iris_endpoint)
+            if entry is not None:
+                age = time.monotonic() - entry[2]
+                if age < self.ttl:
+                    if age > self.ttl - self.refresh_ahead:
+                        self._refresh_in_background(iris_endpoint)
+                    return entry[0], entry[1]
+        else:
+            self.invalidate(iris_endpoint)
+        return self._flight.do(("aot", iris_endpoint), self._fetch, iris_endpoint)
+
+    def session_info(self, iris_endpoint: str, force_refresh: bool = False):
+        """Kakao API Authorization 헤더 형식("access_token-device_uuid")으로 반환합니다."""
+        access_token, device_uuid = self.get(iris_endpoint, force_refresh)
+        if not access_token or not device_uuid:
+            return None
+        return f"{access_token}-{device_uuid}"
+
+    def invalidate(self, iris_endpoint: str = None):
+        """캐시된 토큰을 버립니다. iris_endpoint가 None이면 전부 버립니다."""
+        with self._lock:
+            if iris_endpoint is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(iris_endpoint, None)
+
+    def report_status(self, status, auth: str = None) -> bool:
+        """
+        Kakao API 응답 status를 전달합니다. 인증 오류(-401/-4001)면 해당 토큰을 버립니다.
+
+        Args:
+            status: 응답 JSON의 status 값
+            auth: 요청에 사용한 Authorization 값 (access_token 또는 "access_token-device_uuid")
+
+        Returns:
+            bool: 인증 오류였는지 여부
+        """
+        if status not in AUTH_ERROR_STATUSES:
+            return False
+        with self._lock:
+            if auth is None:
+                self._cache.clear()
+            else:
+                for endpoint, (access_token, _, _) in list(self._cache.items()):
+                    if auth == access_token or auth.startswith(f"{access_token}-"):
+                        del self._cache[endpoint]
+        return True
+
+
+aot_tokens = AotTokenProvider()
@@ -1,23 +1,258 @@
+import functools
+import json
+import re
+import sqlite3
+import threading
+import time
 from iris.decorators import *
 from iris import ChatContext, PyKV
 
+from helper.Logger import get_logger
+
+log = get_logger(__name__)
+
+_BAN_KEY = 'ban'                    # 전역 밴 user_id 리스트 (iris.decorators.is_not_banned 호환)
+_REGISTRY_KEY = 'ban.registry'      # 방별 밴 + 만료시간
+_VERSION_KEY = 'ban.version'        # 다른 프로세스의 변경 감지용
+_SYNC_INTERVAL = 5                  # 초
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class BanRegistry:
+    """
+    메모리에 밴 목록을 유지하고 PyKV에 write-through 합니다.
+
+    - 메시지마다 하는 is_banned() 검사는 SQLite를 건드리지 않습니다.
+    - 같은 iris.db를 쓰는 다른 봇 프로세스의 변경은 백그라운드에서
+      'ban.version' 값을 주기적으로 확인해 다시 읽어옵니다.
+    """
+
+    def __init__(self, sync_interval: float = _SYNC_INTERVAL):
+        self._lock = threading.Lock()
+        self._global = {}   # user_id -> 만료 시각(epoch) 또는 None(영구)
+        self._rooms = {}    # room_id -> {user_id: 만료 시각 또는 None}
+        self._version = None
+        self._loaded = False
+        self._sync_interval = sync_interval
+        self._sync_thread = None
+        self._local = threading.local()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._load()
+            self._loaded = True
+            if self._sync_thread is None:
+                self._sync_thread = threading.Thread(target=self._sync_loop, name="BanSync", daemon=True)
+                self._sync_thread.start()
+
+    def _db(self) -> sqlite3.Connection:
+        """PyKV와 같은 파일을 여는 스레드별 연결. 트랜잭션은 직접 BEGIN IMMEDIATE로 엽니다."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(PyKV().filename, timeout=10, isolation_level=None, check_same_thread=False)
+            db.execute("CREATE TABLE IF NOT EXISTS kv_pairs (key TEXT PRIMARY KEY, value TEXT)")
+            self._local.db = db
+        return db
+
+    def _read(self, db):
+        """registry, 예전 'ban' 리스트, version을 문장 하나로 읽어 상태에 반영합니다."""
+        rows = db.execute(
+            "SELECT key, value FROM kv_pairs WHERE key IN (?, ?, ?)",
+            (_REGISTRY_KEY, _BAN_KEY, _VERSION_KEY),
+        ).fetchall()
+        values = {}
+        for key, value in rows:
+            try:
+                values[key] = json.loads(value)
+            except (TypeError, ValueError):
+                pass
+        registry = values.get(_REGISTRY_KEY)
+        if registry:
+            self._global = {int(uid): exp for uid, exp in registry.get("global", [])}
+            self._rooms = {
+                str(room_id): {int(uid): exp for uid, exp in entries}
+                for room_id, entries in registry.get("rooms", {}).items()
+            }
+        else:
+            # 예전 형식('ban' 리스트)에서 이전
+            self._global = {int(uid): None for uid in (values.get(_BAN_KEY) or [])}
+            self._rooms = {}
+        self._version = values.get(_VERSION_KEY) or 0
+
+    def _load(self):
+        self._read(self._db())
+
+    def _write(self, db):
+        """현재 상태를 기록하고 version을 저장된 값 + 1로 올립니다. 트랜잭션 안에서 호출합니다."""
+        registry = {
+            "global": [[uid, exp] for uid, exp in self._global.items()],
+            "rooms": {
+                room_id: [[uid, exp] for uid, exp in entries.items()]
+                for room_id, entries in self._rooms.items() if entries
+            },
+        }
+        self._version = (self._version or 0) + 1
+        db.executemany(
+            "INSERT OR REPLACE INTO kv_pairs (key, value) VALUES (?, ?)",
+            [
+                (_REGISTRY_KEY, json.dumps(registry)),
+                (_BAN_KEY, json.dumps([uid for uid, exp in self._global.items() if exp is None])),
+                (_VERSION_KEY, json.dumps(self._version)),
+            ],
+        )
+
+    def _modify(self, change) -> bool:
+        """
+        BEGIN IMMEDIATE로 쓰기 잠금을 잡고 저장된 값을 다시 읽은 뒤 change()를 적용합니다.
+        다른 프로세스가 그 사이에 바꾼 내용을 덮어쓰지 않습니다. change()가 False면 쓰지 않습니다.
+        """
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                self._read(db)
+                changed = change()
+                if changed:
+                    self._purge_expired()
+                    self._write(db)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                self._read(db)
+                raise
+            self._loaded = True
+        return changed
+
+    def _sync_loop(self):
+        while True:
+            time.sleep(self._sync_interval)
+            try:
+                version = PyKV().get(_VERSION_KEY) or 0
+                if version != self._version:
+                    self.invalidate()
+            except Exception as e:
+                log.exception("sync error: %s", e)
+
+    def invalidate(self):
+        """PyKV에서 밴 목록을 다시 읽어옵니다. 다른 프로세스가 변경한 경우 호출합니다."""
+        with self._lock:
+            self._load()
+            self._loaded = True
+
+    @staticmethod
+    def _active(entries: dict, user_id: int, now: float) -> bool:
+        """_lock을 잡은 상태에서 호출합니다."""
+        expires_at = entries.get(user_id, False)   # None은 영구 밴
+        if expires_at is False:
+            return False
+        return expires_at is None or expires_at > now
+
+    def is_banned(self, user_id, room_id=None) -> bool:
+        """전역 또는 해당 방에서 밴된 유저인지 확인합니다."""
+        self._ensure_loaded()
+        user_id = int(user_id)
+        now = time.time()
+        with self._lock:
+            if self._active(self._global, user_id, now):
+                return True
+            if room_id is not None:
+                entries = self._rooms.get(str(room_id))
+                if entries and self._active(entries, user_id, now):
+                    return True
+        return False
+
+    def ban(self, user_id, room_id=None, duration: float = None) -> bool:
+        """
+        유저를 밴합니다.
+
+        Args:
+            user_id: 밴할 유저 ID
+            room_id: 방 ID (None이면 전역 밴)
+            duration: 밴 기간(초), None이면 영구
+
+        Returns:
+            bool: 새로 등록되었으면 True, 이미 밴 상태면 False
+        """
+        self._ensure_loaded()
+        user_id = int(user_id)
+        expires_at = time.time() + duration if duration else None
+
+        def change():
+            entries = self._global if room_id is None else self._rooms.setdefault(str(room_id), {})
+            if self._active(entries, user_id, time.time()):
+                return False
+            entries[user_id] = expires_at
+            return True
+
+        return self._modify(change)
+
+    def unban(self, user_id, room_id=None) -> bool:
+        """밴을 해제합니다. 밴 목록에 없었으면 False를 반환합니다."""
+        self._ensure_loaded()
+        user_id = int(user_id)
+
+        def change():
+            entries = self._global if room_id is None else self._rooms.get(str(room_id), {})
+            return entries.pop(user_id, ...) is not ...
+
+        return self._modify(change)
+
+    def _purge_expired(self):
+        now = time.time()
+        for entries in [self._global, *self._rooms.values()]:
+            for uid in [uid for uid, exp in entries.items() if exp is not None and exp <= now]:
+                del entries[uid]
+
+
+ban_registry = BanRegistry()
+
+
+def is_not_banned(func):
+    """밴된 유저의 메시지를 무시합니다. (메모리 조회만 수행)"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        chat = args[0]
+        if ban_registry.is_banned(chat.sender.id, chat.room.id):
+            return
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _parse_ban_param(chat: ChatContext):
+    """'!ban [방] [10m|2h|1d]' 형식의 옵션을 파싱합니다."""
+    room_id = None
+    duration = None
+    label = ""
+    if chat.message.has_param:
+        for token in chat.message.param.split():
+            if token in ("방", "room"):
+                room_id = chat.room.id
+                continue
+            match = re.fullmatch(r"(\d+)([smhd])", token)
+            if match:
+                duration = int(match.group(1)) * _DURATION_UNITS[match.group(2)]
+                label = token
+    return room_id, duration, label
+
+
 @is_admin
 @is_reply
 def ban_user(chat: ChatContext):
     replied_chat = chat.get_source()
     reply_user_id = replied_chat.sender.id
     reply_user_name = replied_chat.sender.name
-    kv = PyKV()
-    ban_list = kv.get('ban')
-    if not ban_list:
-        ban_list = []
-    if reply_user_id in ban_list:
+    room_id, duration, label = _parse_ban_param(chat)
+    if not ban_registry.ban(reply_user_id, room_id, duration):
         chat.reply("이미 밴 등록된 유저입니다.")
     else:
-        ban_list.append(reply_user_id)
-        print(ban_list)
-        kv.put('ban',ban_list)
-        chat.reply(f"[{reply_user_name}]님을 밴 목록에 등록하였습니다.")
+        scope = "이 방의 " if room_id is not None else ""
+        period = f" ({label})" if label else ""
+        chat.reply(f"[{reply_user_name}]님을 {scope}밴 목록에 등록하였습니다.{period}")
 
 @is_admin
 @is_reply
@@ -25,14 +260,9 @@ def unban_user(chat: ChatContext):
     replied_chat = chat.get_source()
     reply_user_id = replied_chat.sender.id
     reply_user_name = replied_chat.sender.name
-    kv = PyKV()
-    ban_list = kv.get('ban')
-    if not ban_list:
-        ban_list = []
-    if reply_user_id in ban_list:
-        ban_list.remove(reply_user_id)
-        kv.put('ban',ban_list)
-        chat.reply(f"[{reply_user_name}]님을 밴 목록에서 삭제하였습니다.")
-        print(kv.get('ban'))
+    room_id, _, _ = _parse_ban_param(chat)
+    if ban_registry.unban(reply_user_id, room_id):
+        scope = "이 방의 " if room_id is not None else ""
+        chat.reply(f"[{reply_user_name}]님을 {scope}밴 목록에서 삭제하였습니다.")
     else:
-        chat.reply("밴 목록에 없는 유저입니다.")
\ No newline at end of file
+        chat.reply("밴 목록에 없는 유저입니다.")
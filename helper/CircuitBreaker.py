@@ -0,0 +1,143 @@
+"""
+호스트별 서킷 브레이커 — 느리거나 죽은 외부 API는 타임아웃까지 기다리지 않고 바로 실패
+
+상태:
+    closed     정상. 최근 WINDOW초의 호출을 기록합니다.
+    open       최근 호출의 오류율 또는 느린 호출 비율이 기준을 넘으면 열립니다.
+               OPEN_SECONDS 동안 모든 호출이 CircuitOpenError로 바로 실패합니다.
+    half_open  OPEN_SECONDS가 지나면 한 번에 하나의 요청만 시험 삼아 보냅니다.
+               성공하면 closed, 실패하면 다시 open.
+"""
+import threading
+import time
+from collections import deque
+
+from helper.Logger import get_logger
+
+log = get_logger(__name__)
+
+WINDOW = 60              # 판단에 쓰는 최근 호출 구간(초)
+WINDOW_MAX_CALLS = 500   # 구간 안에서 기억할 최대 호출 수
+MIN_CALLS = 10           # 이보다 적게 호출됐으면 열지 않음
+ERROR_RATE = 0.5         # 오류율이 이 이상이면 열림
+SLOW_SECONDS = 3.0       # 이보다 오래 걸린 호출은 느린 호출
+SLOW_RATE = 0.5          # 느린 호출 비율이 이 이상이면 열림
+OPEN_SECONDS = 30        # 열린 상태 유지 시간(초)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 요청을 보내지 않았습니다."""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"circuit open for {host} (retry after {retry_after:.0f}s)")
+        self.host = host
+        self.retry_after = retry_after
+
+    @property
+    def friendly_message(self) -> str:
+        return f"⚠️ 외부 서비스 응답이 원활하지 않습니다. {max(1, round(self.retry_after))}초 후에 다시 시도해주세요."
+
+
+class CircuitBreaker:
+    """호스트 하나의 서킷 브레이커. 최근 호출의 (시각, 지연시간, 성공 여부)를 보관합니다."""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.trips = 0
+        self._calls = deque(maxlen=WINDOW_MAX_CALLS)
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float):
+        calls = self._calls
+        while calls and now - calls[0][0] > WINDOW:
+            calls.popleft()
+
+    def before_call(self):
+        """요청 전에 호출합니다. 열려 있으면 CircuitOpenError를 던집니다."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.monotonic()
+            remaining = self.opened_at + OPEN_SECONDS - now
+            if self.state == OPEN and remaining <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError(self.host, max(remaining, 1.0))
+
+    def record(self, seconds: float, ok: bool):
+        """요청이 끝난 뒤 지연시간과 성공 여부를 기록합니다."""
+        now = time.monotonic()
+        with self._lock:
+            self._calls.append((now, seconds, ok))
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if ok and seconds < SLOW_SECONDS:
+                    self.state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._open(now)
+                return
+            if self.state == OPEN:
+                return
+            self._prune(now)
+            total = len(self._calls)
+            if total < MIN_CALLS:
+                return
+            errors = sum(1 for _, _, success in self._calls if not success)
+            slow = sum(1 for _, latency, _ in self._calls if latency >= SLOW_SECONDS)
+            if errors / total >= ERROR_RATE or slow / total >= SLOW_RATE:
+                self._open(now)
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened_at = now
+        self.trips += 1
+        log.warning("%s opened", self.host)
+
+    def stats(self) -> dict:
+        """최근 WINDOW초의 호출 수 / 오류율 / p50 / p95 (ms)"""
+        with self._lock:
+            self._prune(time.monotonic())
+            calls = list(self._calls)
+            state = self.state
+        latencies = sorted(latency for _, latency, _ in calls)
+        count = len(calls)
+        return {
+            "state": state,
+            "trips": self.trips,
+            "count": count,
+            "error_rate": sum(1 for _, _, ok in calls if not ok) / count if count else 0.0,
+            "p50_ms": latencies[int(count * 0.50)] * 1000 if count else 0.0,
+            "p95_ms": latencies[min(count - 1, int(count * 0.95))] * 1000 if count else 0.0,
+        }
+
+
+class BreakerRegistry:
+    """호스트 이름 → CircuitBreaker"""
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(host, CircuitBreaker(host))
+        return breaker
+
+    def stats(self) -> dict:
+        return {host: breaker.stats() for host, breaker in list(self._breakers.items())}
+
+
+# HttpClient가 사용하는 기본 인스턴스
+breakers = BreakerRegistry()
@@ -0,0 +1,188 @@
+"""
+명령어 라우터 — 모든 메시지를 한 번의 사전 조회로 핸들러에 연결합니다.
+"""
+import importlib
+import threading
+import time
+from typing import Callable, Optional, Union
+
+from helper.Logger import get_logger
+from helper.Scheduler import FAST, NORMAL
+
+log = get_logger(__name__)
+
+QUEUED_MESSAGE = "⏳ 요청이 많아 대기 중입니다. (대기 {position}번째)"
+REJECTED_MESSAGE = "⚠️ 요청이 너무 많습니다. 잠시 후 다시 시도해주세요."
+
+
+class Command:
+    """등록된 명령어 한 개의 메타데이터"""
+
+    __slots__ = ("name", "aliases", "target", "description", "exec_class", "priority", "inject", "_handler")
+
+    def __init__(self, name: str, aliases: tuple, target: Union[Callable, str], description: str = "",
+                 exec_class: str = FAST, priority: int = NORMAL, inject: tuple = ()):
+        self.name = name
+        self.aliases = aliases
+        self.target = target
+        self.description = description
+        self.exec_class = exec_class
+        self.priority = priority
+        self.inject = inject
+        self._handler = target if callable(target) else None
+
+    @property
+    def names(self) -> tuple:
+        return (self.name,) + self.aliases
+
+    @property
+    def loaded(self) -> bool:
+        return self._handler is not None
+
+    @property
+    def handler(self) -> Callable:
+        """핸들러를 반환합니다. "모듈:함수" 문자열로 등록된 경우 처음 사용할 때 import 합니다."""
+        if self._handler is None:
+            module_name, _, attr = self.target.partition(":")
+            self._handler = getattr(importlib.import_module(module_name), attr)
+        return self._handler
+
+
+class CommandRouter:
+    """
+    명령어(및 별칭) → 핸들러 레지스트리.
+
+    prefix로 시작하지 않는 메시지는 데코레이터(guard)를 거치기 전에 버리고,
+    명령어는 dict 조회 한 번으로 찾습니다. scheduler가 있으면 명령어의
+    실행 클래스 워커에서 핸들러를 실행합니다.
+
+    Args:
+        prefix: 명령어 접두사 (기본: "!")
+        guard: 핸들러 실행 전에 적용할 데코레이터 (예: is_not_banned)
+        scheduler: helper.Scheduler.Scheduler (None이면 이벤트 스레드에서 바로 실행)
+        metrics: helper.Metrics.LatencyRegistry (명령어별 실행 시간 기록)
+    """
+
+    def __init__(self, prefix: str = "!", guard: Optional[Callable] = None, scheduler=None, metrics=None):
+        self.prefix = prefix
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self._commands: dict[str, Command] = {}
+        self._resources: dict[str, object] = {}
+        self._admit = guard(self._schedule) if guard else self._schedule
+
+    def add(self, names, handler: Union[Callable, str], description: str = "",
+            exec_class: str = FAST, priority: int = NORMAL, inject: tuple = ()) -> Command:
+        """
+        명령어를 등록합니다.
+
+        Args:
+            names: 명령어 문자열 또는 (명령어, 별칭...) 튜플
+            handler: 핸들러 함수 또는 "bots.coin:get_coin_info" 형식의 문자열 (처음 사용할 때 import)
+            exec_class: 스케줄러 실행 클래스
+            priority: 스케줄러 우선순위
+            inject: chat 뒤에 추가로 넘길 리소스 이름 (provide()로 등록)
+        """
+        if isinstance(names, str):
+            names = (names,)
+        for name in names:
+            if not name.startswith(self.prefix):
+                raise ValueError(f"command must start with '{self.prefix}': {name}")
+            if name in self._commands:
+                raise ValueError(f"command already registered: {name}")
+
+        command = Command(names[0], tuple(names[1:]), handler, description, exec_class, priority, inject)
+        for name in names:
+            self._commands[name] = command
+        return command
+
+    def command(self, *names, description: str = "", exec_class: str = FAST, priority: int = NORMAL,
+                inject: tuple = ()):
+        """add()의 데코레이터 버전"""
+        def decorator(func):
+            self.add(names, func, description, exec_class, priority, inject)
+            return func
+        return decorator
+
+    def provide(self, name: str, value):
+        """핸들러에 주입할 리소스를 등록합니다. (예: provide("kl", IrisLink(...)))"""
+        self._resources[name] = value
+
+    def preload(self, delay: float = 0, background: bool = True):
+        """
+        문자열로 등록된 핸들러 모듈을 미리 import 합니다.
+
+        Args:
+            delay: import 시작 전 대기 시간(초)
+            background: True면 데몬 스레드에서 실행
+        """
+        def load():
+            if delay:
+                time.sleep(delay)
+            for command in self.commands:
+                if command.loaded:
+                    continue
+                try:
+                    command.handler
+                except Exception as e:
+                    log.exception("preload %s failed: %s", command.target, e)
+
+        if background:
+            threading.Thread(target=load, name="RouterPreload", daemon=True).start()
+        else:
+            load()
+
+    def get(self, name: str) -> Optional[Command]:
+        return self._commands.get(name)
+
+    @property
+    def commands(self) -> list[Command]:
+        """중복 없는 등록 명령어 목록"""
+        seen = {}
+        for command in self._commands.values():
+            seen[id(command)] = command
+        return list(seen.values())
+
+    def dispatch(self, chat) -> bool:
+        """
+        메시지를 해당 명령어 핸들러로 전달합니다.
+
+        Returns:
+            bool: 등록된 명령어였는지 여부
+        """
+        msg = chat.message.msg
+        if not msg or not msg.startswith(self.prefix):
+            return False
+
+        command = self._commands.get(chat.message.command)
+        if command is None:
+            return False
+
+        self._admit(chat, command)
+        return True
+
+    def _schedule(self, chat, command: Command):
+        if self.scheduler is None:
+            self._run(chat, command)
+            return
+
+        position = self.scheduler.submit(command.exec_class, self._run, chat, command, priority=command.priority)
+        if position is None:
+            chat.reply(REJECTED_MESSAGE)
+        elif position > 0:
+            chat.reply(QUEUED_MESSAGE.format(position=position))
+
+    def _run(self, chat, command: Command):
+        error = False
+        start = time.perf_counter()
+        try:
+            if command.inject:
+                command.handler(chat, *[self._resources[name] for name in command.inject])
+            else:
+                command.handler(chat)
+        except Exception as e:
+            error = True
+            log.exception("%s error: %s", command.name, e)
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe(command.name, time.perf_counter() - start, error)
@@ -0,0 +1,257 @@
+"""
+공유 HTTP 클라이언트 — 호스트별 keep-alive 연결 풀 / 기본 타임아웃 / gzip / 호스트별 지표
+
+모든 봇 모듈은 requests.get/post 대신 http_client.get/post를 사용합니다.
+requests의 HTTPAdapter가 호스트마다 urllib3 연결 풀을 따로 두므로
+같은 호스트로 가는 요청은 TCP+TLS 연결을 재사용합니다.
+
+환경 변수:
+    IRIS_HTTP2_HOSTS  HTTP/2로 보낼 호스트 목록, 예) "open.kakao.com,talkmoim-api.kakao.com"
+                      httpx[http2]가 설치되어 있을 때만 사용하며, 없으면 무시합니다.
+    IRIS_HTTP_OVERRIDE 외부 호스트 요청을 모두 이 주소로 보냅니다. (오프라인 테스트용)
+                      예) "http://127.0.0.1:8600" → https://open.kakao.com/c/x 를
+                      http://127.0.0.1:8600/open.kakao.com/c/x 로 요청 (bench/stub_server.py)
+"""
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from helper.CircuitBreaker import BreakerRegistry, breakers as default_breakers
+from helper.Metrics import Histogram, gauge_lines
+
+DEFAULT_TIMEOUT = (3, 10)   # (connect, read) 초
+POOL_HOSTS = 32             # 연결 풀을 유지할 호스트 수
+POOL_MAXSIZE = 20           # 호스트당 유지할 최대 연결 수
+MAX_TRACKED_HOSTS = 64      # 지표 / 서킷 브레이커를 따로 두는 최대 호스트 수
+OTHER_HOST = "other"        # 그 뒤에 처음 보는 호스트(이미지 URL 등)를 모으는 지표 이름 (브레이커 없음)
+
+try:
+    import httpx
+    import h2  # noqa: F401 — httpx의 http2=True에 필요
+except ImportError:
+    httpx = None
+
+# httpx로 넘길 수 있는 requests 인자 (allow_redirects는 follow_redirects로 바꿔 넘김)
+_H2_KWARGS = {"params", "data", "json", "headers", "timeout", "allow_redirects"}
+
+_LOCAL_HOSTS = ("127.0.0.1", "localhost")
+
+
+def _h2_kwargs(kwargs: dict) -> dict:
+    """requests 인자 → httpx 인자"""
+    kwargs = dict(kwargs)
+    if "allow_redirects" in kwargs:
+        kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
+    if isinstance(kwargs.get("data"), (bytes, str)):
+        kwargs["content"] = kwargs.pop("data")
+    timeout = kwargs.get("timeout")
+    if isinstance(timeout, tuple):
+        kwargs["timeout"] = httpx.Timeout(timeout[1], connect=timeout[0])
+    return kwargs
+
+
+def _h2_error(error: Exception) -> requests.RequestException:
+    """httpx 예외 → 같은 의미의 requests 예외"""
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(str(error))
+    if isinstance(error, httpx.TimeoutException):
+        return requests.exceptions.ReadTimeout(str(error))
+    if isinstance(error, httpx.NetworkError):
+        return requests.exceptions.ConnectionError(str(error))
+    return requests.RequestException(str(error))
+
+
+def _to_requests_response(response) -> requests.Response:
+    """httpx.Response → requests.Response. 호출하는 쪽은 어느 경로로 보냈는지 몰라도 됩니다."""
+    result = requests.Response()
+    result.status_code = response.status_code
+    result._content = response.content   # httpx가 이미 gzip을 풀어 둔 본문
+    result.headers = CaseInsensitiveDict(response.headers)
+    result.url = str(response.url)
+    result.encoding = response.encoding
+    result.reason = response.reason_phrase
+    result.elapsed = response.elapsed
+    return result
+
+
+class HostStats:
+    """호스트 하나의 요청 수 / 지연시간 히스토그램"""
+
+    __slots__ = ("latency", "http2")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.http2 = 0
+
+
+class HttpClient(requests.Session):
+    """
+    requests.Session에 기본 타임아웃과 호스트별 지표를 더한 세션.
+
+    - timeout을 주지 않은 요청은 DEFAULT_TIMEOUT을 사용합니다.
+    - 호스트별 요청 수, 오류 수, 지연시간을 기록합니다.
+    - 연결 재사용률은 urllib3 풀의 num_requests / num_connections로 계산합니다.
+    - 호스트별 서킷 브레이커가 열려 있으면 요청하지 않고 CircuitOpenError를 던집니다.
+    - 지표와 브레이커는 MAX_TRACKED_HOSTS개 호스트까지만 따로 두고, 나머지는 OTHER_HOST로 묶습니다.
+      로컬 호스트와 trust_host()로 등록한 Iris 호스트는 브레이커를 거치지 않습니다.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, pool_hosts: int = POOL_HOSTS,
+                 pool_maxsize: int = POOL_MAXSIZE, http2_hosts=None, breakers: BreakerRegistry = None,
+                 override: str = None):
+        super().__init__()
+        self.default_timeout = timeout
+        self.override = (override or os.getenv("IRIS_HTTP_OVERRIDE") or "").rstrip("/") or None
+        self.breakers = breakers if breakers is not None else default_breakers
+        self.trusted_hosts = set(_LOCAL_HOSTS)
+        self.headers["Accept-Encoding"] = "gzip, deflate"
+
+        self._adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_maxsize, max_retries=1)
+        self.mount("http://", self._adapter)
+        self.mount("https://", self._adapter)
+
+        self._hosts: dict[str, HostStats] = {}
+        self._hosts_lock = threading.Lock()
+
+        if http2_hosts is None:
+            http2_hosts = [h.strip() for h in os.getenv("IRIS_HTTP2_HOSTS", "").split(",") if h.strip()]
+        self.http2_hosts = frozenset(http2_hosts) if httpx is not None else frozenset()
+        self._h2_client = None
+        self._h2_lock = threading.Lock()
+
+    def _stats(self, host: str) -> tuple[str, HostStats]:
+        """(지표 이름, HostStats) — 추적 호스트 수가 MAX_TRACKED_HOSTS를 넘으면 OTHER_HOST"""
+        stats = self._hosts.get(host)
+        if stats is None:
+            with self._hosts_lock:
+                stats = self._hosts.get(host)
+                if stats is None:
+                    if len(self._hosts) >= MAX_TRACKED_HOSTS and host not in self.trusted_hosts:
+                        host = OTHER_HOST
+                    stats = self._hosts.setdefault(host, HostStats())
+        return host, stats
+
+    def _get_h2_client(self):
+        with self._h2_lock:
+            if self._h2_client is None:
+                timeout = self.default_timeout
+                if isinstance(timeout, tuple):
+                    timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+                self._h2_client = httpx.Client(
+                    http2=True,
+                    timeout=timeout,
+                    headers={"Accept-Encoding": "gzip, deflate"},
+                    limits=httpx.Limits(max_keepalive_connections=POOL_MAXSIZE),
+                )
+            return self._h2_client
+
+    def resolve_url(self, url: str) -> str:
+        """IRIS_HTTP_OVERRIDE가 설정되어 있으면 외부 호스트 URL을 대역 서버 주소로 바꿉니다."""
+        if self.override is None:
+            return url
+        parts = urlsplit(url)
+        if parts.hostname in _LOCAL_HOSTS:
+            return url
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.override}/{parts.hostname}{parts.path}{query}"
+
+    def trust_host(self, endpoint: str):
+        """서킷 브레이커를 적용하지 않을 호스트를 추가합니다. (Iris 주소: "IP:PORT" 또는 URL)"""
+        if "://" not in endpoint:
+            endpoint = f"http://{endpoint}"
+        host = urlsplit(endpoint).hostname
+        if host:
+            self.trusted_hosts.add(host)
+
+    def request(self, method, url, *args, **kwargs):
+        host = urlsplit(url).hostname or ""
+        url = self.resolve_url(url)
+        tracked, stats = self._stats(host)
+        use_h2 = not args and host in self.http2_hosts and kwargs.keys() <= _H2_KWARGS
+        if "timeout" not in kwargs and not use_h2:
+            kwargs["timeout"] = self.default_timeout
+
+        # Iris /query나 로컬 대역 서버가 느리다고 회로를 열면 모든 명령어가 막히므로 제외합니다.
+        # OTHER_HOST는 서로 관계없는 호스트의 묶음이라 브레이커를 두지 않습니다.
+        breaker = None if host in self.trusted_hosts or tracked == OTHER_HOST else self.breakers.get(host)
+        if breaker is not None:
+            breaker.before_call()
+        start = time.perf_counter()
+        error = True
+        try:
+            if use_h2:
+                stats.http2 += 1
+                try:
+                    response = _to_requests_response(
+                        self._get_h2_client().request(method, url, **_h2_kwargs(kwargs))
+                    )
+                except httpx.HTTPError as e:
+                    raise _h2_error(e) from e
+            else:
+                response = super().request(method, url, *args, **kwargs)
+            error = response.status_code >= 500
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.latency.observe(elapsed, error)
+            if breaker is not None:
+                breaker.record(elapsed, not error)
+
+    def _pool_counters(self) -> dict:
+        """호스트별 (num_requests, num_connections) — urllib3 연결 풀에서 읽습니다."""
+        counters = {}
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_, connections = counters.get(key.key_host, (0, 0))
+            counters[key.key_host] = (requests_ + pool.num_requests, connections + pool.num_connections)
+        return counters
+
+    def stats(self) -> dict:
+        """호스트별 지표를 반환합니다. (누적 + 서킷 상태와 최근 구간 지연시간)"""
+        pools = self._pool_counters()
+        circuits = self.breakers.stats()
+        result = {}
+        for host, stats in list(self._hosts.items()):
+            hist = stats.latency
+            pool_requests, connections = pools.get(host, (0, 0))
+            result[host] = {
+                "requests": hist.count,
+                "errors": hist.errors,
+                "http2": stats.http2,
+                "connections": connections,
+                "reuse_ratio": 1 - connections / pool_requests if pool_requests else 0.0,
+                "p50_ms": hist.percentile(0.50) * 1000,
+                "p95_ms": hist.percentile(0.95) * 1000,
+                "avg_ms": hist.total / hist.count * 1000 if hist.count else 0.0,
+                "circuit": circuits.get(host),
+            }
+        return result
+
+    def render_prometheus(self) -> list[str]:
+        stats = self.stats()
+        lines = []
+        for field in ("requests", "errors", "connections", "reuse_ratio", "p95_ms"):
+            lines.extend(gauge_lines(f"iris_http_{field}", {h: s[field] for h, s in stats.items()}, "host"))
+        lines.extend(gauge_lines(
+            "iris_http_circuit_open",
+            {h: int(s["circuit"]["state"] != "closed") for h, s in stats.items() if s["circuit"]},
+            "host",
+        ))
+        return lines
+
+    def close(self):
+        super().close()
+        if self._h2_client is not None:
+            self._h2_client.close()
+
+
+# 모든 봇 모듈이 공유하는 기본 인스턴스
+http_client = HttpClient()
@@ -0,0 +1,127 @@
+"""
+로깅 — 레벨 / 모듈별 스위치 / 큰 페이로드 샘플링 / 큐 기반 비동기 출력
+
+핸들러 스레드에서는 LogRecord를 큐에 넣기만 하고, 포맷팅과 stdout 쓰기는
+별도의 리스너 스레드가 처리합니다.
+
+환경 변수:
+    IRIS_LOG_LEVEL    기본 레벨 (기본: INFO)
+    IRIS_LOG_MODULES  모듈별 레벨, 예) "notification=DEBUG,vote=WARNING,room_info=OFF"
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+_ROOT_NAME = "iris"
+_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+_OFF = logging.CRITICAL + 10
+
+_setup_lock = threading.Lock()
+_listener = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """레코드를 포맷하지 않은 채로 큐에 넣습니다. (포맷은 리스너 스레드에서)"""
+
+    def prepare(self, record):
+        return record
+
+
+def _parse_level(value: str) -> int:
+    value = value.strip().upper()
+    if value == "OFF":
+        return _OFF
+    level = logging.getLevelName(value)
+    return level if isinstance(level, int) else logging.INFO
+
+
+def _setup():
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        root = logging.getLogger(_ROOT_NAME)
+        root.setLevel(_parse_level(os.getenv("IRIS_LOG_LEVEL", "INFO")))
+        root.propagate = False
+
+        for item in os.getenv("IRIS_LOG_MODULES", "").split(","):
+            if "=" in item:
+                name, level = item.split("=", 1)
+                logging.getLogger(f"{_ROOT_NAME}.{name.strip()}").setLevel(_parse_level(level))
+
+        log_queue = queue.SimpleQueue()
+        root.addHandler(_DeferredQueueHandler(log_queue))
+
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(logging.Formatter(_FORMAT))
+        _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    모듈용 로거를 반환합니다. (예: get_logger(__name__))
+    패키지 경로는 떼고 모듈 이름만 쓰므로 "bots.vote"는 "iris.vote"가 되고,
+    IRIS_LOG_MODULES에는 "vote=DEBUG"처럼 모듈 이름으로 적습니다.
+    """
+    _setup()
+    return logging.getLogger(f"{_ROOT_NAME}.{name.rsplit('.', 1)[-1]}")
+
+
+class _LazyJson:
+    """str()이 호출될 때(리스너 스레드) JSON 직렬화를 수행합니다."""
+
+    __slots__ = ("obj", "indent", "limit")
+
+    def __init__(self, obj, indent, limit):
+        self.obj = obj
+        self.indent = indent
+        self.limit = limit
+
+    def __str__(self):
+        text = self.obj if isinstance(self.obj, str) else json.dumps(self.obj, ensure_ascii=False, indent=self.indent)
+        if len(text) > self.limit:
+            return f"{text[:self.limit]}... ({len(text):,} chars)"
+        return text
+
+
+class PayloadSampler:
+    """
+    요청/응답 본문 같은 큰 페이로드를 샘플링해서 로깅합니다.
+
+    - DEBUG가 꺼져 있으면 아무 작업도 하지 않습니다.
+    - 본문은 limit 글자에서 잘립니다.
+    - 같은 label의 페이로드는 interval초에 한 번만 출력하고 나머지는 건너뛴 개수만 셉니다.
+    """
+
+    def __init__(self, limit: int = 500, interval: float = 10.0):
+        self.limit = limit
+        self.interval = interval
+        self._last = {}
+        self._skipped = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, logger: logging.Logger, label: str, payload, indent: int = None):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        now = time.monotonic()
+        key = (logger.name, label)
+        with self._lock:
+            if now - self._last.get(key, -self.interval) < self.interval:
+                self._skipped[key] = self._skipped.get(key, 0) + 1
+                return
+            self._last[key] = now
+            skipped = self._skipped.pop(key, 0)
+        suffix = f" (+{skipped} sampled out)" if skipped else ""
+        logger.debug("%s%s: %s", label, suffix, _LazyJson(payload, indent, self.limit))
+
+
+log_payload = PayloadSampler()
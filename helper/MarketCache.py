@@ -0,0 +1,183 @@
+"""
+시세 데이터 캐시 — 엔드포인트별 TTL + stale-while-revalidate + 장애 시 마지막 정상값
+
+    신선(age < ttl)         메모리에서 바로 반환
+    오래됨(ttl ~ max_stale) 기존 값을 바로 반환하고 백그라운드에서 갱신
+    너무 오래됨 / 없음      직접 가져옴. 실패하면 남아 있는 마지막 정상값을 반환 (fallback)
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from helper.Logger import get_logger
+from helper.SingleFlight import SingleFlight, flight as default_flight
+
+log = get_logger(__name__)
+
+MAX_ENTRIES = 512
+
+
+class CacheResult:
+    __slots__ = ("value", "age", "fallback")
+
+    def __init__(self, value, age: float, fallback: bool):
+        self.value = value
+        self.age = age            # 값을 가져온 뒤 지난 시간(초)
+        self.fallback = fallback  # 원본 조회가 실패해서 예전 값을 돌려준 경우
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "failed")
+
+    def __init__(self, value, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.failed = False   # 마지막 갱신 시도가 실패했는지
+
+
+class _NameStats:
+    __slots__ = ("hits", "stale", "misses", "fallbacks", "errors")
+
+    def __init__(self):
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self.errors = 0
+
+
+class MarketCache:
+    """
+    키(URL)별 값을 TTL 동안 보관합니다. 통계는 name(엔드포인트 종류)별로 모읍니다.
+
+    같은 키의 조회/갱신은 SingleFlight(기본: 공유 flight)로 하나만 실행합니다.
+    cacheable(value)가 False인 값(예: 오류 응답)은 저장하지 않고 그대로 돌려줍니다.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, flight: SingleFlight = None):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._names: dict[Hashable, str] = {}
+        self._stats: dict[str, _NameStats] = {}
+        self._lock = threading.Lock()
+        self._flight = flight if flight is not None else default_flight
+        self._refreshing = set()
+
+    def _stat(self, name: str) -> _NameStats:
+        stat = self._stats.get(name)
+        if stat is None:
+            stat = self._stats[name] = _NameStats()
+        return stat
+
+    def _store(self, key, name: str, value):
+        with self._lock:
+            self._entries[key] = _Entry(value, time.monotonic())
+            self._entries.move_to_end(key)
+            self._names[key] = name
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._names.pop(old_key, None)
+
+    def _load(self, key, name: str, fetch: Callable, cacheable: Callable):
+        def load():
+            value = fetch()
+            if cacheable is None or cacheable(value):
+                self._store(key, name, value)
+            return value
+        return self._flight.do(("market", key), load)
+
+    def _refresh_in_background(self, key, name: str, fetch: Callable, cacheable: Callable):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._load(key, name, fetch, cacheable)
+            except Exception as e:
+                with self._lock:
+                    self._stat(name).errors += 1
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        entry.failed = True
+                log.warning("refresh failed (%s): %s", name, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="MarketRefresh", daemon=True).start()
+
+    def get(self, key: Hashable, fetch: Callable, ttl: float, max_stale: float = None,
+            name: str = "default", cacheable: Callable = None) -> CacheResult:
+        """
+        Args:
+            key: 캐시 키 (보통 URL)
+            fetch: 값을 새로 가져오는 함수
+            ttl: 신선하다고 볼 시간(초)
+            max_stale: 이 시간(초)까지는 오래된 값을 바로 주고 백그라운드로 갱신 (기본: ttl의 10배)
+            name: 통계용 엔드포인트 이름
+            cacheable: 저장해도 되는 값인지 판단하는 함수
+        """
+        if max_stale is None:
+            max_stale = ttl * 10
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            stat = self._stat(name)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < ttl:
+                    stat.hits += 1
+                    return CacheResult(entry.value, age, False)
+                if age < max_stale:
+                    stat.stale += 1
+                    stale_hit = True
+                else:
+                    stale_hit = False
+            else:
+                stat.misses += 1
+                stale_hit = False
+
+        if stale_hit:
+            self._refresh_in_background(key, name, fetch, cacheable)
+            return CacheResult(entry.value, age, entry.failed)
+
+        try:
+            return CacheResult(self._load(key, name, fetch, cacheable), 0.0, False)
+        except Exception:
+            with self._lock:
+                stat.errors += 1
+                entry = self._entries.get(key)
+                if entry is None:
+                    raise
+                stat.fallbacks += 1
+                entry.failed = True
+                return CacheResult(entry.value, time.monotonic() - entry.fetched_at, True)
+
+    def stats(self) -> dict:
+        """이름별 hits / stale / misses / fallbacks / errors / hit_ratio / max_age"""
+        now = time.monotonic()
+        with self._lock:
+            max_age = {}
+            for key, entry in self._entries.items():
+                name = self._names.get(key)
+                max_age[name] = max(max_age.get(name, 0.0), now - entry.fetched_at)
+            result = {}
+            for name, stat in self._stats.items():
+                total = stat.hits + stat.stale + stat.misses
+                result[name] = {
+                    "hits": stat.hits,
+                    "stale": stat.stale,
+                    "misses": stat.misses,
+                    "fallbacks": stat.fallbacks,
+                    "errors": stat.errors,
+                    "hit_ratio": (stat.hits + stat.stale) / total if total else 0.0,
+                    "max_age": max_age.get(name, 0.0),
+                }
+            return result
+
+
+# 시세 모듈이 공유하는 기본 인스턴스
+market_cache = MarketCache()
@@ -0,0 +1,304 @@
+"""
+오픈채팅 멤버 디렉터리 — open_chat_member를 필요한 컬럼만 메모리에 색인
+
+    by_user[user_id]            가장 최근에 본 행
+    by_room[(room_id, user_id)] 방별 행 (같은 유저라도 방마다 닉네임이 다를 수 있음)
+    roles[room_id]              방장 / 부방장 user_id (행을 더하거나 바꿀 때 함께 갱신)
+
+처음 사용할 때 한 번 전체를 _id 기준 페이지로 나눠 읽고, 이후에는 REFRESH_INTERVAL마다 _id가 마지막으로 본 값보다 큰
+새 행만 읽습니다. 기존 행이 바뀐 것(닉네임 변경 등)은 FULL_RELOAD_INTERVAL마다 백그라운드에서
+전체를 다시 읽어 반영하며, 닉네임 변경은 닉네임 감지(메시지 이벤트 / 점검)가 찾는 즉시
+update_nicknames()로 반영합니다. 단, 방장 / 부방장은 room_host()나
+room_managers()를 부를 때 그 방의 역할 행만 다시 읽어(ROLE_TTL 동안 재사용) 위임·임명·해임을 바로 반영합니다.
+색인에 없는 user_id는 WHERE user_id IN (...) 한 번으로 모아서 읽습니다.
+"""
+import sys
+import threading
+import time
+
+from helper.Logger import get_logger
+from helper.QueryBatch import iter_rows, query, query_many
+
+log = get_logger(__name__)
+
+HOST, MANAGER = 1, 4         # link_member_type
+
+REFRESH_INTERVAL = 30        # 새 행 확인 주기(초)
+FULL_RELOAD_INTERVAL = 3600  # 전체 재구성 주기(초)
+ROLE_TTL = 10               # 방별 역할을 다시 읽는 최소 간격(초)
+IN_BATCH = 500               # IN (...) 한 번에 넣을 최대 개수 (SQLite 변수 제한 999)
+
+# enc는 Iris가 nickname을 복호화할 때 필요하므로 함께 읽습니다.
+COLUMNS = "_id, enc, user_id, nickname, involved_chat_id, link_member_type, profile_link_id"
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Member:
+    __slots__ = ("user_id", "room_id", "nickname", "member_type", "profile_link_id")
+
+    def __init__(self, row: dict):
+        self.user_id = _int(row.get("user_id"))
+        self.room_id = _int(row.get("involved_chat_id"))
+        nickname = row.get("nickname")
+        self.nickname = sys.intern(nickname) if isinstance(nickname, str) else nickname
+        self.member_type = _int(row.get("link_member_type"))
+        self.profile_link_id = row.get("profile_link_id")
+
+
+class RoomRoles:
+    __slots__ = ("host", "managers")
+
+    def __init__(self):
+        self.host = None          # 방장 user_id
+        self.managers = set()     # 부방장 user_id
+
+    def discard(self, user_id: int):
+        if self.host == user_id:
+            self.host = None
+        self.managers.discard(user_id)
+
+    def add(self, member: Member):
+        if member.member_type == HOST:
+            self.host = member.user_id
+        elif member.member_type == MANAGER:
+            self.managers.add(member.user_id)
+
+
+class MemberDirectory:
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL, full_reload_interval: float = FULL_RELOAD_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self.full_reload_interval = full_reload_interval
+        self.by_user: dict[int, Member] = {}
+        self.by_room: dict[tuple, Member] = {}
+        self.roles: dict[int, RoomRoles] = {}
+        self.max_row_id = 0
+        self._loaded_at = 0.0
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._reloading = False
+        self._absent: dict[int, float] = {}   # DB에도 없던 user_id → 확인한 시각
+        self._roles_checked: dict[int, float] = {}   # room_id → 역할을 다시 읽은 시각
+
+    # ------------------------------------------------------------------ 적재
+
+    def _add_rows(self, rows, by_user: dict, by_room: dict, roles: dict) -> int:
+        max_row_id = 0
+        for row in rows:
+            member = Member(row)
+            if member.user_id is None:
+                continue
+            by_user[member.user_id] = member
+            if member.room_id is not None:
+                key = (member.room_id, member.user_id)
+                room_roles = roles.get(member.room_id)
+                if room_roles is None:
+                    room_roles = roles[member.room_id] = RoomRoles()
+                if key in by_room:
+                    room_roles.discard(member.user_id)
+                by_room[key] = member
+                room_roles.add(member)
+            row_id = _int(row.get("_id"))
+            if row_id is not None and row_id > max_row_id:
+                max_row_id = row_id
+        return max_row_id
+
+    def _full_load(self, api):
+        by_user, by_room, roles = {}, {}, {}
+        max_row_id = self._add_rows(iter_rows(api, "open_chat_member", COLUMNS), by_user, by_room, roles)
+        now = time.monotonic()
+        with self._lock:
+            self.by_user, self.by_room, self.roles = by_user, by_room, roles
+            self.max_row_id = max(max_row_id, 0)
+            self._loaded_at = self._refreshed_at = now
+        log.info("loaded %d users / %d room memberships", len(by_user), len(by_room))
+
+    def _reload_in_background(self, api):
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+
+        def reload():
+            try:
+                self._full_load(api)
+            except Exception as e:
+                log.exception("reload failed: %s", e)
+            finally:
+                with self._lock:
+                    self._reloading = False
+
+        threading.Thread(target=reload, name="MemberReload", daemon=True).start()
+
+    def refresh(self, api):
+        """마지막으로 본 _id 이후에 추가된 행만 읽어 색인에 더합니다."""
+        rows = list(iter_rows(api, "open_chat_member", COLUMNS, after=self.max_row_id))
+        with self._lock:
+            max_row_id = self._add_rows(rows, self.by_user, self.by_room, self.roles)
+            self.max_row_id = max(self.max_row_id, max_row_id)
+            self._refreshed_at = time.monotonic()
+
+    def ensure_fresh(self, api):
+        """필요하면 전체 적재 / 증분 갱신 / 백그라운드 재구성을 합니다."""
+        now = time.monotonic()
+        if not self._loaded_at:
+            with self._load_lock:
+                if not self._loaded_at:
+                    self._full_load(api)
+            return
+        if now - self._loaded_at > self.full_reload_interval:
+            self._reload_in_background(api)
+        elif now - self._refreshed_at > self.refresh_interval:
+            with self._load_lock:
+                if time.monotonic() - self._refreshed_at > self.refresh_interval:
+                    self.refresh(api)
+
+    def _fetch_users(self, api, user_ids: list):
+        """색인에 없는 user_id들을 IN 쿼리로 읽어 색인에 더합니다. (IN_BATCH개씩 동시에)"""
+        batches = [user_ids[i:i + IN_BATCH] for i in range(0, len(user_ids), IN_BATCH)]
+        results = query_many(api, [
+            (
+                f"SELECT {COLUMNS} FROM open_chat_member WHERE user_id IN ({','.join('?' * len(batch))})",
+                [str(user_id) for user_id in batch],
+            )
+            for batch in batches
+        ])
+        now = time.monotonic()
+        with self._lock:
+            for rows in results:
+                self._add_rows(rows or [], self.by_user, self.by_room, self.roles)
+            for user_id in user_ids:
+                if user_id not in self.by_user:
+                    self._absent[user_id] = now
+
+    def roles_due(self, room_id) -> bool:
+        """그 방의 역할을 다시 읽을 때가 되었는지 (ROLE_TTL)"""
+        room = _int(room_id)
+        return room is not None and time.monotonic() - self._roles_checked.get(room, -ROLE_TTL) >= ROLE_TTL
+
+    @staticmethod
+    def roles_statement(room_id) -> tuple:
+        """그 방의 방장 / 부방장 행 쿼리 (query, bind). query_many로 다른 쿼리와 함께 보낼 때 씁니다."""
+        return (
+            f"SELECT {COLUMNS} FROM open_chat_member WHERE involved_chat_id = ? AND link_member_type IN (?, ?)",
+            [str(room_id), str(HOST), str(MANAGER)],
+        )
+
+    def _refresh_roles(self, api, room: int):
+        """그 방의 방장 / 부방장 행만 다시 읽어 역할 색인을 교체합니다. (ROLE_TTL 동안 한 번)"""
+        if self.roles_due(room):
+            self.prime_roles(room, query(api, *self.roles_statement(room)))
+
+    def prime_roles(self, room_id, rows):
+        """roles_statement()의 결과 행으로 그 방의 역할 색인을 교체합니다."""
+        room = _int(room_id)
+        now = time.monotonic()
+        room_roles = RoomRoles()
+        with self._lock:
+            for row in rows or []:
+                member = Member(row)
+                if member.user_id is None:
+                    continue
+                self.by_room[(room, member.user_id)] = member
+                self.by_user.setdefault(member.user_id, member)
+                room_roles.add(member)
+            self.roles[room] = room_roles
+            self._roles_checked[room] = now
+
+    def update_nicknames(self, members) -> int:
+        """
+        [(user_id, nickname, room_id), ...] — 감지된 닉네임을 색인에 있는 행에 바로 반영합니다.
+        _id가 그대로인 행의 변경은 증분 갱신(_id > max_row_id)으로는 보이지 않기 때문입니다.
+        바꾼 행 수를 반환합니다. 색인에 없는 행은 조회할 때 읽으므로 건너뜁니다.
+        """
+        updated = 0
+        with self._lock:
+            for user_id, nickname, room_id in members:
+                uid, room = _int(user_id), _int(room_id)
+                member = self.by_room.get((room, uid))
+                if member is None or not isinstance(nickname, str) or member.nickname == nickname:
+                    continue
+                member.nickname = sys.intern(nickname)
+                updated += 1
+        return updated
+
+    # ------------------------------------------------------------------ 조회
+
+    def get(self, api, user_id, room_id=None) -> Member | None:
+        """멤버 정보를 반환합니다. room_id를 주면 그 방의 행을 우선합니다."""
+        return self.get_many(api, [user_id], room_id).get(user_id)
+
+    def get_many(self, api, user_ids, room_id=None) -> dict:
+        """{입력한 user_id: Member} — 색인에 없는 id는 한 번의 IN 쿼리로 읽습니다."""
+        self.ensure_fresh(api)
+        keys = {user_id: _int(user_id) for user_id in user_ids}
+        room = _int(room_id)
+        now = time.monotonic()
+        missing = [
+            uid for uid in set(keys.values())
+            if uid is not None and uid not in self.by_user and now - self._absent.get(uid, -self.refresh_interval) >= self.refresh_interval
+        ]
+        if missing:
+            self._fetch_users(api, missing)
+
+        result = {}
+        for key, uid in keys.items():
+            member = self.by_room.get((room, uid)) if room is not None else None
+            if member is None:
+                member = self.by_user.get(uid)
+            if member is not None:
+                result[key] = member
+        return result
+
+    def nicknames(self, api, user_ids, room_id=None) -> dict:
+        """{입력한 user_id: 닉네임}"""
+        return {key: member.nickname for key, member in self.get_many(api, user_ids, room_id).items() if member.nickname}
+
+    def room_host(self, api, room_id, member_ids=()) -> Member | None:
+        """
+        방장 Member를 반환합니다. 그 방의 역할 행을 다시 읽은 색인에서 찾고, 색인에 방장이 없으면
+        member_ids(active_member_ids) 중에서 한 번의 IN 쿼리로 찾습니다.
+        """
+        self.ensure_fresh(api)
+        room = _int(room_id)
+        if room is not None:
+            self._refresh_roles(api, room)
+        room_roles = self.roles.get(room)
+        if room_roles is not None and room_roles.host is not None:
+            return self.by_room.get((room, room_roles.host))
+        if not member_ids:
+            return None
+        for member in self.get_many(api, member_ids, room).values():
+            if member.member_type == HOST:
+                return member
+        return None
+
+    def room_managers(self, api, room_id) -> list:
+        """부방장 Member 목록"""
+        self.ensure_fresh(api)
+        room = _int(room_id)
+        if room is not None:
+            self._refresh_roles(api, room)
+        room_roles = self.roles.get(room)
+        if room_roles is None:
+            return []
+        return [self.by_room[(room, uid)] for uid in list(room_roles.managers) if (room, uid) in self.by_room]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self.by_user),
+                "memberships": len(self.by_room),
+                "rooms_with_host": sum(1 for r in self.roles.values() if r.host is not None),
+                "max_row_id": self.max_row_id,
+            }
+
+
+# 모든 봇 모듈이 공유하는 기본 인스턴스
+member_directory = MemberDirectory()
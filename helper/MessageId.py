@@ -0,0 +1,49 @@
+"""
+talk/write msgId 생성기 — 카카오 형식을 유지하면서 프로세스 안에서 단조 증가 / 중복 없음
+"""
+import threading
+import time
+from functools import lru_cache
+
+MSG_ID_MOD = 2147483547
+
+
+@lru_cache(maxsize=16)
+def java_string_hashcode(s: str) -> int:
+    """Java String.hashCode() (부호 있는 32비트). 기기 UUID마다 한 번만 계산합니다."""
+    h = 0
+    for c in s:
+        h = (31 * h + ord(c)) & 0xFFFFFFFF
+    if h >= 0x80000000:
+        h -= 0x100000000
+    return h
+
+
+class MessageIdGenerator:
+    """
+    카카오 클라이언트와 같은 형식의 msgId를 만듭니다.
+
+        후보 = ((밀리초 % MSG_ID_MOD) // 100) * 100 + hashCode(device_uuid)
+
+    같은 100ms 안에서 여러 번 호출하면 후보가 같아지므로
+    기기별로 마지막 값을 기억해 max(후보, 마지막 + 1)을 돌려줍니다.
+    밀리초 % MSG_ID_MOD가 한 바퀴 돌아(약 24.8일) 후보가 크게 작아지면 후보부터 다시 시작합니다.
+    """
+
+    def __init__(self):
+        self._last = {}
+        self._lock = threading.Lock()
+
+    def next(self, device_uuid: str, timestamp: int = None) -> int:
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        candidate = ((timestamp % MSG_ID_MOD) // 100) * 100 + java_string_hashcode(device_uuid)
+        with self._lock:
+            last = self._last.get(device_uuid)
+            if last is not None and candidate <= last and last - candidate < MSG_ID_MOD // 2:
+                candidate = last + 1
+            self._last[device_uuid] = candidate
+        return candidate
+
+
+message_ids = MessageIdGenerator()
@@ -0,0 +1,153 @@
+"""
+명령어별 지연시간 / 오류 히스토그램과 Prometheus 텍스트 파일 출력
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+from helper.Logger import get_logger
+
+log = get_logger(__name__)
+
+# 버킷 상한(초) — 0.5ms ~ 120s 구간을 로그 스케일로 나눔
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+
+class Histogram:
+    """
+    미리 할당한 버킷 배열에 관측값 개수만 세는 히스토그램.
+    표본을 저장하지 않으므로 observe()는 bisect 한 번과 덧셈 몇 번으로 끝납니다.
+    """
+
+    __slots__ = ("counts", "count", "errors", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if error:
+            self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        """q(0~1) 분위수를 버킷 상한값으로 근사합니다. (초)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            cumulative += n
+            if cumulative >= target:
+                return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+        return float("inf")
+
+
+class LatencyRegistry:
+    """이름(명령어)별 Histogram 모음"""
+
+    def __init__(self):
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> Histogram:
+        hist = self._histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(name, Histogram())
+        return hist
+
+    def observe(self, name: str, seconds: float, error: bool = False):
+        self.histogram(name).observe(seconds, error)
+
+    def items(self) -> list:
+        return list(self._histograms.items())
+
+    def summary(self) -> list[dict]:
+        """호출 수가 많은 순서로 명령어별 요약을 반환합니다."""
+        rows = []
+        for name, hist in self.items():
+            rows.append({
+                "name": name,
+                "count": hist.count,
+                "errors": hist.errors,
+                "p50": hist.percentile(0.50),
+                "p95": hist.percentile(0.95),
+                "p99": hist.percentile(0.99),
+            })
+        rows.sort(key=lambda row: row["count"], reverse=True)
+        return rows
+
+    def render_prometheus(self, metric: str = "iris_command_duration_seconds") -> list[str]:
+        lines = [
+            f"# HELP {metric} Command handler latency",
+            f"# TYPE {metric} histogram",
+        ]
+        errors = []
+        for name, hist in self.items():
+            label = _escape(name)
+            cumulative = 0
+            for bound, n in zip(BUCKETS, hist.counts):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{command="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{command="{label}",le="+Inf"}} {hist.count}')
+            lines.append(f'{metric}_sum{{command="{label}"}} {hist.total}')
+            lines.append(f'{metric}_count{{command="{label}"}} {hist.count}')
+            errors.append(f'iris_command_errors_total{{command="{label}"}} {hist.errors}')
+        lines.append("# TYPE iris_command_errors_total counter")
+        lines.extend(errors)
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def gauge_lines(metric: str, values: dict, label: str) -> list[str]:
+    """{라벨값: 숫자} → Prometheus gauge 텍스트"""
+    lines = [f"# TYPE {metric} gauge"]
+    for key, value in values.items():
+        lines.append(f'{metric}{{{label}="{_escape(str(key))}"}} {value}')
+    return lines
+
+
+def write_prometheus(path: str, collectors: Iterable[Callable[[], list]]):
+    """collector들이 반환한 줄을 모아 path에 원자적으로 기록합니다."""
+    lines = []
+    for collect in collectors:
+        try:
+            lines.extend(collect())
+        except Exception as e:
+            log.exception("collector error: %s", e)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+def start_prometheus_writer(path: str, collectors: list, interval: float = 15):
+    """interval초마다 Prometheus 텍스트 파일을 갱신하는 데몬 스레드를 시작합니다."""
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                write_prometheus(path, collectors)
+            except Exception as e:
+                log.exception("write error: %s", e)
+
+    thread = threading.Thread(target=loop, name="MetricsWriter", daemon=True)
+    thread.start()
+    return thread
+
+
+# 라우터가 사용하는 기본 인스턴스
+command_latency = LatencyRegistry()
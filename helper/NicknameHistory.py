@@ -0,0 +1,154 @@
+"""
+닉네임 변경 기록 — iris.db의 nickname_history 테이블 (유저별 추가 전용)
+
+    nickname_history(id, user_id, nickname, involved_chat_id, date)
+    idx_nickname_history_user (user_id, id)
+
+예전에는 모든 유저의 기록을 PyKV 'user_history' 값 하나(JSON)에 담아 닉네임 하나가
+바뀔 때마다 전체를 다시 썼습니다. 이제 변경 하나는 INSERT 한 줄이고,
+"유저 X의 최근 닉네임"은 인덱스 조회 한 번입니다.
+date는 예전 형식 그대로 "%y%m%d %H:%M"이며, 처음 본 닉네임은 ''입니다.
+오픈채팅은 방마다 프로필이 다르므로 변경 여부는 같은 방의 마지막 닉네임과 비교합니다.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from iris import PyKV
+
+LEGACY_KEY = "user_history"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nickname_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    nickname TEXT,
+    involved_chat_id INTEGER,
+    date TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_nickname_history_user ON nickname_history (user_id, id);
+"""
+
+_LAST_QUERY = "SELECT nickname FROM nickname_history WHERE user_id = ? ORDER BY id DESC LIMIT 1"
+_LAST_IN_ROOM_QUERY = (
+    "SELECT nickname FROM nickname_history WHERE user_id = ? AND involved_chat_id = ? ORDER BY id DESC LIMIT 1"
+)
+_INSERT = "INSERT INTO nickname_history (user_id, nickname, involved_chat_id, date) VALUES (?, ?, ?, ?)"
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class NicknameChange:
+    __slots__ = ("user_id", "room_id", "before", "after")
+
+    def __init__(self, user_id: int, room_id, before: str, after: str):
+        self.user_id = user_id
+        self.room_id = room_id
+        self.before = before
+        self.after = after
+
+
+class NicknameHistory:
+    """스레드마다 연결을 따로 둡니다. (PyKV와 같은 방식)"""
+
+    def __init__(self, path: str = None):
+        self.path = path   # None이면 PyKV와 같은 파일 (PyKV().filename)
+        self._local = threading.local()
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            # 트랜잭션은 _transaction()에서 BEGIN IMMEDIATE로 직접 엽니다.
+            db = sqlite3.connect(self.path or PyKV().filename, timeout=10, isolation_level=None, check_same_thread=False)
+            db.executescript(_SCHEMA)
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        """
+        BEGIN IMMEDIATE — 읽기 전에 쓰기 잠금을 잡으므로, 메시지 감지 스레드와 점검 스레드가
+        같은 변경을 동시에 읽고 둘 다 추가하는 일이 없습니다.
+        """
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def last(self, user_id) -> str | None:
+        """가장 최근 닉네임. 기록이 없으면 None"""
+        row = self._db().execute(_LAST_QUERY, (_int(user_id),)).fetchone()
+        return row[0] if row else None
+
+    def recent(self, user_id, limit: int = None) -> list:
+        """[(nickname, date), ...] 최신순. limit이 없으면 전부"""
+        query = "SELECT nickname, date FROM nickname_history WHERE user_id = ? ORDER BY id DESC"
+        params = (_int(user_id),)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        return self._db().execute(query, params).fetchall()
+
+    def observe(self, members, date: str) -> list:
+        """
+        [(user_id, nickname, involved_chat_id), ...]를 기록과 비교합니다.
+        그 방에서 처음 보는 유저는 date=''로 추가하고, 닉네임이 바뀐 유저는 date로 추가합니다.
+        쓰기 잠금을 잡은 트랜잭션 한 번으로 처리합니다.
+
+        Returns:
+            [NicknameChange, ...]
+        """
+        changes = []
+        with self._transaction() as db:
+            for user_id, nickname, room_id in members:
+                uid = _int(user_id)
+                if uid is None:
+                    continue
+                room = _int(room_id)
+                if room is None:
+                    row = db.execute(_LAST_QUERY, (uid,)).fetchone()
+                else:
+                    row = db.execute(_LAST_IN_ROOM_QUERY, (uid, room)).fetchone()
+                if row is None:
+                    db.execute(_INSERT, (uid, nickname, room, ""))
+                elif row[0] != nickname:
+                    db.execute(_INSERT, (uid, nickname, room, date))
+                    changes.append(NicknameChange(uid, room_id, row[0], nickname))
+        return changes
+
+    def is_empty(self) -> bool:
+        return self._db().execute("SELECT 1 FROM nickname_history LIMIT 1").fetchone() is None
+
+    def migrate(self, blob: dict) -> int | None:
+        """
+        예전 'user_history' 값({user_id: {"history": [...]}})을 테이블로 옮깁니다.
+        테이블이 비어 있을 때만 트랜잭션 한 번으로 전부 옮기며, 옮긴 행 수를 반환합니다.
+        테이블에 이미 행이 있어 옮기지 않았으면 None을 반환합니다.
+        """
+        rows = [
+            (_int(user_id), entry.get("nickname"), _int(entry.get("involved_chat_id")), entry.get("date") or "")
+            for user_id, value in (blob or {}).items() if _int(user_id) is not None
+            for entry in (value or {}).get("history", [])
+        ]
+        with self._transaction() as db:
+            if db.execute("SELECT 1 FROM nickname_history LIMIT 1").fetchone() is not None:
+                return None
+            db.executemany(_INSERT, rows)
+        return len(rows)
+
+    def stats(self) -> dict:
+        rows, users = self._db().execute("SELECT COUNT(*), COUNT(DISTINCT user_id) FROM nickname_history").fetchone()
+        return {"rows": rows, "users": users}
+
+
+# 모든 봇 모듈이 공유하는 기본 인스턴스
+nickname_history = NicknameHistory()
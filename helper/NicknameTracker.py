@@ -0,0 +1,210 @@
+"""
+닉네임 변경 감지 — open_chat_member 행마다 닉네임 해시만 배열에 보관하고 비교
+
+    RowSnapshot       _id 순으로 정렬된 (행 id, crc32) 두 배열. 행 하나에 12바이트
+    AdaptiveInterval  변경이 없으면 폴링 간격을 늘리고, 변경이 있으면 최소 간격으로 되돌림
+    NicknameScanner   스캔 한 번 = 가벼운 컬럼(_id, enc, nickname)을 _id 기준 페이지로 순회.
+                      해시가 달라진 행만 user_id / involved_chat_id까지 다시 읽습니다.
+                      행을 한 페이지씩만 들고 있으므로 테이블이 커도 메모리가 일정합니다.
+    NicknameWatch     메시지 이벤트의 보낸 사람 닉네임을 (방, 유저) → 해시와 비교.
+                      폴링 없이 말한 사람의 변경을 바로 찾습니다.
+"""
+import threading
+import zlib
+from array import array
+from collections import deque
+from typing import Callable
+
+from helper.Logger import get_logger
+from helper.QueryBatch import iter_rows, query_many
+
+MIN_INTERVAL = 3     # 초
+MAX_INTERVAL = 30
+BACKOFF = 1.5
+IN_BATCH = 500
+WATCH_BATCH = 200    # NicknameWatch가 on_changed에 한 번에 넘기는 최대 개수
+
+MEMBER_TABLE = "db2.open_chat_member"
+SCAN_COLUMNS = "_id, enc, nickname"
+DETAIL_COLUMNS = "_id, enc, nickname, user_id, involved_chat_id"
+
+log = get_logger(__name__)
+
+
+def nickname_hash(nickname) -> int:
+    if not nickname:
+        return 0
+    return zlib.crc32(str(nickname).encode("utf-8"))
+
+
+class RowSnapshot:
+    """행 id → 해시. dict 대신 정렬된 array 두 개를 써서 행이 많아도 메모리가 작습니다."""
+
+    def __init__(self):
+        self.keys = array("q")
+        self.hashes = array("I")
+        self._staged = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def iter_changes(self, items):
+        """
+        (행 id, 해시, 값)을 행 id 오름차순으로 받아, 새로 생기거나 해시가 바뀐 항목의
+        (값, 새 행인지)를 하나씩 돌려줍니다. 끝까지 읽으면 새 스냅샷을 준비만 해 두고,
+        commit()을 불러야 교체합니다.
+        """
+        old_keys, old_hashes = self.keys, self.hashes
+        keys, hashes = array("q"), array("I")
+        i, n = 0, len(old_keys)
+        for key, value, item in items:
+            while i < n and old_keys[i] < key:
+                i += 1
+            if i < n and old_keys[i] == key:
+                if old_hashes[i] != value:
+                    yield item, False
+                i += 1
+            else:
+                yield item, True
+            keys.append(key)
+            hashes.append(value)
+        self._staged = (keys, hashes)
+
+    def commit(self):
+        """iter_changes()가 준비한 스냅샷으로 교체합니다."""
+        if self._staged is not None:
+            self.keys, self.hashes = self._staged
+            self._staged = None
+
+    def update(self, pairs) -> tuple[list, list]:
+        """(행 id, 해시)로 스냅샷을 교체합니다. (새로 생긴 행 id, 해시가 바뀐 행 id)를 반환합니다."""
+        added, changed = [], []
+        for key, is_new in self.iter_changes((key, value, key) for key, value in pairs):
+            (added if is_new else changed).append(key)
+        self.commit()
+        return added, changed
+
+
+class AdaptiveInterval:
+    """변경이 없을 때마다 간격을 BACKOFF배씩 늘립니다. (MIN_INTERVAL ~ MAX_INTERVAL)"""
+
+    def __init__(self, minimum: float = MIN_INTERVAL, maximum: float = MAX_INTERVAL, backoff: float = BACKOFF):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.current = minimum
+
+    def next(self, changed: bool) -> float:
+        if changed:
+            self.current = self.minimum
+        else:
+            self.current = min(self.maximum, self.current * self.backoff)
+        return self.current
+
+
+class NicknameScanner:
+    """api.query만 있으면 동작합니다. (irispy-client의 bot.api 또는 bench의 대역)"""
+
+    def __init__(self, api):
+        self.api = api
+        self.snapshot = RowSnapshot()
+        self.scans = 0
+
+    def _details(self, row_ids: list) -> list:
+        batches = [row_ids[i:i + IN_BATCH] for i in range(0, len(row_ids), IN_BATCH)]
+        results = query_many(self.api, [
+            (
+                f"SELECT {DETAIL_COLUMNS} FROM {MEMBER_TABLE} WHERE _id IN ({','.join('?' * len(batch))})",
+                [str(row_id) for row_id in batch],
+            )
+            for batch in batches
+        ])
+        return [row for rows in results for row in rows or []]
+
+    def scan(self):
+        """
+        지난 스캔 이후 새로 생기거나 닉네임이 바뀐 행을 하나씩 돌려줍니다. (generator)
+        첫 스캔은 기준점이므로 모든 행을 돌려줍니다. 호출한 쪽이 마지막 행까지 처리하고
+        다음 값을 요청해야 스냅샷에 반영하므로, 중간에 실패하면 다음 스캔이 같은 행을 다시 돌려줍니다.
+
+        Yields:
+            {"_id", "user_id", "involved_chat_id", "nickname", ...}
+        """
+        self.scans += 1
+        baseline = not self.snapshot
+        rows = iter_rows(self.api, MEMBER_TABLE, DETAIL_COLUMNS if baseline else SCAN_COLUMNS)
+        changes = self.snapshot.iter_changes(
+            (int(row["_id"]), nickname_hash(row.get("nickname")), row) for row in rows
+        )
+        if baseline:
+            for row, _ in changes:
+                yield row
+        else:
+            row_ids = [int(row["_id"]) for row, _ in changes]
+            if row_ids:
+                yield from self._details(row_ids)
+        self.snapshot.commit()
+
+
+class NicknameWatch:
+    """
+    (방, 유저) → 마지막으로 본 닉네임 해시.
+
+    observe()는 이벤트 스레드에서 dict 조회와 crc32만 합니다. 처음 보거나 해시가 다르면
+    큐에 넣고, 백그라운드 스레드가 모아서 on_changed([{"user_id", "nickname", "involved_chat_id"}, ...])를
+    부릅니다. 실제 변경인지는 on_changed 쪽(기록과 비교)에서 판단합니다.
+    """
+
+    def __init__(self, on_changed: Callable[[list], None]):
+        self.on_changed = on_changed
+        self._seen: dict[tuple, int] = {}
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.events = 0
+        self.queued = 0
+
+    def remember(self, user_id, nickname, room_id):
+        """이미 기록에 반영한 값(스윕 결과 등)을 큐에 넣지 않고 맞춰 둡니다."""
+        self._seen[(str(room_id), str(user_id))] = nickname_hash(nickname)
+
+    def observe(self, user_id, nickname, room_id) -> bool:
+        """처리할 게 생겨 큐에 넣었으면 True"""
+        key = (str(room_id), str(user_id))
+        value = nickname_hash(nickname)
+        with self._lock:
+            self.events += 1
+            if self._seen.get(key) == value:
+                return False
+            self._seen[key] = value
+            self._pending.append({"user_id": key[1], "nickname": nickname, "involved_chat_id": key[0]})
+            self.queued += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="NicknameWatch", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return True
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while True:
+                with self._lock:
+                    batch = [self._pending.popleft() for _ in range(min(len(self._pending), WATCH_BATCH))]
+                if not batch:
+                    break
+                try:
+                    self.on_changed(batch)
+                except Exception as e:
+                    log.exception("on_changed failed: %s", e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tracked": len(self._seen),
+                "events": self.events,
+                "queued": self.queued,
+                "pending": len(self._pending),
+            }
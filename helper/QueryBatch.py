@@ -0,0 +1,116 @@
+"""
+Iris /query 호출 — 공유 keep-alive 연결 풀 사용 + 여러 문장 파이프라이닝 + 페이지 단위 순회
+
+irispy-client의 api.query()는 호출마다 requests.post로 새 연결을 엽니다.
+여기서는 http_client(호스트별 연결 풀)로 보내고, 여러 문장은 풀의 연결 여러 개에
+동시에 실어 보낸 뒤 입력 순서대로 결과를 돌려줍니다.
+
+    rows = query(chat.api, "SELECT ... WHERE id = ?", [room_id])
+    room, members = query_many(chat.api, [
+        ("SELECT ... FROM chat_rooms WHERE id = ?", [room_id]),
+        ("SELECT ... FROM open_chat_member WHERE user_id IN (?, ?)", [a, b]),
+    ])
+
+    for row in iter_rows(api, "db2.open_chat_member", "_id, enc, nickname"):
+        ...   # PAGE_SIZE행씩 가져오므로 테이블이 커도 메모리는 한 페이지만큼
+
+Iris /query는 요청 하나에 문장 하나만 받으므로 한 요청으로 합치지는 않습니다.
+iris_endpoint가 없는 api(bench의 대역 등)는 api.query()로 처리합니다.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from helper.HttpClient import POOL_MAXSIZE, http_client
+
+QUERY_TIMEOUT = (3, 10)
+MAX_PARALLEL = 8       # 한 번에 동시에 보낼 문장 수 (POOL_MAXSIZE 이하)
+PAGE_SIZE = 2000       # iter_rows가 한 번에 가져오는 행 수
+
+_executor = ThreadPoolExecutor(max_workers=min(MAX_PARALLEL * 2, POOL_MAXSIZE), thread_name_prefix="IrisQuery")
+_lock = threading.Lock()
+_stats = {"queries": 0, "batches": 0, "batched_queries": 0}
+
+
+class QueryError(Exception):
+    """Iris가 오류를 돌려준 경우"""
+
+
+def _count(**fields):
+    with _lock:
+        for name, value in fields.items():
+            _stats[name] += value
+
+
+def query(api, query: str, bind: list = None) -> list:
+    """api.query()와 같은 결과(dict 리스트)를 keep-alive 연결로 가져옵니다."""
+    endpoint = getattr(api, "iris_endpoint", None)
+    _count(queries=1)
+    if endpoint is None:
+        return api.query(query=query, bind=bind or [])
+
+    response = http_client.post(
+        f"{endpoint}/query",
+        json={"query": query, "bind": bind or []},
+        timeout=QUERY_TIMEOUT,
+    )
+    try:
+        data = response.json()
+    except ValueError:
+        raise QueryError(f"Iris 응답 JSON 파싱 오류: {response.text[:200]}")
+    if not 200 <= response.status_code <= 299:
+        raise QueryError(f"Iris 오류: {data.get('message', '알 수 없는 오류')}")
+    return data.get("data", [])
+
+
+def query_many(api, statements, max_parallel: int = MAX_PARALLEL) -> list:
+    """
+    [(query, bind), ...]를 동시에 보내고 결과를 입력 순서대로 반환합니다.
+    하나라도 실패하면 첫 번째 예외를 그대로 던집니다.
+    """
+    statements = list(statements)
+    if len(statements) <= 1 or max_parallel <= 1:
+        return [query(api, sql, bind) for sql, bind in statements]
+
+    _count(batches=1, batched_queries=len(statements))
+    results = []
+    for i in range(0, len(statements), max_parallel):
+        futures = [_executor.submit(query, api, sql, bind) for sql, bind in statements[i:i + max_parallel]]
+        results.extend(future.result() for future in futures)
+    return results
+
+
+def iter_rows(api, table: str, columns: str, where: str = None, bind: list = None,
+              key: str = "_id", after=None, page_size: int = PAGE_SIZE):
+    """
+    key 컬럼 기준 keyset 페이지네이션으로 행을 하나씩 돌려줍니다. (key 오름차순)
+
+        SELECT {columns} FROM {table} WHERE key > ? [AND (where)] ORDER BY key LIMIT ?
+
+    OFFSET과 달리 뒤 페이지로 갈수록 느려지지 않고, 순회 중에 행이 추가돼도 건너뛰거나
+    중복되는 행이 없습니다. key가 columns에 없으면 앞에 붙입니다.
+
+    Args:
+        columns: 가져올 컬럼 ("_id, enc, nickname")
+        where: 추가 조건 (bind의 ?와 짝)
+        after: 이 key 값 다음부터 (없으면 처음부터)
+    """
+    if key not in [c.strip() for c in columns.split(",")]:
+        columns = f"{key}, {columns}"
+    condition = f"{key} > ?" + (f" AND ({where})" if where else "")
+    sql = f"SELECT {columns} FROM {table} WHERE {condition} ORDER BY {key} LIMIT ?"
+    last = after if after is not None else -(2 ** 63)
+    while True:
+        rows = query(api, sql, [last, *(bind or []), page_size]) or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1][key]
+        try:
+            last = int(last)
+        except (TypeError, ValueError):
+            pass
+
+
+def stats() -> dict:
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,41 @@
+"""
+토큰 버킷 — 전송 속도 제한
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷.
+
+    take()는 토큰이 있으면 하나를 쓰고 0을, 없으면 쓰지 않고
+    다음 토큰까지 기다려야 할 시간(초)을 반환합니다.
+    """
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated", "_lock")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def take(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def idle(self) -> bool:
+        """버킷이 가득 차 있는지 (오래 쓰지 않은 버킷 정리용)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens >= self.burst
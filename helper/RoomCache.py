@@ -0,0 +1,157 @@
+"""
+채팅방 메타데이터 캐시 — link_id / type / moim_meta(현재 공지 post_id) / active_member_ids
+
+chat_rooms를 방마다 쿼리 한 번으로 읽고, moim_meta와 active_member_ids는 읽을 때 한 번만 파싱합니다.
+크기 제한이 있는 LRU이며 TTL이 지나면 다시 읽습니다. 공지를 바꾼 뒤처럼 값이 바뀐 걸
+알고 있으면 invalidate(room_id)로 바로 버립니다.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from helper.QueryBatch import query
+from helper.SingleFlight import SingleFlight, flight as default_flight
+
+ROOM_TTL = 300        # 초
+MAX_ROOMS = 256
+
+ROOM_QUERY = "SELECT id, link_id, type, moim_meta, active_member_ids FROM chat_rooms WHERE id = ?"
+
+
+def parse_moim_meta(raw) -> list:
+    """moim_meta 문자열 → 리스트. 각 항목의 ct(JSON 문자열)도 dict로 풀어 둡니다."""
+    if not raw:
+        return []
+    try:
+        meta = json.loads(raw)
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(meta, list):
+        return []
+    for item in meta:
+        if isinstance(item, dict) and isinstance(item.get("ct"), str):
+            try:
+                item["ct"] = json.loads(item["ct"])
+            except ValueError:
+                pass
+    return meta
+
+
+def parse_member_ids(raw) -> tuple:
+    """active_member_ids (JSON 배열 또는 쉼표 구분 문자열) → 정수 튜플"""
+    if not raw:
+        return ()
+    try:
+        ids = json.loads(raw)
+        if not isinstance(ids, list):
+            ids = [ids]
+    except (TypeError, ValueError):
+        ids = [m.strip() for m in str(raw).split(",") if m.strip()]
+    result = []
+    for member_id in ids:
+        try:
+            result.append(int(member_id))
+        except (TypeError, ValueError):
+            pass
+    return tuple(result)
+
+
+class RoomInfo:
+    __slots__ = ("room_id", "link_id", "type", "moim_meta", "post_id", "active_member_ids", "loaded_at")
+
+    def __init__(self, row: dict):
+        self.room_id = row.get("id")
+        self.link_id = row.get("link_id") or None
+        self.type = row.get("type")
+        self.moim_meta = parse_moim_meta(row.get("moim_meta"))
+        self.post_id = None
+        if self.moim_meta and isinstance(self.moim_meta[0], dict):
+            ct = self.moim_meta[0].get("ct")
+            if isinstance(ct, dict):
+                self.post_id = ct.get("id")
+        self.active_member_ids = parse_member_ids(row.get("active_member_ids"))
+        self.loaded_at = time.monotonic()
+
+
+class RoomCache:
+    """room_id → RoomInfo (LRU + TTL)"""
+
+    def __init__(self, ttl: float = ROOM_TTL, max_rooms: int = MAX_ROOMS, flight: SingleFlight = None):
+        self.ttl = ttl
+        self.max_rooms = max_rooms
+        self._rooms: OrderedDict[str, RoomInfo] = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = flight if flight is not None else default_flight
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, api, key: str):
+        return self.prime(key, query(api, ROOM_QUERY, [key]))
+
+    @staticmethod
+    def statement(room_id) -> tuple:
+        """방 정보 쿼리 (query, bind). 다른 쿼리와 query_many로 함께 보낼 때 씁니다."""
+        return ROOM_QUERY, [str(room_id)]
+
+    def prime(self, room_id, rows) -> RoomInfo | None:
+        """statement()의 결과 행으로 캐시를 채웁니다."""
+        if not rows:
+            return None
+        key = str(room_id)
+        info = RoomInfo(rows[0])
+        with self._lock:
+            self._rooms[key] = info
+            self._rooms.move_to_end(key)
+            while len(self._rooms) > self.max_rooms:
+                self._rooms.popitem(last=False)
+        return info
+
+    def get(self, api, room_id) -> RoomInfo | None:
+        """방 정보를 반환합니다. chat_rooms에 없는 방이면 None"""
+        key = str(room_id)
+        with self._lock:
+            info = self._rooms.get(key)
+            if info is not None and time.monotonic() - info.loaded_at < self.ttl:
+                self._rooms.move_to_end(key)
+                self.hits += 1
+                return info
+            self.misses += 1
+        return self._flight.do(("room", key), self._load, api, key)
+
+    def peek(self, room_id) -> RoomInfo | None:
+        """캐시에 있고 TTL이 남았으면 반환합니다. 없으면 None (조회하지 않음)"""
+        key = str(room_id)
+        with self._lock:
+            info = self._rooms.get(key)
+            if info is not None and time.monotonic() - info.loaded_at < self.ttl:
+                self._rooms.move_to_end(key)
+                self.hits += 1
+                return info
+            self.misses += 1
+        return None
+
+    def for_chat(self, chat) -> RoomInfo | None:
+        return self.get(chat.api, chat.room.id)
+
+    def invalidate(self, room_id=None):
+        """room_id의 캐시를 버립니다. None이면 전부 버립니다."""
+        with self._lock:
+            if room_id is None:
+                self._rooms.clear()
+            else:
+                self._rooms.pop(str(room_id), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "rooms": len(self._rooms),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+
+# 모든 봇 모듈이 공유하는 기본 인스턴스
+room_cache = RoomCache()
@@ -0,0 +1,138 @@
+"""
+명령어 스케줄러 — 실행 클래스(fast/io/cpu/ai)별 동시 실행 수 제한과 대기열 관리
+"""
+import itertools
+import queue
+import threading
+import time
+from typing import Callable
+
+from helper.Logger import get_logger
+
+log = get_logger(__name__)
+
+FAST = "fast"
+IO = "io"
+CPU = "cpu"
+AI = "ai"
+
+# 우선순위 (숫자가 작을수록 먼저 실행)
+HIGH = 0
+NORMAL = 10
+
+# 실행 클래스별 (동시 실행 수, 최대 대기열 길이)
+DEFAULT_CLASSES = {
+    FAST: (8, 200),
+    IO: (8, 100),
+    CPU: (2, 20),
+    AI: (2, 10),
+}
+
+
+class ExecutionClass:
+    """동시 실행 수와 대기열 길이가 제한된 워커 그룹"""
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue = queue.PriorityQueue(maxsize=max_queue)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._running = 0
+        self._pending = {}  # 우선순위 -> 대기 중인 작업 수
+
+        # 통계
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+        for i in range(workers):
+            threading.Thread(target=self._worker, name=f"Sched-{name}-{i}", daemon=True).start()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def submit(self, fn: Callable, args: tuple, priority: int = NORMAL):
+        """
+        작업을 대기열에 넣습니다.
+
+        Returns:
+            int | None: 대기 순번 (0이면 바로 실행), 대기열이 가득 차면 None
+        """
+        with self._lock:
+            ahead = sum(count for p, count in self._pending.items() if p <= priority)
+            idle = max(0, self.workers - self._running)
+            try:
+                self._queue.put_nowait((priority, next(self._seq), time.monotonic(), fn, args))
+            except queue.Full:
+                self.rejected += 1
+                return None
+            self._pending[priority] = self._pending.get(priority, 0) + 1
+            self.submitted += 1
+        return max(0, ahead + 1 - idle)
+
+    def _worker(self):
+        while True:
+            priority, _, enqueued_at, fn, args = self._queue.get()
+            waited = time.monotonic() - enqueued_at
+            with self._lock:
+                self._pending[priority] -= 1
+                self._running += 1
+                self.wait_total += waited
+                if waited > self.wait_max:
+                    self.wait_max = waited
+            try:
+                fn(*args)
+            except Exception as e:
+                log.exception("%s task error: %s", self.name, e)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self.completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self.completed + self._running
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "depth": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "wait_avg_ms": (self.wait_total / started * 1000) if started else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+
+class Scheduler:
+    """
+    실행 클래스별로 작업을 나눠 실행합니다.
+
+    Args:
+        classes: {클래스 이름: (동시 실행 수, 최대 대기열 길이)}
+    """
+
+    def __init__(self, classes: dict = None):
+        classes = classes or DEFAULT_CLASSES
+        self._classes = {
+            name: ExecutionClass(name, workers, max_queue)
+            for name, (workers, max_queue) in classes.items()
+        }
+
+    def submit(self, exec_class: str, fn: Callable, *args, priority: int = NORMAL):
+        """exec_class 워커에 작업을 제출합니다. 반환값은 ExecutionClass.submit과 같습니다."""
+        return self._classes[exec_class].submit(fn, args, priority)
+
+    def stats(self) -> dict:
+        """클래스별 대기열 깊이, 실행 중 작업 수, 대기 시간 통계"""
+        return {name: cls.stats() for name, cls in self._classes.items()}
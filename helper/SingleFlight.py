@@ -0,0 +1,75 @@
+"""
+Single-flight — 같은 키로 동시에 들어온 요청은 하나만 실행하고 결과를 공유합니다.
+"""
+import threading
+from typing import Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    진행 중인 동일 요청을 합칩니다.
+
+    먼저 도착한 호출(leader)만 fn을 실행하고, 그동안 같은 키로 들어온 호출은
+    leader의 결과(또는 예외)를 그대로 돌려받습니다. 결과를 캐싱하지는 않으므로
+    leader가 끝난 뒤 들어온 호출은 다시 실행됩니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.executed = 0   # 실제로 fn을 실행한 횟수
+        self.merged = 0     # 진행 중인 호출에 합쳐진 횟수
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.merged += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.executed + self.merged
+            return {
+                "executed": self.executed,
+                "merged": self.merged,
+                "in_flight": len(self._calls),
+                "merge_ratio": self.merged / total if total else 0.0,
+            }
+
+
+# 모든 봇이 공유하는 기본 인스턴스
+flight = SingleFlight()
@@ -1,37 +1,28 @@
 ﻿from iris import ChatContext, Bot
 from iris.bot.models import ErrorContext
-from bots.gemini import get_gemini
-from bots.pyeval import python_eval, real_eval
-from bots.stock import create_stock_image
-from bots.imagen import get_imagen
-from bots.lyrics import get_lyrics, find_lyrics
-from bots.replyphoto import reply_photo
-from bots.text2image import draw_text
-from bots.coin import get_coin_info
 
 from iris.decorators import *
-from helper.BanControl import ban_user, unban_user
+from helper.BanControl import ban_user, unban_user, is_not_banned
+from helper.CommandRouter import CommandRouter
+from helper.Scheduler import Scheduler, IO, CPU, AI, HIGH
+from helper.Metrics import command_latency, gauge_lines, start_prometheus_writer
+from helper.SingleFlight import flight
+from helper.HttpClient import http_client
+from helper.MarketCache import market_cache
+from helper.RoomCache import room_cache
+from helper.MemberDirectory import member_directory
 from iris.kakaolink import IrisLink
 
-from bots.detect_nickname_change import detect_nickname_change
 import sys, threading
 import base64
-import requests
 import os
 import subprocess
 import tempfile
 
-from bots.mentions import mention_user, mention_room_master, mention_user_in_thread
-from bots.notification import share_notice_command, share_current_notice, set_notice_command, delete_notice_command, change_notice_command, get_notices_command, get_notice_detail_command
-from bots.kakao_reaction import react_command
-from bots.em import emoticon_command
-from bots.user_posts import get_user_posts_command, get_posts_by_link_id_command
-from bots.kick_list import kick_list_command
-from bots.vote import vote_command
-from bots.room_info import room_search_command
-
+# 봇 모듈은 "모듈:함수" 문자열로 등록하고 명령어를 처음 사용할 때 import 합니다.
 iris_url = sys.argv[1]
 bot = Bot(iris_url)
+http_client.trust_host(bot.iris_url)
 
 
 def normalize_iris_endpoint(endpoint: str) -> str:
@@ -95,7 +86,7 @@ def send_audio_multiple_http(iris_endpoint: str, room_id: int, mp3_paths: list[s
 
     endpoint = normalize_iris_endpoint(iris_endpoint)
 
-    response = requests.post(
+    response = http_client.post(
         f"{endpoint}/reply",
         json={
             "type": "audio_multiple",
@@ -107,76 +98,7 @@ def send_audio_multiple_http(iris_endpoint: str, room_id: int, mp3_paths: list[s
     response.raise_for_status()
     return response.json()
 
-@bot.on_event("message")
-@is_not_banned
-def on_message(chat: ChatContext):
-    try:
-        match chat.message.command:
-
-            case "!tt" | "!ttt" | "!프사" | "!프사링":
-                reply_photo(chat, kl)
-
-            case "!멘션":
-                mention_user(chat)
-            
-            case "!멘션1":  # 스레드용 멘션
-                mention_user_in_thread(chat)
-            
-            case "!방장":
-                mention_room_master(chat)
-            
-            case "!공지":
-                share_notice_command(chat)
-            
-            case "!현재공지":
-                share_current_notice(chat)
-            
-            case "!공지등록":
-                set_notice_command(chat)
-            
-            case "!공지삭제":
-                delete_notice_command(chat)
-            
-            case "!공지수정":
-                change_notice_command(chat)
-
-            case "!공지목록":
-                get_notices_command(chat)
-
-            case "!공지확인":
-                get_notice_detail_command(chat)
-
-            case "!임티":
-                emoticon_command(chat)
-
-            case "!react":
-                react_command(chat)
-
-            case "!유저포스트":
-                get_user_posts_command(chat)
-
-            case "!포스트":
-                get_posts_by_link_id_command(chat)
-
-            case "!강퇴목록":
-                kick_list_command(chat)
-            
-            case "!투표":
-                vote_command(chat)
-
-            case "!방검색":
-                room_search_command(chat)
-                
-    except Exception as e :
-        print(e)
-
-
-@bot.on_event("message")
-@is_not_banned
-def on_audio_test(chat: ChatContext):
-    if chat.message.command != "!mp3test":
-        return
-
+def audio_test(chat: ChatContext):
     try:
         if not chat.message.param:
             chat.reply("usage: !mp3test C:\\\\a.mp3|C:\\\\b.mp3")
@@ -204,20 +126,124 @@ def on_audio_test(chat: ChatContext):
         chat.reply(f"mp3 send failed: {e}")
         print(e)
 
+
+@is_admin
+def scheduler_stats(chat: ChatContext):
+    lines = ["⏱️ 스케줄러 상태"]
+    for name, stat in scheduler.stats().items():
+        lines.append(
+            f"\n[{name}] 실행 {stat['running']}/{stat['workers']} | 대기 {stat['depth']}/{stat['max_queue']}"
+            f"\n평균대기 {stat['wait_avg_ms']:.0f}ms | 최대대기 {stat['wait_max_ms']:.0f}ms | 거절 {stat['rejected']}"
+        )
+    chat.reply("\n".join(lines))
+
+
+@is_admin
+def command_stats(chat: ChatContext):
+    rows = command_latency.summary()
+    if not rows:
+        chat.reply("아직 실행된 명령어가 없습니다.")
+        return
+    lines = ["📈 명령어 통계 (p50/p95/p99)" + "\u200b" * 500]
+    for row in rows:
+        lines.append(
+            f"\n{row['name']} | {row['count']}회 | 오류 {row['errors']}"
+            f"\n{row['p50'] * 1000:,.0f} / {row['p95'] * 1000:,.0f} / {row['p99'] * 1000:,.0f} ms"
+        )
+    chat.reply("\n".join(lines))
+
+
+@is_admin
+def host_stats(chat: ChatContext):
+    stats = http_client.stats()
+    if not stats:
+        chat.reply("아직 외부 API 호출이 없습니다.")
+        return
+    lines = ["🌐 외부 API 호스트 (최근 1분 p50/p95)" + "\u200b" * 500]
+    for host, stat in sorted(stats.items(), key=lambda item: item[1]["requests"], reverse=True):
+        circuit = stat["circuit"] or {}
+        lines.append(
+            f"\n{host} [{circuit.get('state', '-')}]"
+            f"\n누적 {stat['requests']}회 | 오류 {stat['errors']} | 재사용 {stat['reuse_ratio'] * 100:.0f}%"
+            f"\n최근 {circuit.get('count', 0)}회 | 오류율 {circuit.get('error_rate', 0) * 100:.0f}%"
+            f" | {circuit.get('p50_ms', 0):,.0f} / {circuit.get('p95_ms', 0):,.0f} ms"
+        )
+    chat.reply("\n".join(lines))
+
+
+def collect_runtime_metrics() -> list:
+    sched = scheduler.stats()
+    lines = []
+    lines += gauge_lines("iris_scheduler_queue_depth", {name: s["depth"] for name, s in sched.items()}, "class")
+    lines += gauge_lines("iris_scheduler_running", {name: s["running"] for name, s in sched.items()}, "class")
+    lines += gauge_lines("iris_scheduler_rejected_total", {name: s["rejected"] for name, s in sched.items()}, "class")
+    lines += gauge_lines("iris_scheduler_wait_avg_seconds", {name: s["wait_avg_ms"] / 1000 for name, s in sched.items()}, "class")
+    lines += gauge_lines("iris_scheduler_wait_max_seconds", {name: s["wait_max_ms"] / 1000 for name, s in sched.items()}, "class")
+    sf = flight.stats()
+    lines += gauge_lines("iris_singleflight_total", {"executed": sf["executed"], "merged": sf["merged"]}, "result")
+    cache = market_cache.stats()
+    lines += gauge_lines("iris_market_cache_hit_ratio", {name: c["hit_ratio"] for name, c in cache.items()}, "endpoint")
+    lines += gauge_lines("iris_market_cache_max_age_seconds", {name: c["max_age"] for name, c in cache.items()}, "endpoint")
+    lines += gauge_lines("iris_market_cache_fallbacks_total", {name: c["fallbacks"] for name, c in cache.items()}, "endpoint")
+    lines += gauge_lines("iris_room_cache", room_cache.stats(), "field")
+    lines += gauge_lines("iris_member_directory", member_directory.stats(), "field")
+    talk_api = sys.modules.get("bots.talk_api")  # 지연 로딩 — 이미 불러온 경우에만
+    if talk_api is not None:
+        lines += gauge_lines("iris_outbound_messages", talk_api.outbound_stats(), "state")
+    nickname = sys.modules.get("bots.detect_nickname_change")
+    if nickname is not None and nickname.nickname_watch is not None:
+        lines += gauge_lines("iris_nickname_watch", nickname.nickname_watch.stats(), "field")
+    notices = sys.modules.get("bots.notice_watcher")
+    if notices is not None and notices.notice_watcher is not None:
+        lines += gauge_lines("iris_notice_watcher", notices.notice_watcher.stats(), "field")
+    return lines
+
+
+METRICS_FILE = os.getenv("IRIS_METRICS_FILE", "res/metrics.prom")
+
+scheduler = Scheduler()
+router = CommandRouter(prefix="!", guard=is_not_banned, scheduler=scheduler, metrics=command_latency)
+
+router.add(("!tt", "!ttt", "!프사", "!프사링"), "bots.replyphoto:reply_photo", exec_class=IO, inject=("kl",))
+router.add(("!코인", "!내코인", "!바낸", "!김프", "!달러", "!코인등록", "!코인삭제"), "bots.coin:get_coin_info", exec_class=IO)
+router.add(("!gi", "!i2i", "!분석"), "bots.gemini:get_gemini", exec_class=AI)
+router.add(("!텍스트", "!사진", "!껄무새", "!멈춰", "!지워", "!진행", "!말대꾸", "!텍스트추가"), "bots.text2image:draw_text", exec_class=CPU)
+router.add("!가사찾기", "bots.lyrics:find_lyrics", exec_class=IO)
+router.add("!노래가사", "bots.lyrics:get_lyrics", exec_class=IO)
+router.add("!주식", "bots.stock:create_stock_image", exec_class=CPU)
+router.add("!ig", "bots.imagen:get_imagen", exec_class=AI)
+router.add("!ban", ban_user, priority=HIGH)
+router.add("!unban", unban_user, priority=HIGH)
+router.add("!대기열", scheduler_stats, priority=HIGH)
+router.add("!stats", command_stats, priority=HIGH)
+router.add("!hosts", host_stats, priority=HIGH)
+
+router.add("!멘션", "bots.mentions:mention_user")
+router.add("!멘션1", "bots.mentions:mention_user_in_thread", exec_class=IO)  # 스레드용 멘션
+router.add("!방장", "bots.mentions:mention_room_master", exec_class=IO)
+router.add("!공지", "bots.notification:share_notice_command", exec_class=IO)
+router.add("!현재공지", "bots.notification:share_current_notice", exec_class=IO)
+router.add("!공지등록", "bots.notification:set_notice_command", exec_class=IO)
+router.add("!공지삭제", "bots.notification:delete_notice_command", exec_class=IO)
+router.add("!공지수정", "bots.notification:change_notice_command", exec_class=IO)
+router.add("!공지목록", "bots.notification:get_notices_command", exec_class=IO)
+router.add("!공지확인", "bots.notification:get_notice_detail_command", exec_class=IO)
+router.add("!임티", "bots.em:emoticon_command")
+router.add("!react", "bots.kakao_reaction:react_command")
+router.add("!유저포스트", "bots.user_posts:get_user_posts_command", exec_class=IO)
+router.add("!포스트", "bots.user_posts:get_posts_by_link_id_command", exec_class=IO)
+router.add("!강퇴목록", "bots.kick_list:kick_list_command", exec_class=IO)
+router.add("!투표", "bots.vote:vote_command", exec_class=IO)
+router.add("!방검색", "bots.room_info:room_search_command", exec_class=IO)
+
+router.add("!mp3test", audio_test, exec_class=CPU)
+router.add("!py", "bots.pyeval:python_eval", exec_class=CPU)
+router.add("!ev", "bots.pyeval:real_eval", inject=("kl",))
+
+
 @bot.on_event("message")
-@is_not_banned
 def on_message(chat: ChatContext):
-    try:
-        match chat.message.command:
-            
-            case "!py":
-                python_eval(chat)
-            
-            case "!ev":
-                real_eval(chat, kl)
-            
-    except Exception as e :
-        print(e)
+    router.dispatch(chat)
 
 @bot.on_event("error")
 def on_error(err: ErrorContext):
@@ -226,8 +252,16 @@ def on_error(err: ErrorContext):
 
 if __name__ == "__main__":
     #닉네임감지를 사용하지 않는 경우 주석처리
-    nickname_detect_thread = threading.Thread(target=detect_nickname_change, args=(bot.iris_url,))
-    nickname_detect_thread.start()
+    from bots.detect_nickname_change import start_nickname_detection
+    start_nickname_detection(bot)
+    #공지 감시를 사용하지 않는 경우 주석처리
+    from bots.notice_watcher import start_notice_watcher
+    start_notice_watcher(bot)
     #카카오링크를 사용하지 않는 경우 주석처리
     kl = IrisLink(bot.iris_url)
+    router.provide("kl", kl)
+    #봇 모듈을 첫 사용 전에 미리 불러오지 않는 경우 주석처리
+    router.preload(delay=5)
+    #Prometheus 텍스트 파일 출력을 사용하지 않는 경우 주석처리
+    start_prometheus_writer(METRICS_FILE, [command_latency.render_prometheus, collect_runtime_metrics, http_client.render_prometheus])
     bot.run()